@@ -1,8 +1,24 @@
-from .api import APIClient
-from .client import DockerClient, from_env
-from .context import Context
-from .context import ContextAPI
-from .tls import TLSConfig
-from .version import __version__
+from ._lazy import lazy_attributes
 
 __title__ = 'docker'
+
+# The exports are imported on first use, so that scripts that only need
+# part of the package, e.g. docker.errors, don't pay for all of it.
+__all__ = [
+    'APIClient',
+    'Context',
+    'ContextAPI',
+    'DockerClient',
+    'TLSConfig',
+    '__version__',
+    'from_env',
+]
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'APIClient': '.api',
+    'Context': '.context',
+    'ContextAPI': '.context',
+    'DockerClient': '.client',
+    'TLSConfig': '.tls',
+    '__version__': '.version',
+    'from_env': '.client',
+})
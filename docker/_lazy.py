@@ -0,0 +1,58 @@
+import importlib
+import sys
+
+
+def lazy_attributes(module_name, attributes):
+    """
+    Return ``__getattr__`` and ``__dir__`` functions (see :pep:`562`) for
+    the module ``module_name``, which import the ``attributes`` it exports
+    on first access rather than when the module itself is imported.
+
+    The submodules of a package are imported on first access as well, as
+    ``import docker`` followed by ``docker.errors`` is expected to work.
+
+    Args:
+        module_name (str): The name of the module, i.e. its ``__name__``.
+        attributes (dict): Maps each attribute name to the module defining
+            it, relative to the package of ``module_name``.
+    """
+    module = sys.modules[module_name]
+    namespace = vars(module)
+
+    def __getattr__(name):
+        source = attributes.get(name)
+        if source is None:
+            return _import_submodule(name)
+        try:
+            value = getattr(
+                importlib.import_module(source, module.__package__), name
+            )
+        except ImportError as err:
+            # e.g. a missing optional dependency: hasattr() must still
+            # return False, while "from ... import" raises ImportError
+            raise AttributeError(
+                f'module {module_name!r} has no attribute {name!r} '
+                f'({err})'
+            ) from err
+        # Later lookups don't go through __getattr__ anymore
+        namespace[name] = value
+        return value
+
+    def _import_submodule(name):
+        error = AttributeError(
+            f'module {module_name!r} has no attribute {name!r}'
+        )
+        if name.startswith('__') or not hasattr(module, '__path__'):
+            raise error
+        try:
+            # Importing a submodule sets it as an attribute of the package
+            return importlib.import_module(f'{module_name}.{name}')
+        except ModuleNotFoundError as err:
+            if err.name != f'{module_name}.{name}':
+                raise
+            raise error from None
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
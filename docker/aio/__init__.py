@@ -0,0 +1,2 @@
+from .api import AsyncAPIClient
+from .client import AsyncDockerClient, from_env
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+
+from ... import errors
+from ... import utils
+from ...api.build import (
+    BuildApiMixin, process_dockerfile, read_dockerignore
+)
+
+
+class AsyncBuildApiMixin:
+    async def build(self, path=None, tag=None, quiet=False, fileobj=None,
+                    nocache=False, rm=False, timeout=None,
+                    custom_context=False, encoding=None, pull=False,
+                    forcerm=False, dockerfile=None, decode=False,
+                    buildargs=None, gzip=False, labels=None, target=None,
+                    network_mode=None, platform=None,
+                    use_config_proxy=True):
+        """
+        Build an image, returning an asynchronous generator of the build
+        output. Arguments have the same meaning as in
+        :py:meth:`~docker.api.build.BuildApiMixin.build`. Creating the build
+        context archive runs in the default executor so that it does not
+        block the event loop.
+        """
+        remote = context = None
+        buildargs = buildargs or {}
+        if path is None and fileobj is None:
+            raise TypeError("Either path or fileobj needs to be provided.")
+        if gzip and encoding is not None:
+            raise errors.DockerException(
+                'Can not use custom encoding if gzip is enabled'
+            )
+        if tag is not None and not utils.match_tag(tag):
+            raise errors.DockerException(
+                f"invalid tag '{tag}': invalid reference format"
+            )
+        loop = asyncio.get_running_loop()
+        if custom_context:
+            if not fileobj:
+                raise TypeError("You must specify fileobj with custom_context")
+            context = fileobj
+        elif fileobj is not None:
+            context = await loop.run_in_executor(
+                None, utils.mkbuildcontext, fileobj
+            )
+        elif path.startswith(('http://', 'https://',
+                              'git://', 'github.com/', 'git@')):
+            remote = path
+        elif not os.path.isdir(path):
+            raise TypeError("You must specify a directory to build in path")
+        else:
+            exclude = read_dockerignore(path)
+            dockerfile = process_dockerfile(dockerfile, path)
+            context = await loop.run_in_executor(None, lambda: utils.tar(
+                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip
+            ))
+            encoding = 'gzip' if gzip else encoding
+
+        u = await self._url('/build')
+        params = {
+            't': tag,
+            'remote': remote,
+            'q': quiet,
+            'nocache': nocache,
+            'rm': rm,
+            'forcerm': forcerm,
+            'pull': pull,
+            'dockerfile': dockerfile,
+        }
+
+        if use_config_proxy:
+            proxy_args = self._proxy_configs.get_environment()
+            for k, v in proxy_args.items():
+                buildargs.setdefault(k, v)
+        if buildargs:
+            params['buildargs'] = json.dumps(buildargs)
+        if labels:
+            params['labels'] = json.dumps(labels)
+        if target:
+            params['target'] = target
+        if network_mode:
+            params['networkmode'] = network_mode
+        if platform is not None:
+            if utils.version_lt(self._version, '1.32'):
+                raise errors.InvalidVersion(
+                    'platform was only introduced in API version 1.32'
+                )
+            params['platform'] = platform
+
+        headers = {}
+        if context is not None:
+            headers = {'Content-Type': 'application/tar'}
+            if encoding:
+                headers['Content-Encoding'] = encoding
+
+        self._set_auth_headers(headers)
+
+        try:
+            response = await self._post(
+                u, data=context, params=params, headers=headers,
+                stream=True, timeout=timeout
+            )
+        finally:
+            if context is not None and not custom_context:
+                context.close()
+
+        async for chunk in self._stream_helper(response, decode=decode):
+            yield chunk
+
+    async def prune_builds(self, filters=None, keep_storage=None, all=None):
+        """
+        Delete the builder cache. See
+        :py:meth:`~docker.api.build.BuildApiMixin.prune_builds`.
+        """
+        url = await self._url("/build/prune")
+        if (filters, keep_storage, all) != (None, None, None) \
+                and utils.version_lt(self._version, '1.39'):
+            raise errors.InvalidVersion(
+                '`filters`, `keep_storage`, and `all` args are only available '
+                'for API version > 1.38'
+            )
+        params = {}
+        if filters is not None:
+            params['filters'] = utils.convert_filters(filters)
+        if keep_storage is not None:
+            params['keep-storage'] = keep_storage
+        if all is not None:
+            params['all'] = all
+        return self._result(await self._post(url, params=params), True)
+
+    _set_auth_headers = BuildApiMixin._set_auth_headers
@@ -0,0 +1,397 @@
+import asyncio
+import json
+import struct
+import urllib
+from functools import partial
+
+import requests.exceptions
+
+from ... import auth
+from ...constants import (DEFAULT_DATA_CHUNK_SIZE, DEFAULT_MAX_POOL_SIZE,
+                          DEFAULT_TIMEOUT_SECONDS, DEFAULT_USER_AGENT,
+                          IS_WINDOWS_PLATFORM,
+                          MINIMUM_DOCKER_API_VERSION, STREAM_HEADER_SIZE_BYTES)
+from ...errors import (DockerException, InvalidVersion, TLSParameterError,
+                       create_api_error_from_http_exception)
+from ...utils import config, utils
+from ...utils.json_stream import JSONStreamDecoder
+from ...utils.proxy import ProxyConfig
+from ...utils.socket import STDERR, STDOUT
+from ...utils.version_cache import VersionCache
+from ..transport import AsyncTransport
+from .build import AsyncBuildApiMixin
+from .container import AsyncContainerApiMixin
+from .daemon import AsyncDaemonApiMixin
+from .exec_api import AsyncExecApiMixin
+from .image import AsyncImageApiMixin
+
+
+class AsyncAPIClient(
+        AsyncBuildApiMixin,
+        AsyncContainerApiMixin,
+        AsyncDaemonApiMixin,
+        AsyncExecApiMixin,
+        AsyncImageApiMixin):
+    """
+    A low-level, asyncio-native client for the Docker Engine API. It exposes
+    the containers, images, exec, build and daemon methods of
+    :py:class:`~docker.api.client.APIClient` as coroutines, and streaming
+    endpoints as asynchronous generators, over a non-blocking transport.
+
+    The file-writing and batch helpers (``get_image_to``,
+    ``load_image_from``, ``copy_from``, ``copy_to``, ``copy_between``, the
+    ``*_many`` methods, ``exec_many`` and ``build_context_digest``),
+    websocket attach, and the swarm, service, node, network, volume,
+    secret, config and plugin methods are only available on the
+    synchronous client.
+
+    Example:
+
+        >>> import asyncio
+        >>> from docker.aio import AsyncAPIClient
+        >>> async def main():
+        ...     async with AsyncAPIClient() as client:
+        ...         async for event in client.events(decode=True):
+        ...             print(event)
+        >>> asyncio.run(main())
+
+    Args:
+        base_url (str): URL to the Docker server. For example,
+            ``unix:///var/run/docker.sock`` or ``tcp://127.0.0.1:1234``.
+        version (str): The version of the API to use. Set to ``auto`` to
+            detect the server's version on the first request.
+            Default: ``auto``
+        timeout (int): Default timeout for API calls, in seconds.
+        tls (bool or :py:class:`~docker.tls.TLSConfig`): Enable TLS. Pass
+            ``True`` to enable it with default options, or pass a
+            :py:class:`~docker.tls.TLSConfig` object to use custom
+            configuration.
+        user_agent (str): Set a custom user agent for requests to the server.
+        credstore_env (dict): Override environment variables when calling the
+            credential store process.
+        max_pool_size (int): The maximum number of idle connections
+            to keep in the pool.
+        version_cache (:py:class:`~docker.utils.VersionCache` or bool): With
+            ``version='auto'``, look the version of the server up in this
+            cache, and record it there once retrieved.
+    """
+
+    def __init__(self, base_url=None, version=None,
+                 timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
+                 user_agent=DEFAULT_USER_AGENT, credstore_env=None,
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, version_cache=None):
+        if tls and not base_url:
+            raise TLSParameterError(
+                'If using TLS, the base_url argument must be provided.'
+            )
+
+        self.timeout = timeout
+        self.headers = {'User-Agent': user_agent}
+
+        self._general_configs = config.load_general_config()
+
+        proxy_config = self._general_configs.get('proxies', {})
+        try:
+            proxies = proxy_config[base_url]
+        except KeyError:
+            proxies = proxy_config.get('default', {})
+
+        self._proxy_configs = ProxyConfig.from_dict(proxies)
+
+        self._auth_configs = auth.load_config(
+            config_dict=self._general_configs, credstore_env=credstore_env,
+        )
+        self.credstore_env = credstore_env
+
+        self.base_url = utils.parse_host(
+            base_url, IS_WINDOWS_PLATFORM, tls=bool(tls)
+        )
+        self._transport = AsyncTransport(
+            self.base_url, tls=tls, timeout=timeout,
+            max_pool_size=max_pool_size
+        )
+
+        if version_cache is True:
+            version_cache = VersionCache()
+        self._version_cache = version_cache or None
+        self._version_lock = None
+        if version is None or (isinstance(version, str) and
+                               version.lower() == 'auto'):
+            self._version = None
+        elif not isinstance(version, str):
+            raise DockerException(
+                'Version parameter must be a string or None. '
+                f'Found {type(version).__name__}'
+            )
+        else:
+            self._check_version(version)
+            self._version = version
+
+    async def __aenter__(self):
+        await self._ensure_version()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _check_version(self, version):
+        if utils.version_lt(version, MINIMUM_DOCKER_API_VERSION):
+            raise InvalidVersion(
+                f'API versions below {MINIMUM_DOCKER_API_VERSION} are '
+                f'no longer supported by this library.'
+            )
+
+    async def _ensure_version(self):
+        if self._version is not None:
+            return self._version
+        if self._version_lock is None:
+            self._version_lock = asyncio.Lock()
+        async with self._version_lock:
+            if self._version is None:
+                cache = self._version_cache
+                version = cache.get(self.base_url) if cache else None
+                if version is None:
+                    version = await self._retrieve_server_version()
+                    self._check_version(version)
+                    if cache:
+                        cache.put(self.base_url, version)
+                else:
+                    self._check_version(version)
+                self._version = version
+        return self._version
+
+    async def _retrieve_server_version(self):
+        try:
+            return (await self.version(api_version=False))["ApiVersion"]
+        except KeyError as ke:
+            raise DockerException(
+                'Invalid response from docker daemon: key "ApiVersion"'
+                ' is missing.'
+            ) from ke
+        except Exception as e:
+            raise DockerException(
+                f'Error while fetching server API version: {e}'
+            ) from e
+
+    async def _request(self, method, url, headers=None, **kwargs):
+        headers = dict(self.headers, **(headers or {}))
+        if 'HttpHeaders' in self._general_configs:
+            headers.update(self._general_configs['HttpHeaders'])
+        kwargs.setdefault('timeout', self.timeout)
+        return await self._transport.request(
+            method, url, headers=headers, **kwargs
+        )
+
+    async def _post(self, url, **kwargs):
+        return await self._request('POST', url, **kwargs)
+
+    async def _get(self, url, **kwargs):
+        return await self._request('GET', url, **kwargs)
+
+    async def _put(self, url, **kwargs):
+        return await self._request('PUT', url, **kwargs)
+
+    async def _delete(self, url, **kwargs):
+        return await self._request('DELETE', url, **kwargs)
+
+    async def _url(self, pathfmt, *args, **kwargs):
+        for arg in args:
+            if not isinstance(arg, str):
+                raise ValueError(
+                    f'Expected a string but found {arg} ({type(arg)}) instead'
+                )
+
+        quote_f = partial(urllib.parse.quote, safe="/:")
+        args = map(quote_f, args)
+
+        formatted_path = pathfmt.format(*args)
+        if kwargs.get('versioned_api', True):
+            version = await self._ensure_version()
+            return f'/v{version}{formatted_path}'
+        else:
+            return formatted_path
+
+    def _raise_for_status(self, response):
+        """Raises stored :class:`APIError`, if one occurred."""
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise create_api_error_from_http_exception(e) from e
+
+    def _result(self, response, json=False, binary=False):
+        assert not (json and binary)
+        self._raise_for_status(response)
+
+        if json:
+            return response.json()
+        if binary:
+            return response.content
+        return response.text
+
+    async def _post_json(self, url, data, **kwargs):
+        # Go <1.1 can't unserialize null to a string
+        # so we do this disgusting thing here.
+        data2 = {}
+        if data is not None and isinstance(data, dict):
+            for k, v in iter(data.items()):
+                if v is not None:
+                    data2[k] = v
+        elif data is not None:
+            data2 = data
+
+        if 'headers' not in kwargs:
+            kwargs['headers'] = {}
+        kwargs['headers']['Content-Type'] = 'application/json'
+        return await self._post(url, data=json.dumps(data2), **kwargs)
+
+    async def _stream_helper(self, response, decode=False):
+        """Asynchronous generator for data coming from a chunked-encoded HTTP
+        response."""
+        if response.chunked:
+            if decode:
+                async for obj in _json_stream(
+                        self._stream_helper(response, False)):
+                    yield obj
+            else:
+                async for data in response.iter_chunks():
+                    yield data
+        else:
+            # Response isn't chunked, meaning we probably
+            # encountered an error immediately
+            await response.read()
+            yield self._result(response, json=decode)
+
+    async def _multiplexed_response_stream_helper(self, response):
+        """Asynchronous generator of multiplexed data blocks coming from a
+        response stream."""
+        async for _, data in _frames(response.iter_chunks()):
+            yield data
+
+    def _stream_raw_result(self, response,
+                           chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """Asynchronous generator of the raw data of a response body."""
+        self._raise_for_status(response)
+        return response.iter_chunks(chunk_size or DEFAULT_DATA_CHUNK_SIZE)
+
+    async def _read_from_socket(self, response, stream, tty=True,
+                                demux=False):
+        """Consume all frames of a hijacked response and return the data, or
+        return an asynchronous generator of the frames if ``stream`` is set.
+        """
+        if tty:
+            frames = _tty_frames(response.iter_chunks())
+        else:
+            frames = _frames(response.iter_chunks())
+
+        async def gen():
+            async for stream_id, data in frames:
+                if not demux:
+                    yield data
+                elif stream_id == STDOUT:
+                    yield (data, None)
+                elif stream_id == STDERR:
+                    yield (None, data)
+                else:
+                    raise ValueError(f'{stream_id} is not a valid stream')
+
+        if stream:
+            return gen()
+
+        try:
+            if not demux:
+                return b''.join([data async for data in gen()])
+            out, err = [], []
+            async for stdout, stderr in gen():
+                if stdout is not None:
+                    out.append(stdout)
+                else:
+                    err.append(stderr)
+            return (
+                b''.join(out) if out else None,
+                b''.join(err) if err else None
+            )
+        finally:
+            response.close()
+
+    async def _check_is_tty(self, container):
+        cont = await self.inspect_container(container)
+        return cont['Config']['Tty']
+
+    async def _get_result_tty(self, stream, res, is_tty):
+        self._raise_for_status(res)
+        if stream:
+            if is_tty:
+                return res.iter_chunks()
+            return self._multiplexed_response_stream_helper(res)
+        data = await res.read()
+        if is_tty:
+            return data
+        return b''.join(_split_multiplexed(data))
+
+    @property
+    def api_version(self):
+        return self._version
+
+    async def close(self):
+        """
+        Close all idle connections held by the client.
+        """
+        self._transport.close()
+
+    def reload_config(self, dockercfg_path=None):
+        """
+        Force a reload of the auth configuration
+
+        Args:
+            dockercfg_path (str): Use a custom path for the Docker config file
+                (default ``$HOME/.docker/config.json`` if present,
+                otherwise ``$HOME/.dockercfg``)
+
+        Returns:
+            None
+        """
+        self._auth_configs = auth.load_config(
+            dockercfg_path, credstore_env=self.credstore_env
+        )
+
+
+async def _json_stream(stream):
+    """Given an asynchronous stream of bytes, yield decoded JSON objects."""
+    decoder = JSONStreamDecoder()
+    async for data in stream:
+        for obj in decoder.decode(data):
+            yield obj
+    for obj in decoder.flush():
+        yield obj
+
+
+async def _frames(chunks):
+    """Parse multiplexed ``(stream, data)`` frames out of an asynchronous
+    stream of byte chunks, regardless of how frames straddle chunks."""
+    buf = bytearray()
+    async for chunk in chunks:
+        buf += chunk
+        offset = 0
+        while len(buf) - offset >= STREAM_HEADER_SIZE_BYTES:
+            stream_id, length = struct.unpack_from('>BxxxL', buf, offset)
+            start = offset + STREAM_HEADER_SIZE_BYTES
+            if len(buf) - start < length:
+                break
+            if length:
+                yield stream_id, bytes(buf[start:start + length])
+            offset = start + length
+        del buf[:offset]
+
+
+async def _tty_frames(chunks):
+    async for chunk in chunks:
+        yield STDOUT, chunk
+
+
+def _split_multiplexed(buf):
+    walker = 0
+    while len(buf) - walker >= STREAM_HEADER_SIZE_BYTES:
+        _, length = struct.unpack_from('>BxxxL', buf, walker)
+        start = walker + STREAM_HEADER_SIZE_BYTES
+        walker = start + length
+        yield buf[start:walker]
@@ -0,0 +1,565 @@
+from datetime import datetime
+
+from ... import errors
+from ... import utils
+from ...constants import DEFAULT_DATA_CHUNK_SIZE
+from ...types import (
+    ContainerConfig, EndpointConfig, HostConfig, NetworkingConfig
+)
+
+
+class AsyncContainerApiMixin:
+    @utils.check_resource('container')
+    async def attach(self, container, stdout=True, stderr=True,
+                     stream=False, logs=False, demux=False):
+        """
+        Attach to a container. If ``stream`` is set, an asynchronous
+        generator of the output is returned. See
+        :py:meth:`~docker.api.container.ContainerApiMixin.attach`.
+        """
+        params = {
+            'logs': logs and 1 or 0,
+            'stdout': stdout and 1 or 0,
+            'stderr': stderr and 1 or 0,
+            'stream': stream and 1 or 0
+        }
+
+        headers = {
+            'Connection': 'Upgrade',
+            'Upgrade': 'tcp'
+        }
+
+        is_tty = await self._check_is_tty(container)
+        u = await self._url("/containers/{0}/attach", container)
+        response = await self._post(
+            u, headers=headers, params=params, stream=True
+        )
+        self._raise_for_status(response)
+        return await self._read_from_socket(
+            response, stream, is_tty, demux=demux
+        )
+
+    @utils.check_resource('container')
+    async def attach_socket(self, container, params=None):
+        """
+        Like :py:meth:`attach`, but return the connection of the request,
+        whose ``reader`` and ``writer`` are the asyncio streams attached to
+        the container. Close it with its ``close()`` method. Websockets are
+        not supported.
+
+        Args:
+            container (str): The container to attach to.
+            params (dict): Dictionary of request parameters (e.g. ``stdout``,
+                ``stderr``, ``stream``).
+                For ``detachKeys``, ~/.docker/config.json is used by default.
+
+        Returns:
+            (:py:class:`~docker.aio.transport.AsyncConnection`): The
+            connection.
+        """
+        if params is None:
+            params = {
+                'stdout': 1,
+                'stderr': 1,
+                'stream': 1
+            }
+
+        if 'detachKeys' not in params \
+                and 'detachKeys' in self._general_configs:
+            params['detachKeys'] = self._general_configs['detachKeys']
+
+        headers = {
+            'Connection': 'Upgrade',
+            'Upgrade': 'tcp'
+        }
+
+        u = await self._url("/containers/{0}/attach", container)
+        response = await self._post(
+            u, params=params, stream=True, headers=headers
+        )
+        self._raise_for_status(response)
+        return response.connection
+
+    @utils.check_resource('container')
+    async def commit(self, container, repository=None, tag=None,
+                     message=None, author=None, pause=True, changes=None,
+                     conf=None):
+        """
+        Commit a container to an image. Similar to the ``docker commit``
+        command.
+        """
+        params = {
+            'container': container,
+            'repo': repository,
+            'tag': tag,
+            'comment': message,
+            'author': author,
+            'pause': pause,
+            'changes': changes
+        }
+        u = await self._url("/commit")
+        return self._result(
+            await self._post_json(u, data=conf, params=params), json=True
+        )
+
+    async def containers(self, quiet=False, all=False, trunc=False,
+                         latest=False, since=None, before=None, limit=-1,
+                         size=False, filters=None):
+        """
+        List containers. See
+        :py:meth:`~docker.api.container.ContainerApiMixin.containers`.
+        """
+        params = {
+            'limit': 1 if latest else limit,
+            'all': 1 if all else 0,
+            'size': 1 if size else 0,
+            'trunc_cmd': 1 if trunc else 0,
+            'since': since,
+            'before': before
+        }
+        if filters:
+            params['filters'] = utils.convert_filters(filters)
+        u = await self._url("/containers/json")
+        res = self._result(await self._get(u, params=params), True)
+
+        if quiet:
+            return [{'Id': x['Id']} for x in res]
+        if trunc:
+            for x in res:
+                x['Id'] = x['Id'][:12]
+        return res
+
+    async def create_container(self, image, command=None, name=None,
+                               platform=None, **kwargs):
+        """
+        Create a container. Keyword arguments are the same as those of
+        :py:meth:`~docker.api.container.ContainerApiMixin.create_container`.
+
+        Returns:
+            A dictionary with an image 'Id' key and a 'Warnings' key.
+        """
+        version = await self._ensure_version()
+        config = ContainerConfig(version, image, command, **kwargs)
+        return await self.create_container_from_config(config, name, platform)
+
+    async def create_container_from_config(self, config, name=None,
+                                           platform=None):
+        u = await self._url("/containers/create")
+        params = {
+            'name': name
+        }
+        if platform:
+            if utils.version_lt(self._version, '1.41'):
+                raise errors.InvalidVersion(
+                    'platform is not supported for API version < 1.41'
+                )
+            params['platform'] = platform
+        res = await self._post_json(u, data=config, params=params)
+        return self._result(res, True)
+
+    def create_host_config(self, *args, **kwargs):
+        """
+        Create a dictionary for the ``host_config`` argument to
+        :py:meth:`create_container`. Requires the API version to be known,
+        either passed to the client or negotiated by a previous request.
+        """
+        if 'version' in kwargs:
+            raise TypeError(
+                "create_host_config() got an unexpected "
+                "keyword argument 'version'"
+            )
+        kwargs['version'] = self._known_version()
+        return HostConfig(*args, **kwargs)
+
+    def create_networking_config(self, *args, **kwargs):
+        return NetworkingConfig(*args, **kwargs)
+
+    def create_endpoint_config(self, *args, **kwargs):
+        return EndpointConfig(self._known_version(), *args, **kwargs)
+
+    def _known_version(self):
+        if self._version is None:
+            raise errors.DockerException(
+                'The API version has not been negotiated yet. Pass an '
+                'explicit version or await a request first.'
+            )
+        return self._version
+
+    @utils.check_resource('container')
+    async def diff(self, container):
+        """
+        Inspect changes on a container's filesystem.
+        """
+        return self._result(
+            await self._get(
+                await self._url("/containers/{0}/changes", container)
+            ),
+            True
+        )
+
+    @utils.check_resource('container')
+    async def export(self, container, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Export the contents of a filesystem as a tar archive, returned as an
+        asynchronous generator of chunks.
+        """
+        res = await self._get(
+            await self._url("/containers/{0}/export", container), stream=True
+        )
+        return self._stream_raw_result(res, chunk_size)
+
+    @utils.check_resource('container')
+    async def get_archive(self, container, path,
+                          chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                          encode_stream=False):
+        """
+        Retrieve a file or folder from a container in the form of a tar
+        archive. See
+        :py:meth:`~docker.api.container.ContainerApiMixin.get_archive`.
+
+        Returns:
+            (tuple): First element is an asynchronous generator of the raw
+            tar data. Second element is a dict containing ``stat``
+            information on the specified ``path``.
+        """
+        params = {
+            'path': path
+        }
+        headers = {
+            "Accept-Encoding": "gzip, deflate"
+        } if encode_stream else {
+            "Accept-Encoding": "identity"
+        }
+        url = await self._url('/containers/{0}/archive', container)
+        res = await self._get(
+            url, params=params, stream=True, headers=headers
+        )
+        self._raise_for_status(res)
+        encoded_stat = res.headers.get('x-docker-container-path-stat')
+        return (
+            self._stream_raw_result(res, chunk_size),
+            utils.decode_json_header(encoded_stat) if encoded_stat else None
+        )
+
+    @utils.check_resource('container')
+    async def inspect_container(self, container):
+        """
+        Identical to the `docker inspect` command, but only for containers.
+        """
+        return self._result(
+            await self._get(await self._url("/containers/{0}/json", container)),
+            True
+        )
+
+    @utils.check_resource('container')
+    async def kill(self, container, signal=None):
+        """
+        Kill a container or send a signal to a container.
+        """
+        url = await self._url("/containers/{0}/kill", container)
+        params = {}
+        if signal is not None:
+            if not isinstance(signal, str):
+                signal = int(signal)
+            params['signal'] = signal
+        res = await self._post(url, params=params)
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def logs(self, container, stdout=True, stderr=True, stream=False,
+                   timestamps=False, tail='all', since=None, follow=None,
+                   until=None):
+        """
+        Get logs from a container. If ``stream`` is set, an asynchronous
+        generator of log chunks is returned, which follows the output as it
+        happens. See :py:meth:`~docker.api.container.ContainerApiMixin.logs`.
+        """
+        if follow is None:
+            follow = stream
+        params = {'stderr': stderr and 1 or 0,
+                  'stdout': stdout and 1 or 0,
+                  'timestamps': timestamps and 1 or 0,
+                  'follow': follow and 1 or 0,
+                  }
+        if tail != 'all' and (not isinstance(tail, int) or tail < 0):
+            tail = 'all'
+        params['tail'] = tail
+
+        url = await self._url("/containers/{0}/logs", container)
+        for key, value in (('since', since), ('until', until)):
+            if value is None:
+                continue
+            if key == 'until' and utils.version_lt(self._version, '1.35'):
+                raise errors.InvalidVersion(
+                    'until is not supported for API version < 1.35'
+                )
+            if isinstance(value, datetime):
+                params[key] = utils.datetime_to_timestamp(value)
+            elif isinstance(value, (int, float)) and value > 0:
+                params[key] = value
+            else:
+                raise errors.InvalidArgument(
+                    f'{key} value should be datetime or positive int/float,'
+                    f' not {type(value)}'
+                )
+
+        is_tty = await self._check_is_tty(container)
+        res = await self._get(url, params=params, stream=stream)
+        return await self._get_result_tty(stream, res, is_tty)
+
+    @utils.check_resource('container')
+    async def pause(self, container):
+        """
+        Pauses all processes within a container.
+        """
+        url = await self._url('/containers/{0}/pause', container)
+        self._raise_for_status(await self._post(url))
+
+    @utils.check_resource('container')
+    async def port(self, container, private_port):
+        """
+        Lookup the public-facing port that is NAT-ed to ``private_port``.
+        Identical to the ``docker port`` command.
+        """
+        res = await self._get(
+            await self._url("/containers/{0}/json", container)
+        )
+        self._raise_for_status(res)
+        json_ = res.json()
+        private_port = str(private_port)
+        h_ports = None
+
+        # Port settings is None when the container is running with
+        # network_mode=host.
+        port_settings = json_.get('NetworkSettings', {}).get('Ports')
+        if port_settings is None:
+            return None
+
+        if '/' in private_port:
+            return port_settings.get(private_port)
+
+        for protocol in ['tcp', 'udp', 'sctp']:
+            h_ports = port_settings.get(f"{private_port}/{protocol}")
+            if h_ports:
+                break
+
+        return h_ports
+
+    @utils.check_resource('container')
+    async def put_archive(self, container, path, data):
+        """
+        Insert a file or folder in an existing container using a tar archive
+        as source. ``data`` may be bytes, a file object, or an iterable or
+        asynchronous iterable of bytes.
+
+        Returns:
+            (bool): True if the call succeeds.
+        """
+        params = {'path': path}
+        url = await self._url('/containers/{0}/archive', container)
+        res = await self._put(url, params=params, data=data)
+        self._raise_for_status(res)
+        return res.status_code == 200
+
+    async def prune_containers(self, filters=None):
+        """
+        Delete stopped containers.
+
+        Returns:
+            (dict): A dict containing a list of deleted container IDs and
+                the amount of disk space reclaimed in bytes.
+        """
+        params = {}
+        if filters:
+            params['filters'] = utils.convert_filters(filters)
+        url = await self._url('/containers/prune')
+        if utils.version_lt(self._version, '1.25'):
+            raise errors.InvalidVersion(
+                'prune_containers is not available for version < 1.25'
+            )
+        return self._result(await self._post(url, params=params), True)
+
+    @utils.check_resource('container')
+    async def remove_container(self, container, v=False, link=False,
+                               force=False):
+        """
+        Remove a container. Similar to the ``docker rm`` command.
+        """
+        params = {'v': v, 'link': link, 'force': force}
+        res = await self._delete(
+            await self._url("/containers/{0}", container), params=params
+        )
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def rename(self, container, name):
+        """
+        Rename a container. Similar to the ``docker rename`` command.
+        """
+        url = await self._url("/containers/{0}/rename", container)
+        params = {'name': name}
+        res = await self._post(url, params=params)
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def resize(self, container, height, width):
+        """
+        Resize the tty session.
+        """
+        params = {'h': height, 'w': width}
+        url = await self._url("/containers/{0}/resize", container)
+        res = await self._post(url, params=params)
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def restart(self, container, timeout=10):
+        """
+        Restart a container. Similar to the ``docker restart`` command.
+        """
+        params = {'t': timeout}
+        url = await self._url("/containers/{0}/restart", container)
+        conn_timeout = self.timeout
+        if conn_timeout is not None:
+            conn_timeout += timeout
+        res = await self._post(url, params=params, timeout=conn_timeout)
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def start(self, container):
+        """
+        Start a container. Similar to the ``docker start`` command.
+        """
+        url = await self._url("/containers/{0}/start", container)
+        self._raise_for_status(await self._post(url))
+
+    @utils.check_resource('container')
+    async def stats(self, container, decode=None, stream=True, one_shot=None):
+        """
+        Statistics for a container. If ``stream`` is set, an asynchronous
+        generator is returned. See
+        :py:meth:`~docker.api.container.ContainerApiMixin.stats`.
+        """
+        url = await self._url("/containers/{0}/stats", container)
+        params = {
+            'stream': stream
+        }
+        if one_shot is not None:
+            if utils.version_lt(self._version, '1.41'):
+                raise errors.InvalidVersion(
+                    'one_shot is not supported for API version < 1.41'
+                )
+            params['one-shot'] = one_shot
+        if stream:
+            if one_shot:
+                raise errors.InvalidArgument(
+                    'one_shot is only available in conjunction with '
+                    'stream=False'
+                )
+            return self._stream_helper(
+                await self._get(url, stream=True, params=params),
+                decode=decode
+            )
+        if decode:
+            raise errors.InvalidArgument(
+                "decode is only available in conjunction with stream=True"
+            )
+        return self._result(await self._get(url, params=params), json=True)
+
+    @utils.check_resource('container')
+    async def stop(self, container, timeout=None):
+        """
+        Stops a container. Similar to the ``docker stop`` command.
+        """
+        if timeout is None:
+            params = {}
+            timeout = 10
+        else:
+            params = {'t': timeout}
+        url = await self._url("/containers/{0}/stop", container)
+        conn_timeout = self.timeout
+        if conn_timeout is not None:
+            conn_timeout += timeout
+        res = await self._post(url, params=params, timeout=conn_timeout)
+        self._raise_for_status(res)
+
+    @utils.check_resource('container')
+    async def top(self, container, ps_args=None):
+        """
+        Display the running processes of a container.
+        """
+        u = await self._url("/containers/{0}/top", container)
+        params = {}
+        if ps_args is not None:
+            params['ps_args'] = ps_args
+        return self._result(await self._get(u, params=params), True)
+
+    @utils.check_resource('container')
+    async def unpause(self, container):
+        """
+        Unpause all processes within a container.
+        """
+        url = await self._url('/containers/{0}/unpause', container)
+        self._raise_for_status(await self._post(url))
+
+    @utils.check_resource('container')
+    async def update_container(
+        self, container, blkio_weight=None, cpu_period=None, cpu_quota=None,
+        cpu_shares=None, cpuset_cpus=None, cpuset_mems=None, mem_limit=None,
+        mem_reservation=None, memswap_limit=None, kernel_memory=None,
+        restart_policy=None
+    ):
+        """
+        Update resource configs of one or more containers. See
+        :py:meth:`~docker.api.container.ContainerApiMixin.update_container`.
+
+        Returns:
+            (dict): Dictionary containing a ``Warnings`` key.
+        """
+        url = await self._url('/containers/{0}/update', container)
+        data = {}
+        if blkio_weight:
+            data['BlkioWeight'] = blkio_weight
+        if cpu_period:
+            data['CpuPeriod'] = cpu_period
+        if cpu_shares:
+            data['CpuShares'] = cpu_shares
+        if cpu_quota:
+            data['CpuQuota'] = cpu_quota
+        if cpuset_cpus:
+            data['CpusetCpus'] = cpuset_cpus
+        if cpuset_mems:
+            data['CpusetMems'] = cpuset_mems
+        if mem_limit:
+            data['Memory'] = utils.parse_bytes(mem_limit)
+        if mem_reservation:
+            data['MemoryReservation'] = utils.parse_bytes(mem_reservation)
+        if memswap_limit:
+            data['MemorySwap'] = utils.parse_bytes(memswap_limit)
+        if kernel_memory:
+            data['KernelMemory'] = utils.parse_bytes(kernel_memory)
+        if restart_policy:
+            if utils.version_lt(self._version, '1.23'):
+                raise errors.InvalidVersion(
+                    'restart policy update is not supported '
+                    'for API version < 1.23'
+                )
+            data['RestartPolicy'] = restart_policy
+        res = await self._post_json(url, data=data)
+        return self._result(res, True)
+
+    @utils.check_resource('container')
+    async def wait(self, container, timeout=None, condition=None):
+        """
+        Wait until a container stops, then return its exit code.
+        """
+        url = await self._url("/containers/{0}/wait", container)
+        params = {}
+        if condition is not None:
+            if utils.version_lt(self._version, '1.30'):
+                raise errors.InvalidVersion(
+                    'wait condition is not supported for API version < 1.30'
+                )
+            params['condition'] = condition
+
+        res = await self._post(url, timeout=timeout, params=params)
+        return self._result(res, True)
@@ -0,0 +1,119 @@
+import os
+from datetime import datetime
+
+from ... import auth, utils
+
+
+class AsyncDaemonApiMixin:
+    async def df(self):
+        """
+        Get data usage information.
+        """
+        url = await self._url('/system/df')
+        return self._result(await self._get(url), True)
+
+    async def events(self, since=None, until=None, filters=None, decode=None):
+        """
+        Get real-time events from the server, as an asynchronous generator.
+        Similar to the ``docker events`` command. Stop following events by
+        closing the generator with ``aclose()`` or cancelling the task
+        iterating over it.
+
+        Args:
+            since (UTC datetime or int): Get events from this point
+            until (UTC datetime or int): Get events until this point
+            filters (dict): Filter the events by event time, container or image
+            decode (bool): If set to true, stream will be decoded into dicts on
+                the fly. False by default.
+
+        Example:
+
+            >>> async for event in client.events(decode=True):
+            ...   print(event)
+        """
+        if isinstance(since, datetime):
+            since = utils.datetime_to_timestamp(since)
+
+        if isinstance(until, datetime):
+            until = utils.datetime_to_timestamp(until)
+
+        if filters:
+            filters = utils.convert_filters(filters)
+
+        params = {
+            'since': since,
+            'until': until,
+            'filters': filters
+        }
+        url = await self._url('/events')
+
+        response = await self._get(
+            url, params=params, stream=True, timeout=None
+        )
+        async for event in self._stream_helper(response, decode=decode):
+            yield event
+
+    async def info(self):
+        """
+        Display system-wide information. Identical to the ``docker info``
+        command.
+        """
+        return self._result(await self._get(await self._url("/info")), True)
+
+    async def login(self, username, password=None, email=None, registry=None,
+                    reauth=False, dockercfg_path=None):
+        """
+        Authenticate with a registry. Similar to the ``docker login`` command.
+        See :py:meth:`~docker.api.daemon.DaemonApiMixin.login`.
+
+        Returns:
+            (dict): The response from the login request
+        """
+
+        # If we don't have any auth data so far, try reloading the config file
+        # one more time in case anything showed up in there.
+        if dockercfg_path and os.path.exists(dockercfg_path):
+            self._auth_configs = auth.load_config(
+                dockercfg_path, credstore_env=self.credstore_env
+            )
+        elif not self._auth_configs or self._auth_configs.is_empty:
+            self._auth_configs = auth.load_config(
+                credstore_env=self.credstore_env
+            )
+
+        authcfg = self._auth_configs.resolve_authconfig(registry)
+        # If we found an existing auth config for this registry and username
+        # combination, we can return it immediately unless reauth is requested.
+        if authcfg and authcfg.get('username', None) == username \
+                and not reauth:
+            return authcfg
+
+        req_data = {
+            'username': username,
+            'password': password,
+            'email': email,
+            'serveraddress': registry,
+        }
+
+        response = await self._post_json(
+            await self._url('/auth'), data=req_data
+        )
+        if response.status_code == 200:
+            self._auth_configs.add_auth(registry or auth.INDEX_NAME, req_data)
+        return self._result(response, json=True)
+
+    async def ping(self):
+        """
+        Checks the server is responsive. An exception will be raised if it
+        isn't responding.
+        """
+        url = await self._url('/_ping')
+        return self._result(await self._get(url)) == 'OK'
+
+    async def version(self, api_version=True):
+        """
+        Returns version information from the server. Similar to the ``docker
+        version`` command.
+        """
+        url = await self._url("/version", versioned_api=api_version)
+        return self._result(await self._get(url), json=True)
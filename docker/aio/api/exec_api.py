@@ -0,0 +1,122 @@
+from ... import errors
+from ... import utils
+
+
+class AsyncExecApiMixin:
+    @utils.check_resource('container')
+    async def exec_create(self, container, cmd, stdout=True, stderr=True,
+                          stdin=False, tty=False, privileged=False, user='',
+                          environment=None, workdir=None, detach_keys=None):
+        """
+        Sets up an exec instance in a running container. See
+        :py:meth:`~docker.api.exec_api.ExecApiMixin.exec_create`.
+
+        Returns:
+            (dict): A dictionary with an exec ``Id`` key.
+        """
+        url = await self._url('/containers/{0}/exec', container)
+
+        if environment is not None and utils.version_lt(self._version, '1.25'):
+            raise errors.InvalidVersion(
+                'Setting environment for exec is not supported in API < 1.25'
+            )
+
+        if isinstance(cmd, str):
+            cmd = utils.split_command(cmd)
+
+        if isinstance(environment, dict):
+            environment = utils.utils.format_environment(environment)
+
+        data = {
+            'Container': container,
+            'User': user,
+            'Privileged': privileged,
+            'Tty': tty,
+            'AttachStdin': stdin,
+            'AttachStdout': stdout,
+            'AttachStderr': stderr,
+            'Cmd': cmd,
+            'Env': environment,
+        }
+
+        if workdir is not None:
+            if utils.version_lt(self._version, '1.35'):
+                raise errors.InvalidVersion(
+                    'workdir is not supported for API version < 1.35'
+                )
+            data['WorkingDir'] = workdir
+
+        if detach_keys:
+            data['detachKeys'] = detach_keys
+        elif 'detachKeys' in self._general_configs:
+            data['detachKeys'] = self._general_configs['detachKeys']
+
+        res = await self._post_json(url, data=data)
+        return self._result(res, True)
+
+    async def exec_inspect(self, exec_id):
+        """
+        Return low-level information about an exec command.
+        """
+        if isinstance(exec_id, dict):
+            exec_id = exec_id.get('Id')
+        res = await self._get(await self._url("/exec/{0}/json", exec_id))
+        return self._result(res, True)
+
+    async def exec_resize(self, exec_id, height=None, width=None):
+        """
+        Resize the tty session used by the specified exec command.
+        """
+        if isinstance(exec_id, dict):
+            exec_id = exec_id.get('Id')
+
+        params = {'h': height, 'w': width}
+        url = await self._url("/exec/{0}/resize", exec_id)
+        res = await self._post(url, params=params)
+        self._raise_for_status(res)
+
+    @utils.check_resource('exec_id')
+    async def exec_start(self, exec_id, detach=False, tty=False, stream=False,
+                         demux=False):
+        """
+        Start a previously set up exec instance.
+
+        Args:
+            exec_id (str): ID of the exec instance
+            detach (bool): If true, detach from the exec command.
+                Default: False
+            tty (bool): Allocate a pseudo-TTY. Default: False
+            stream (bool): Return response data progressively as an
+                asynchronous generator, rather than a single string.
+            demux (bool): Return stdout and stderr separately
+
+        Returns:
+            (async generator or bytes or tuple): If ``stream=True``, an
+            asynchronous generator yielding response chunks. If
+            ``demux=True``, the data is split into ``(stdout, stderr)``
+            tuples.
+        """
+        data = {
+            'Tty': tty,
+            'Detach': detach
+        }
+
+        headers = {} if detach else {
+            'Connection': 'Upgrade',
+            'Upgrade': 'tcp'
+        }
+
+        res = await self._post_json(
+            await self._url('/exec/{0}/start', exec_id),
+            headers=headers,
+            data=data,
+            stream=True
+        )
+        self._raise_for_status(res)
+        if detach:
+            await res.read()
+            return self._result(res)
+
+        return await self._read_from_socket(
+            res, stream, tty=tty, demux=demux
+        )
@@ -0,0 +1,349 @@
+import asyncio
+import logging
+
+from ... import auth, errors, utils
+from ...api.image import _import_image_params
+from ...constants import DEFAULT_DATA_CHUNK_SIZE
+
+log = logging.getLogger(__name__)
+
+
+class AsyncImageApiMixin:
+    @utils.check_resource('image')
+    async def get_image(self, image, chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Get a tarball of an image, returned as an asynchronous generator of
+        chunks. Similar to the ``docker save`` command.
+        """
+        res = await self._get(
+            await self._url("/images/{0}/get", image), stream=True
+        )
+        return self._stream_raw_result(res, chunk_size)
+
+    @utils.check_resource('image')
+    async def history(self, image):
+        """
+        Show the history of an image.
+        """
+        res = await self._get(await self._url("/images/{0}/history", image))
+        return self._result(res, True)
+
+    async def images(self, name=None, quiet=False, all=False, filters=None):
+        """
+        List images. Similar to the ``docker images`` command.
+        """
+        url = await self._url("/images/json")
+        params = {
+            'only_ids': 1 if quiet else 0,
+            'all': 1 if all else 0,
+        }
+        if name:
+            if utils.version_lt(self._version, '1.25'):
+                # only use "filter" on API 1.24 and under, as it is deprecated
+                params['filter'] = name
+            else:
+                if filters:
+                    filters['reference'] = name
+                else:
+                    filters = {'reference': name}
+        if filters:
+            params['filters'] = utils.convert_filters(filters)
+        res = self._result(await self._get(url, params=params), True)
+        if quiet:
+            return [x['Id'] for x in res]
+        return res
+
+    async def import_image(self, src=None, repository=None, tag=None,
+                           image=None, changes=None, stream_src=False):
+        """
+        Import an image. Similar to the ``docker import`` command. See
+        :py:meth:`~docker.api.image.ImageApiMixin.import_image`. Raw data
+        in ``src`` may also be an asynchronous iterable of bytes.
+        """
+        if not (src or image):
+            raise errors.DockerException(
+                'Must specify src or image to import from'
+            )
+        u = await self._url('/images/create')
+
+        params = _import_image_params(
+            repository, tag, image,
+            src=(src if isinstance(src, str) else None),
+            changes=changes
+        )
+        headers = {'Content-Type': 'application/tar'}
+
+        if image or params.get('fromSrc') != '-':  # from image or URL
+            return self._result(
+                await self._post(u, data=None, params=params)
+            )
+        elif isinstance(src, str):  # from file path
+            loop = asyncio.get_running_loop()
+            f = await loop.run_in_executor(None, open, src, 'rb')
+            with f:
+                return self._result(
+                    await self._post(
+                        u, data=f, params=params, headers=headers, timeout=None
+                    )
+                )
+        else:  # from raw data
+            # The transport sends any body other than bytes chunked, so
+            # stream_src needs no header of its own here.
+            return self._result(
+                await self._post(u, data=src, params=params, headers=headers)
+            )
+
+    async def import_image_from_data(self, data, repository=None, tag=None,
+                                     changes=None):
+        """
+        Like :py:meth:`import_image`, but allows importing in-memory bytes
+        data.
+        """
+        u = await self._url('/images/create')
+        params = _import_image_params(
+            repository, tag, src='-', changes=changes
+        )
+        headers = {'Content-Type': 'application/tar'}
+        return self._result(
+            await self._post(
+                u, data=data, params=params, headers=headers, timeout=None
+            )
+        )
+
+    async def import_image_from_file(self, filename, repository=None,
+                                     tag=None, changes=None):
+        """
+        Like :py:meth:`import_image`, but only supports importing from a tar
+        file on disk.
+        """
+        return await self.import_image(
+            src=filename, repository=repository, tag=tag, changes=changes
+        )
+
+    async def import_image_from_stream(self, stream, repository=None,
+                                       tag=None, changes=None):
+        return await self.import_image(
+            src=stream, stream_src=True, repository=repository, tag=tag,
+            changes=changes
+        )
+
+    async def import_image_from_url(self, url, repository=None, tag=None,
+                                    changes=None):
+        """
+        Like :py:meth:`import_image`, but only supports importing from a URL.
+        """
+        return await self.import_image(
+            src=url, repository=repository, tag=tag, changes=changes
+        )
+
+    async def import_image_from_image(self, image, repository=None,
+                                      tag=None, changes=None):
+        """
+        Like :py:meth:`import_image`, but only supports importing from
+        another image, like the ``FROM`` Dockerfile parameter.
+        """
+        return await self.import_image(
+            image=image, repository=repository, tag=tag, changes=changes
+        )
+
+    async def inspect_image(self, image):
+        """
+        Get detailed information about an image.
+        """
+        return self._result(
+            await self._get(await self._url("/images/{0}/json", image)), True
+        )
+
+    @utils.check_resource('image')
+    async def inspect_distribution(self, image, auth_config=None):
+        """
+        Get image digest and platform information by contacting the
+        registry.
+        """
+        registry, _ = auth.resolve_repository_name(image)
+
+        headers = {}
+        if auth_config is None:
+            header = auth.get_config_header(self, registry)
+            if header:
+                headers['X-Registry-Auth'] = header
+        else:
+            log.debug('Sending supplied auth config')
+            headers['X-Registry-Auth'] = auth.encode_header(auth_config)
+
+        url = await self._url("/distribution/{0}/json", image)
+        if utils.version_lt(self._version, '1.30'):
+            raise errors.InvalidVersion(
+                'inspect_distribution is not available for version < 1.30'
+            )
+
+        return self._result(
+            await self._get(url, headers=headers), True
+        )
+
+    async def load_image(self, data, quiet=None):
+        """
+        Load an image that was previously saved using :py:meth:`get_image`
+        (or ``docker save``). Similar to ``docker load``. ``data`` may be
+        bytes, a file object, or an iterable or asynchronous iterable of
+        bytes.
+
+        Returns:
+            (async generator): Progress output as JSON objects. Only
+            available for API version >= 1.23
+        """
+        url = await self._url("/images/load")
+        params = {}
+
+        if quiet is not None:
+            if utils.version_lt(self._version, '1.23'):
+                raise errors.InvalidVersion(
+                    'quiet is not supported in API version < 1.23'
+                )
+            params['quiet'] = quiet
+
+        res = await self._post(url, data=data, params=params, stream=True)
+        if utils.version_gte(self._version, '1.23'):
+            return self._stream_helper(res, decode=True)
+
+        await res.read()
+        self._raise_for_status(res)
+
+    async def prune_images(self, filters=None):
+        """
+        Delete unused images.
+
+        Returns:
+            (dict): A dict containing a list of deleted image IDs and
+                the amount of disk space reclaimed in bytes.
+        """
+        url = await self._url("/images/prune")
+        if utils.version_lt(self._version, '1.25'):
+            raise errors.InvalidVersion(
+                'prune_images is not available for version < 1.25'
+            )
+        params = {}
+        if filters is not None:
+            params['filters'] = utils.convert_filters(filters)
+        return self._result(await self._post(url, params=params), True)
+
+    async def pull(self, repository, tag=None, stream=False, auth_config=None,
+                   decode=False, platform=None, all_tags=False):
+        """
+        Pulls an image. Similar to the ``docker pull`` command. If ``stream``
+        is set, an asynchronous generator of the progress output is returned.
+        See :py:meth:`~docker.api.image.ImageApiMixin.pull`.
+        """
+        url = await self._url('/images/create')
+        repository, image_tag = utils.parse_repository_tag(repository)
+        tag = tag or image_tag or 'latest'
+
+        if all_tags:
+            tag = None
+
+        registry, repo_name = auth.resolve_repository_name(repository)
+
+        params = {
+            'tag': tag,
+            'fromImage': repository
+        }
+        headers = {}
+
+        if auth_config is None:
+            header = auth.get_config_header(self, registry)
+            if header:
+                headers['X-Registry-Auth'] = header
+        else:
+            log.debug('Sending supplied auth config')
+            headers['X-Registry-Auth'] = auth.encode_header(auth_config)
+
+        if platform is not None:
+            if utils.version_lt(self._version, '1.32'):
+                raise errors.InvalidVersion(
+                    'platform was only introduced in API version 1.32'
+                )
+            params['platform'] = platform
+
+        response = await self._post(
+            url, params=params, headers=headers, stream=stream, timeout=None
+        )
+        self._raise_for_status(response)
+
+        if stream:
+            return self._stream_helper(response, decode=decode)
+
+        return self._result(response)
+
+    async def push(self, repository, tag=None, stream=False, auth_config=None,
+                   decode=False):
+        """
+        Push an image or a repository to the registry. If ``stream`` is set,
+        an asynchronous generator of the progress output is returned.
+        """
+        if not tag:
+            repository, tag = utils.parse_repository_tag(repository)
+        registry, repo_name = auth.resolve_repository_name(repository)
+        u = await self._url("/images/{0}/push", repository)
+        params = {
+            'tag': tag
+        }
+        headers = {}
+
+        if auth_config is None:
+            header = auth.get_config_header(self, registry)
+            if header:
+                headers['X-Registry-Auth'] = header
+        else:
+            log.debug('Sending supplied auth config')
+            headers['X-Registry-Auth'] = auth.encode_header(auth_config)
+
+        response = await self._post_json(
+            u, None, headers=headers, stream=stream, params=params,
+            timeout=None
+        )
+        self._raise_for_status(response)
+
+        if stream:
+            return self._stream_helper(response, decode=decode)
+
+        return self._result(response)
+
+    @utils.check_resource('image')
+    async def remove_image(self, image, force=False, noprune=False):
+        """
+        Remove an image. Similar to the ``docker rmi`` command.
+        """
+        params = {'force': force, 'noprune': noprune}
+        res = await self._delete(
+            await self._url("/images/{0}", image), params=params
+        )
+        return self._result(res, True)
+
+    async def search(self, term, limit=None):
+        """
+        Search for images on Docker Hub. Similar to the ``docker search``
+        command.
+        """
+        params = {'term': term}
+        if limit is not None:
+            params['limit'] = limit
+
+        return self._result(
+            await self._get(await self._url("/images/search"), params=params),
+            True
+        )
+
+    @utils.check_resource('image')
+    async def tag(self, image, repository, tag=None, force=False):
+        """
+        Tag an image into a repository. Similar to the ``docker tag`` command.
+        """
+        params = {
+            'tag': tag,
+            'repo': repository,
+            'force': 1 if force else 0
+        }
+        url = await self._url("/images/{0}/tag", image)
+        res = await self._post(url, params=params)
+        self._raise_for_status(res)
+        return res.status_code == 201
@@ -0,0 +1,85 @@
+from ..constants import DEFAULT_MAX_POOL_SIZE, DEFAULT_TIMEOUT_SECONDS
+from ..utils import kwargs_from_env
+from .api.client import AsyncAPIClient
+
+
+class AsyncDockerClient:
+    """
+    An asyncio client for communicating with a Docker server. The low-level
+    :py:class:`AsyncAPIClient` is available as ``client.api``.
+
+    Example:
+
+        >>> from docker.aio import AsyncDockerClient
+        >>> async with AsyncDockerClient.from_env() as client:
+        ...     await client.ping()
+
+    Args:
+        base_url (str): URL to the Docker server. For example,
+            ``unix:///var/run/docker.sock`` or ``tcp://127.0.0.1:1234``.
+        version (str): The version of the API to use. Set to ``auto`` to
+            detect the server's version on the first request.
+            Default: ``auto``
+        timeout (int): Default timeout for API calls, in seconds.
+        tls (bool or :py:class:`~docker.tls.TLSConfig`): Enable TLS.
+        user_agent (str): Set a custom user agent for requests to the server.
+        credstore_env (dict): Override environment variables when calling the
+            credential store process.
+        max_pool_size (int): The maximum number of idle connections
+            to keep in the pool.
+    """
+    def __init__(self, *args, **kwargs):
+        self.api = AsyncAPIClient(*args, **kwargs)
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """
+        Return a client configured from environment variables, in the same
+        way as :py:meth:`docker.client.DockerClient.from_env`.
+        """
+        timeout = kwargs.pop('timeout', DEFAULT_TIMEOUT_SECONDS)
+        max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_POOL_SIZE)
+        version = kwargs.pop('version', None)
+        version_cache = kwargs.pop('version_cache', None)
+        return cls(
+            timeout=timeout,
+            max_pool_size=max_pool_size,
+            version=version,
+            version_cache=version_cache,
+            **kwargs_from_env(**kwargs)
+        )
+
+    async def __aenter__(self):
+        await self.api.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Top-level methods
+    def events(self, *args, **kwargs):
+        return self.api.events(*args, **kwargs)
+    events.__doc__ = AsyncAPIClient.events.__doc__
+
+    async def df(self):
+        return await self.api.df()
+    df.__doc__ = AsyncAPIClient.df.__doc__
+
+    async def info(self, *args, **kwargs):
+        return await self.api.info(*args, **kwargs)
+    info.__doc__ = AsyncAPIClient.info.__doc__
+
+    async def ping(self, *args, **kwargs):
+        return await self.api.ping(*args, **kwargs)
+    ping.__doc__ = AsyncAPIClient.ping.__doc__
+
+    async def version(self, *args, **kwargs):
+        return await self.api.version(*args, **kwargs)
+    version.__doc__ = AsyncAPIClient.version.__doc__
+
+    async def close(self):
+        return await self.api.close()
+    close.__doc__ = AsyncAPIClient.close.__doc__
+
+
+from_env = AsyncDockerClient.from_env
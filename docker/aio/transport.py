@@ -0,0 +1,457 @@
+import asyncio
+import collections
+import json
+import os
+import ssl
+import urllib.parse
+
+import requests.exceptions
+from requests.structures import CaseInsensitiveDict
+
+from .. import constants
+from ..errors import DockerException
+from ..tls import TLSConfig
+
+
+def encode_params(params):
+    """
+    Encode a query parameter mapping the same way ``requests`` does:
+    ``None`` values are dropped and sequences are repeated.
+    """
+    if not params:
+        return ''
+    if isinstance(params, (str, bytes)):
+        return params
+    result = []
+    for k, vs in params.items():
+        if isinstance(vs, (str, bytes)) or not hasattr(vs, '__iter__'):
+            vs = [vs]
+        for v in vs:
+            if v is not None:
+                result.append((k, v))
+    return urllib.parse.urlencode(result, doseq=True)
+
+
+class AsyncConnection:
+    """
+    A single HTTP/1.1 connection to the Docker daemon, backed by asyncio
+    streams. ``process`` is set when the connection is tunneled through an
+    ``ssh`` subprocess.
+    """
+
+    def __init__(self, reader, writer, process=None):
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+
+    @property
+    def closed(self):
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.terminate()
+            except ProcessLookupError:
+                pass
+
+
+class AsyncResponse:
+    """
+    An HTTP response read from an :py:class:`AsyncConnection`. Mirrors the
+    subset of :py:class:`requests.Response` used by the API mixins. The body
+    is either read in full with :py:meth:`read` or consumed incrementally with
+    :py:meth:`iter_chunks`.
+    """
+
+    def __init__(self, transport, connection, method, url, status_code,
+                 reason, headers):
+        self._transport = transport
+        self.connection = connection
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.request = None
+        self._content = None
+
+        self.chunked = 'chunked' in headers.get(
+            'Transfer-Encoding', ''
+        ).lower()
+        length = headers.get('Content-Length')
+        self.length = None
+        if length is not None and not self.chunked:
+            self.length = int(length)
+        if method == 'HEAD' or status_code in (204, 304):
+            self.length = 0
+        # A hijacked (upgraded) connection carries a raw stream until EOF
+        self.hijacked = status_code == 101
+        self._done = self.length == 0
+        self._released = False
+        if self._done:
+            self._release()
+
+    @property
+    def content(self):
+        return self._content
+
+    @property
+    def text(self):
+        return (self._content or b'').decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self._content)
+
+    @property
+    def keep_alive(self):
+        if self.hijacked:
+            return False
+        if self.headers.get('Connection', '').lower() == 'close':
+            return False
+        return self.chunked or self.length is not None
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 500:
+            kind = 'Client Error'
+        elif 500 <= self.status_code < 600:
+            kind = 'Server Error'
+        else:
+            return
+        raise requests.exceptions.HTTPError(
+            f'{self.status_code} {kind}: {self.reason} for url: {self.url}',
+            response=self
+        )
+
+    async def read(self):
+        """
+        Read the whole response body and return it.
+        """
+        if self._content is None:
+            self._content = b''.join(
+                [chunk async for chunk in self.iter_chunks()]
+            )
+        return self._content
+
+    async def iter_chunks(self, chunk_size=constants.DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Asynchronous generator of body chunks as they arrive. For a chunked
+        response, one item is yielded per transfer-encoding chunk. Raises
+        :py:class:`ConnectionResetError` if the connection is closed before
+        the end of the body.
+        """
+        if self._done:
+            return
+        reader = self.connection.reader
+        try:
+            if self.chunked:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        raise asyncio.IncompleteReadError(b'', None)
+                    size = int(line.split(b';', 1)[0].strip(), 16)
+                    if size == 0:
+                        # Consume optional trailers up to the final CRLF
+                        while (await reader.readline()).strip():
+                            pass
+                        self._done = True
+                        break
+                    data = await reader.readexactly(size)
+                    await reader.readexactly(2)
+                    yield data
+            elif self.length is not None:
+                remaining = self.length
+                while remaining > 0:
+                    data = await reader.read(min(chunk_size, remaining))
+                    if not data:
+                        raise asyncio.IncompleteReadError(b'', remaining)
+                    remaining -= len(data)
+                    yield data
+                self._done = True
+            else:
+                while True:
+                    data = await reader.read(chunk_size)
+                    if not data:
+                        break
+                    yield data
+                self._done = True
+        except asyncio.IncompleteReadError as e:
+            raise ConnectionResetError(
+                'Connection closed before the end of the response body'
+            ) from e
+        finally:
+            self._release()
+
+    def _release(self):
+        if self._released:
+            return
+        self._released = True
+        if self._done and self.keep_alive:
+            self._transport.pool.release(self.connection)
+        else:
+            self.connection.close()
+
+    def close(self):
+        """
+        Close the response, discarding the connection if the body was not
+        fully consumed.
+        """
+        self._release()
+
+
+class AsyncConnectionPool:
+    """
+    Keep up to ``maxsize`` idle keep-alive connections around. Like the
+    non-blocking ``urllib3`` pools used by :py:class:`~docker.APIClient`, new
+    connections are opened when none are idle and surplus connections are
+    discarded when they are returned.
+    """
+
+    def __init__(self, connect, maxsize=constants.DEFAULT_MAX_POOL_SIZE):
+        self._connect = connect
+        self.maxsize = maxsize
+        self._idle = collections.deque()
+
+    async def acquire(self):
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.closed:
+                return conn, True
+            conn.close()
+        return await self._connect(), False
+
+    def release(self, conn):
+        if conn.closed or len(self._idle) >= self.maxsize:
+            conn.close()
+        else:
+            self._idle.append(conn)
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class AsyncTransport:
+    """
+    Non-blocking HTTP/1.1 transport for the Docker daemon. Supports
+    ``http+unix://``, ``http://``, ``https://`` and ``ssh://`` base URLs, as
+    returned by :py:func:`docker.utils.parse_host`.
+
+    SSH connections shell out to the ``ssh`` client, running
+    ``docker system dial-stdio`` on the remote host, as paramiko does not
+    provide non-blocking channels.
+    """
+
+    def __init__(self, base_url, tls=False, timeout=None,
+                 max_pool_size=constants.DEFAULT_MAX_POOL_SIZE):
+        self.base_url = base_url
+        self.timeout = timeout
+        self._ssl_context = None
+        self.host_header = 'localhost'
+
+        if base_url.startswith('http+unix://'):
+            path = base_url[len('http+unix://'):]
+            if not path.startswith('/'):
+                path = f'/{path}'
+            self._open = self._open_unix
+            self.socket_path = path
+        elif base_url.startswith('ssh://'):
+            self._open = self._open_ssh
+            self.ssh_host = base_url[len('ssh://'):]
+        elif base_url.startswith(('http://', 'https://')):
+            parsed = urllib.parse.urlparse(base_url)
+            self.host = parsed.hostname
+            self.port = parsed.port or (
+                443 if parsed.scheme == 'https' else 80
+            )
+            self.host_header = parsed.netloc
+            if parsed.scheme == 'https':
+                self._ssl_context = _create_ssl_context(tls)
+            self._open = self._open_tcp
+        else:
+            raise DockerException(
+                f'Unsupported protocol for the asyncio client: {base_url}'
+            )
+        self.pool = AsyncConnectionPool(self._open, maxsize=max_pool_size)
+
+    async def _open_unix(self):
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        return AsyncConnection(reader, writer)
+
+    async def _open_tcp(self):
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self._ssl_context,
+            server_hostname=self.host if self._ssl_context else None
+        )
+        return AsyncConnection(reader, writer)
+
+    async def _open_ssh(self):
+        host, port, user = self.ssh_host, None, None
+        if ':' in host:
+            host, port = host.split(':')
+        if '@' in host:
+            user, host = host.split('@')
+        args = ['ssh']
+        if user:
+            args += ['-l', user]
+        if port:
+            args += ['-p', port]
+        args += ['--', host, 'docker system dial-stdio']
+
+        env = dict(os.environ)
+        env.pop('LD_LIBRARY_PATH', None)
+        env.pop('SSL_CERT_FILE', None)
+
+        process = await asyncio.create_subprocess_exec(
+            *args, env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=not constants.IS_WINDOWS_PLATFORM,
+        )
+        return AsyncConnection(process.stdout, process.stdin, process)
+
+    async def request(self, method, url, params=None, data=None,
+                      headers=None, timeout=None, stream=False):
+        """
+        Send a request and return an :py:class:`AsyncResponse`. Unless
+        ``stream`` is set, the body is read before returning. Error bodies are
+        always read so that ``raise_for_status`` can explain the failure.
+        """
+        query = encode_params(params)
+        target = f'{url}?{query}' if query else url
+
+        conn, reused = await self.pool.acquire()
+        try:
+            response = await self._send(
+                conn, method, target, data, headers, timeout
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn.close()
+            if not reused or _is_streaming_body(data):
+                raise
+            # The daemon closed an idle keep-alive connection, try again on
+            # a fresh one.
+            conn = await self._open()
+            try:
+                response = await self._send(
+                    conn, method, target, data, headers, timeout
+                )
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+
+        if not stream or response.status_code >= 400:
+            await _wait_for(response.read(), timeout)
+        return response
+
+    async def _send(self, conn, method, target, data, headers, timeout):
+        head = [
+            f'{method} {target} HTTP/1.1',
+            f'Host: {self.host_header}',
+            'Accept-Encoding: identity',
+        ]
+        headers = CaseInsensitiveDict(headers or {})
+        body = data
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if body is None:
+            if method in ('POST', 'PUT'):
+                headers.setdefault('Content-Length', '0')
+        elif isinstance(body, (bytes, bytearray)):
+            headers['Content-Length'] = str(len(body))
+        else:
+            headers['Transfer-Encoding'] = 'chunked'
+        head.extend(f'{k}: {v}' for k, v in headers.items())
+        head.append('\r\n')
+
+        writer = conn.writer
+        writer.write('\r\n'.join(head).encode('latin-1'))
+        if isinstance(body, (bytes, bytearray)):
+            writer.write(body)
+        elif body is not None:
+            await _write_chunked(writer, body)
+        await writer.drain()
+
+        return await _wait_for(
+            self._read_head(conn, method, target), timeout
+        )
+
+    async def _read_head(self, conn, method, target):
+        reader = conn.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the daemon')
+        version, status, *reason = status_line.decode(
+            'latin-1'
+        ).rstrip('\r\n').split(' ', 2)
+        headers = CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            k, _, v = line.decode('latin-1').partition(':')
+            headers[k.strip()] = v.strip()
+        return AsyncResponse(
+            self, conn, method, f'{self.base_url}{target}', int(status),
+            reason[0] if reason else '', headers
+        )
+
+    def close(self):
+        self.pool.close()
+
+
+def _is_streaming_body(data):
+    return data is not None and not isinstance(data, (str, bytes, bytearray))
+
+
+async def _wait_for(aw, timeout):
+    if timeout is None:
+        return await aw
+    return await asyncio.wait_for(aw, timeout)
+
+
+async def _write_chunked(writer, body):
+    async def write(chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if chunk:
+            writer.write(b'%x\r\n%b\r\n' % (len(chunk), chunk))
+            await writer.drain()
+
+    if hasattr(body, '__aiter__'):
+        async for chunk in body:
+            await write(chunk)
+    elif hasattr(body, 'read'):
+        # Reading a file may block, keep the event loop running meanwhile
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(
+                None, body.read, constants.DEFAULT_DATA_CHUNK_SIZE
+            )
+            if not chunk:
+                break
+            await write(chunk)
+    else:
+        for chunk in body:
+            await write(chunk)
+    writer.write(b'0\r\n\r\n')
+
+
+def _create_ssl_context(tls):
+    if isinstance(tls, TLSConfig):
+        if tls.verify:
+            ca = tls.ca_cert
+            if isinstance(tls.verify, str):
+                ca = tls.verify
+            context = ssl.create_default_context(cafile=ca)
+        else:
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if tls.cert:
+            context.load_cert_chain(*tls.cert)
+        return context
+    return ssl.create_default_context()
@@ -20,7 +20,8 @@ class BuildApiMixin:
               decode=False, buildargs=None, gzip=False, shmsize=None,
               labels=None, cache_from=None, target=None, network_mode=None,
               squash=None, extra_hosts=None, platform=None, isolation=None,
-              use_config_proxy=True):
+              use_config_proxy=True, stream_context=False,
+              context_cache=None, gzip_level=9, gzip_workers=None):
         """
         Similar to the ``docker build`` command. Either ``path`` or ``fileobj``
         needs to be set. ``path`` can be a local path (to a directory
@@ -77,6 +78,10 @@ class BuildApiMixin:
                 unsuccessful builds
             dockerfile (str): path within the build context to the Dockerfile
             gzip (bool): If set to ``True``, gzip compression/encoding is used
+            gzip_level (int): The gzip compression level, from 0 to 9.
+                Default: 9
+            gzip_workers (int): If set, compress the build context with that
+                many threads, using independently compressed blocks.
             buildargs (dict): A dictionary of build arguments
             container_limits (dict): A dictionary of limits applied to each
                 container created by the build process. Valid keys:
@@ -109,6 +114,14 @@ class BuildApiMixin:
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            stream_context (bool or int): If set, the build context for
+                ``path`` is archived while it is being uploaded, as a chunked
+                request, instead of being written to a temporary file first.
+                Pass an int to set the size of the upload buffer, in bytes.
+                Default: ``False``
+            context_cache (:py:class:`~docker.utils.build.BuildContextCache`):
+                A cache of the file metadata of the build context for
+                ``path``, which is saved once the context has been sent.
 
         Returns:
             A generator for the build output.
@@ -151,18 +164,23 @@ class BuildApiMixin:
         elif not os.path.isdir(path):
             raise TypeError("You must specify a directory to build in path")
         else:
-            dockerignore = os.path.join(path, '.dockerignore')
-            exclude = None
-            if os.path.exists(dockerignore):
-                with open(dockerignore) as f:
-                    exclude = list(filter(
-                        lambda x: x != '' and x[0] != '#',
-                        [line.strip() for line in f.read().splitlines()]
-                    ))
+            exclude = read_dockerignore(path)
             dockerfile = process_dockerfile(dockerfile, path)
-            context = utils.tar(
-                path, exclude=exclude, dockerfile=dockerfile, gzip=gzip
-            )
+            if stream_context:
+                buffer_size = constants.DEFAULT_DATA_CHUNK_SIZE
+                if not isinstance(stream_context, bool):
+                    buffer_size = stream_context
+                context = utils.stream_tar(
+                    path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                    buffer_size=buffer_size, cache=context_cache,
+                    gzip_level=gzip_level, gzip_workers=gzip_workers
+                )
+            else:
+                context = utils.tar(
+                    path, exclude=exclude, dockerfile=dockerfile, gzip=gzip,
+                    cache=context_cache, gzip_level=gzip_level,
+                    gzip_workers=gzip_workers
+                )
             encoding = 'gzip' if gzip else encoding
 
         u = self._url('/build')
@@ -275,9 +293,41 @@ class BuildApiMixin:
 
         if context is not None and not custom_context:
             context.close()
+        if context_cache is not None:
+            context_cache.save()
 
         return self._stream_helper(response, decode=decode)
 
+    def build_context_digest(self, path, dockerfile=None, context_cache=None):
+        """
+        Compute a digest of the build context that :py:meth:`build` would
+        send for ``path``, honoring its ``.dockerignore`` file. The digest
+        only changes when the name, type, mode or contents of a file in the
+        context does, so it can be compared with the digest of a previous
+        build to skip building entirely. No request is made to the server.
+
+        Args:
+            path (str): Path to the directory containing the Dockerfile
+            dockerfile (str): path within the build context to the Dockerfile
+            context_cache (:py:class:`~docker.utils.build.BuildContextCache`):
+                A cache of the digests of the files in the context, so that
+                only files that changed since it was last saved are read.
+                It is saved before returning.
+
+        Returns:
+            (str): The digest, prefixed with ``sha256:``.
+        """
+        if not os.path.isdir(path):
+            raise TypeError("You must specify a directory to build in path")
+        digest = utils.context_digest(
+            path, exclude=read_dockerignore(path),
+            dockerfile=process_dockerfile(dockerfile, path),
+            cache=context_cache
+        )
+        if context_cache is not None:
+            context_cache.save()
+        return digest
+
     @utils.minimum_version('1.31')
     def prune_builds(self, filters=None, keep_storage=None, all=None):
         """
@@ -356,6 +406,17 @@ class BuildApiMixin:
             log.debug('No auth config found')
 
 
+def read_dockerignore(path):
+    dockerignore = os.path.join(path, '.dockerignore')
+    if not os.path.exists(dockerignore):
+        return None
+    with open(dockerignore) as f:
+        return list(filter(
+            lambda x: x != '' and x[0] != '#',
+            [line.strip() for line in f.read().splitlines()]
+        ))
+
+
 def process_dockerfile(dockerfile, path):
     if not dockerfile:
         return (None, None)
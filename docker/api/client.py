@@ -1,10 +1,10 @@
 import json
 import struct
+import threading
 import urllib
 from functools import partial
 
 import requests
-import requests.adapters
 import requests.exceptions
 
 from .. import auth
@@ -15,11 +15,13 @@ from ..constants import (DEFAULT_NUM_POOLS, DEFAULT_NUM_POOLS_SSH,
 from ..errors import (DockerException, InvalidVersion, TLSParameterError,
                       create_api_error_from_http_exception)
 from ..tls import TLSConfig
-from ..transport import UnixHTTPAdapter
+from ..transport import TCPHTTPAdapter, UnixHTTPAdapter
+from ..transport.poolstats import PoolStatsMixin
 from ..utils import check_resource, config, update_headers, utils
 from ..utils.json_stream import json_stream
 from ..utils.proxy import ProxyConfig
 from ..utils.socket import consume_socket_output, demux_adaptor, frames_iter
+from ..utils.version_cache import VersionCache
 from .build import BuildApiMixin
 from .config import ConfigApiMixin
 from .container import ContainerApiMixin
@@ -33,16 +35,6 @@ from .service import ServiceApiMixin
 from .swarm import SwarmApiMixin
 from .volume import VolumeApiMixin
 
-try:
-    from ..transport import NpipeHTTPAdapter
-except ImportError:
-    pass
-
-try:
-    from ..transport import SSHHTTPAdapter
-except ImportError:
-    pass
-
 
 class APIClient(
         requests.Session,
@@ -94,6 +86,14 @@ class APIClient(
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
             to save in the pool.
+        version_cache (:py:class:`~docker.utils.VersionCache` or bool): With
+            ``version='auto'``, look the version of the server up in this
+            cache, and record it there once retrieved. ``True`` uses a
+            :py:class:`~docker.utils.VersionCache` with the default options.
+        lazy_version (bool): With ``version='auto'``, retrieve the version of
+            the server when it is first needed, e.g. by the first request,
+            instead of when the client is created. Errors connecting to the
+            server are then raised at that point.
     """
 
     __attrs__ = requests.Session.__attrs__ + ['_auth_configs',
@@ -106,7 +106,8 @@ class APIClient(
                  timeout=DEFAULT_TIMEOUT_SECONDS, tls=False,
                  user_agent=DEFAULT_USER_AGENT, num_pools=None,
                  credstore_env=None, use_ssh_client=False,
-                 max_pool_size=DEFAULT_MAX_POOL_SIZE):
+                 max_pool_size=DEFAULT_MAX_POOL_SIZE, version_cache=None,
+                 lazy_version=False):
         super().__init__()
 
         if tls and not base_url:
@@ -156,58 +157,103 @@ class APIClient(
                     'The npipe:// protocol is only supported on Windows'
                 )
             try:
-                self._custom_adapter = NpipeHTTPAdapter(
-                    base_url, timeout, pool_connections=num_pools,
-                    max_pool_size=max_pool_size
-                )
-            except NameError as err:
+                from ..transport import NpipeHTTPAdapter
+            except ImportError as err:
                 raise DockerException(
                     'Install pypiwin32 package to enable npipe:// support'
                 ) from err
+            self._custom_adapter = NpipeHTTPAdapter(
+                base_url, timeout, pool_connections=num_pools,
+                max_pool_size=max_pool_size
+            )
             self.mount('http+docker://', self._custom_adapter)
             self.base_url = 'http+docker://localnpipe'
         elif base_url.startswith('ssh://'):
+            # Imported here, as paramiko is slow to import
             try:
-                self._custom_adapter = SSHHTTPAdapter(
-                    base_url, timeout, pool_connections=num_pools,
-                    max_pool_size=max_pool_size, shell_out=use_ssh_client
-                )
-            except NameError as err:
+                from ..transport import SSHHTTPAdapter
+            except ImportError as err:
                 raise DockerException(
                     'Install paramiko package to enable ssh:// support'
                 ) from err
+            self._custom_adapter = SSHHTTPAdapter(
+                base_url, timeout, pool_connections=num_pools,
+                max_pool_size=max_pool_size, shell_out=use_ssh_client
+            )
             self.mount('http+docker://ssh', self._custom_adapter)
             self._unmount('http://', 'https://')
             self.base_url = 'http+docker://ssh'
         else:
-            # Use SSLAdapter for the ability to specify SSL version
             if isinstance(tls, TLSConfig):
                 tls.configure_client(self)
-            elif tls:
-                self._custom_adapter = requests.adapters.HTTPAdapter(
-                    pool_connections=num_pools)
-                self.mount('https://', self._custom_adapter)
+            self._custom_adapter = TCPHTTPAdapter(
+                pool_connections=num_pools, pool_maxsize=max_pool_size
+            )
+            self.mount('http://', self._custom_adapter)
+            self.mount('https://', self._custom_adapter)
             self.base_url = base_url
 
+        self._server_url = base_url
+        if version_cache is True:
+            version_cache = VersionCache()
+        self._version_cache = version_cache or None
+        self._version_lock = threading.Lock()
+        self._api_version = None
+
         # version detection needs to be after unix adapter mounting
         if version is None or (isinstance(
                                 version,
                                 str
                                 ) and version.lower() == 'auto'):
-            self._version = self._retrieve_server_version()
-        else:
-            self._version = version
-        if not isinstance(self._version, str):
+            if not lazy_version:
+                self._ensure_version()
+        elif not isinstance(version, str):
             raise DockerException(
                 'Version parameter must be a string or None. '
                 f'Found {type(version).__name__}'
             )
-        if utils.version_lt(self._version, MINIMUM_DOCKER_API_VERSION):
+        else:
+            self._check_version(version)
+            self._version = version
+
+    @property
+    def _version(self):
+        if self._api_version is None:
+            return self._ensure_version()
+        return self._api_version
+
+    @_version.setter
+    def _version(self, version):
+        self._api_version = version
+
+    def _check_version(self, version):
+        if not isinstance(version, str):
+            raise DockerException(
+                'Invalid response from docker daemon: "ApiVersion" must be '
+                f'a string. Found {type(version).__name__}'
+            )
+        if utils.version_lt(version, MINIMUM_DOCKER_API_VERSION):
             raise InvalidVersion(
                 f'API versions below {MINIMUM_DOCKER_API_VERSION} are '
                 f'no longer supported by this library.'
             )
 
+    def _ensure_version(self):
+        with self._version_lock:
+            if self._api_version is not None:
+                return self._api_version
+            cache = self._version_cache
+            version = cache.get(self._server_url) if cache else None
+            if version is None:
+                version = self._retrieve_server_version()
+                self._check_version(version)
+                if cache:
+                    cache.put(self._server_url, version)
+            else:
+                self._check_version(version)
+            self._api_version = version
+        return version
+
     def _retrieve_server_version(self):
         try:
             return self.version(api_version=False)["ApiVersion"]
@@ -342,22 +388,31 @@ class APIClient(
 
         return sock
 
-    def _stream_helper(self, response, decode=False):
-        """Generator for data coming from a chunked-encoded HTTP response."""
+    def _detach_connection(self, response):
+        # The socket of the response is taken over by the caller, which may
+        # never return its connection to the pool
+        pool = getattr(response.raw, '_pool', None)
+        if isinstance(pool, PoolStatsMixin):
+            pool.detach(response.raw.connection)
+
+    def _stream_helper(self, response, decode=False, chunk_size=None):
+        """Generator for data coming from a chunked-encoded HTTP response.
+
+        Each transfer-encoding chunk is read in one call and yielded whole,
+        or split into pieces of at most ``chunk_size`` bytes if it is set.
+        """
 
         if response.raw._fp.chunked:
             if decode:
-                yield from json_stream(self._stream_helper(response, False))
+                yield from json_stream(
+                    self._stream_helper(response, False, chunk_size)
+                )
             else:
                 reader = response.raw
-                while not reader.closed:
-                    # this read call will block until we get a chunk
-                    data = reader.read(1)
-                    if not data:
-                        break
-                    if reader._fp.chunk_left:
-                        data += reader.read(reader._fp.chunk_left)
-                    yield data
+                # read_chunked blocks until a whole chunk has been received
+                yield from reader.read_chunked(
+                    chunk_size, decode_content=reader.decode_content
+                )
         else:
             # Response isn't chunked, meaning we probably
             # encountered an error immediately
@@ -366,14 +421,13 @@ class APIClient(
     def _multiplexed_buffer_helper(self, response):
         """A generator of multiplexed data blocks read from a buffered
         response."""
-        buf = self._result(response, binary=True)
+        buf = memoryview(self._result(response, binary=True))
         buf_length = len(buf)
         walker = 0
         while True:
             if buf_length - walker < STREAM_HEADER_SIZE_BYTES:
                 break
-            header = buf[walker:walker + STREAM_HEADER_SIZE_BYTES]
-            _, length = struct.unpack_from('>BxxxL', header)
+            _, length = struct.unpack_from('>BxxxL', buf, walker)
             start = walker + STREAM_HEADER_SIZE_BYTES
             end = start + length
             walker = end
@@ -411,14 +465,17 @@ class APIClient(
 
         yield from response.iter_content(chunk_size, decode)
 
-    def _read_from_socket(self, response, stream, tty=True, demux=False):
+    def _read_from_socket(self, response, stream, tty=True, demux=False,
+                          spool_threshold=None):
         """Consume all data from the socket, close the response and return the
         data. If stream=True, then a generator is returned instead and the
         caller is responsible for closing the response.
         """
         socket = self._get_raw_response_socket(response)
 
-        gen = frames_iter(socket, tty)
+        # When consuming the output here, frames are copied straight from the
+        # read buffer into the result.
+        gen = frames_iter(socket, tty, as_bytes=stream)
 
         if demux:
             # The generator will output tuples (stdout, stderr)
@@ -428,11 +485,14 @@ class APIClient(
             gen = (data for (_, data) in gen)
 
         if stream:
+            self._detach_connection(response)
             return gen
         else:
             try:
                 # Wait for all frames, concatenate them, and return the result
-                return consume_socket_output(gen, demux=demux)
+                return consume_socket_output(
+                    gen, demux=demux, spool_threshold=spool_threshold
+                )
             finally:
                 response.close()
 
@@ -484,9 +544,7 @@ class APIClient(
         if stream:
             return self._multiplexed_response_stream_helper(res)
         else:
-            return sep.join(
-                list(self._multiplexed_buffer_helper(res))
-            )
+            return sep.join(self._multiplexed_buffer_helper(res))
 
     def _unmount(self, *args):
         for proto in args:
@@ -505,6 +563,32 @@ class APIClient(
     def api_version(self):
         return self._version
 
+    @property
+    def pool_stats(self):
+        """
+        The :py:class:`~docker.transport.PoolStats` of the connections to
+        the server: how many were created, reused and discarded, how many
+        are in use, and how long requests waited for one.
+        """
+        return self.get_adapter(self.base_url).pool_stats
+
+    def warm_pool(self, n):
+        """
+        Open keep-alive connections to the server ahead of a burst of
+        requests, so that they don't have to wait for connections to be
+        established.
+
+        Args:
+            n (int): The number of connections to have open. At most
+                ``max_pool_size`` connections are kept open.
+
+        Returns:
+            (int): The number of connections opened.
+        """
+        return self.get_adapter(self.base_url).warm_pool(
+            self.base_url, n, verify=self.verify, cert=self.cert
+        )
+
     def reload_config(self, dockercfg_path=None):
         """
         Force a reload of the auth configuration
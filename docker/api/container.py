@@ -1,4 +1,6 @@
+import os
 from datetime import datetime
+from functools import partial
 
 from .. import errors
 from .. import utils
@@ -8,6 +10,9 @@ from ..types import ContainerConfig
 from ..types import EndpointConfig
 from ..types import HostConfig
 from ..types import NetworkingConfig
+from ..utils.build import build_file_list
+from ..utils.concurrency import map_results, pool_size
+from ..utils.transfer import extract_archive
 
 
 class ContainerApiMixin:
@@ -103,12 +108,13 @@ class ContainerApiMixin:
         }
 
         u = self._url("/containers/{0}/attach", container)
-        return self._get_raw_response_socket(
-            self.post(
-                u, None, params=self._attach_params(params), stream=True,
-                headers=headers
-            )
+        response = self.post(
+            u, None, params=self._attach_params(params), stream=True,
+            headers=headers
         )
+        sock = self._get_raw_response_socket(response)
+        self._detach_connection(response)
+        return sock
 
     @utils.check_resource('container')
     def commit(self, container, repository=None, tag=None, message=None,
@@ -217,6 +223,154 @@ class ContainerApiMixin:
                 x['Id'] = x['Id'][:12]
         return res
 
+    @utils.check_resource('src_container')
+    def copy_between(self, src_container, src_path, dst_container, dst_path,
+                     dst_client=None, encode_stream=False,
+                     chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Copy a file or folder from a container to another one, possibly on
+        another server, without staging it on the client.
+
+        The body of the :py:meth:`get_archive` response is forwarded as the
+        chunked body of the :py:meth:`put_archive` request as it is
+        received, so at most ``chunk_size`` bytes of it are held in memory.
+
+        Args:
+            src_container (str): The container where the file is located
+            src_path (str): Path to the file or folder to copy. It is created
+                under ``dst_path`` with the same name.
+            dst_container (str): The container to copy the file or folder to
+            dst_path (str): Path inside ``dst_container`` where the file or
+                folder will be extracted. Must exist.
+            dst_client (:py:class:`~docker.APIClient`): The client of the
+                server running ``dst_container``. Defaults to this client.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. The compressed data is
+                forwarded as is. Default: False
+            chunk_size (int): The maximum number of bytes held in memory at
+                a time. Default: 2 MB
+
+        Returns:
+            (dict): The ``stat`` information on ``src_path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If one of the servers returns an error.
+
+        Example:
+
+            >>> client.api.copy_between(
+            ...     'builder', '/out/dist', 'web', '/srv', dst_client=remote)
+            {'name': 'dist', 'size': 4096, 'mode': 2147484141,
+             'mtime': '2024-02-14T18:12:22Z', 'linkTarget': ''}
+        """
+        dst_client = getattr(dst_client, 'api', dst_client) or self
+        res, stat = self._get_archive_response(
+            src_container, src_path, encode_stream
+        )
+        try:
+            self._disable_socket_timeout(self._get_raw_response_socket(res))
+            # Forward the body as received, still compressed if it is:
+            # put_archive accepts gzip-compressed archives too
+            data = res.raw.stream(chunk_size, decode_content=False)
+            dst_client.put_archive(dst_container, dst_path, data)
+        except BaseException:
+            # Don't return the connection to the pool with the rest of the
+            # archive pending
+            res.close()
+            raise
+        return stat
+
+    @utils.check_resource('container')
+    def copy_from(self, container, path, host_path, encode_stream=False,
+                  chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Copy a file or folder from a container to a directory of the host.
+        Similar to the ``docker cp CONTAINER:PATH HOST_PATH`` command.
+
+        The archive returned by :py:meth:`get_archive` is extracted as it is
+        received, so at most ``chunk_size`` bytes of it are held in memory.
+        Members that would be extracted outside of ``host_path`` are
+        refused.
+
+        Args:
+            container (str): The container where the file is located
+            path (str): Path to the file or folder to copy. It is created
+                under ``host_path`` with the same name.
+            host_path (str): The directory to copy it to. It is created if
+                it doesn't exist.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. Default: False
+            chunk_size (int): The number of bytes read at a time.
+                Default: 2 MB
+
+        Returns:
+            (dict): The ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+            :py:class:`tarfile.TarError`
+                If a member of the archive is refused.
+
+        Example:
+
+            >>> client.api.copy_from(container, '/etc/nginx', './config')
+            {'name': 'nginx', 'size': 4096, 'mode': 2147484141,
+             'mtime': '2024-02-14T18:12:22Z', 'linkTarget': ''}
+        """
+        bits, stat = self.get_archive(
+            container, path, chunk_size, encode_stream
+        )
+        extract_archive(bits, host_path)
+        return stat
+
+    @utils.check_resource('container')
+    def copy_to(self, container, host_path, path, encode_stream=False,
+                chunk_size=DEFAULT_DATA_CHUNK_SIZE):
+        """
+        Copy a file or folder of the host into a container. Similar to the
+        ``docker cp HOST_PATH CONTAINER:PATH`` command.
+
+        The archive is produced while it is being uploaded, the same way as
+        build contexts with ``stream_context``, instead of being built in
+        memory first.
+
+        Args:
+            container (str): The container to copy the file or folder to
+            host_path (str): Path to the file or folder to copy. It is
+                created under ``path`` with the same name.
+            path (str): Path inside the container where the file or folder
+                will be extracted. Must exist.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission, e.g. for remote
+                daemons. Default: False
+            chunk_size (int): The approximate size of the chunks of the
+                archive sent at a time. Default: 2 MB
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> client.api.copy_to(container, './config/nginx', '/etc')
+            True
+        """
+        root, name = os.path.split(os.path.abspath(host_path))
+        files = [name]
+        if os.path.isdir(host_path):
+            files += sorted(
+                f'{name}/{f}' for f in build_file_list(host_path)
+            )
+        data = utils.stream_archive(
+            root, files, gzip=encode_stream, buffer_size=chunk_size
+        )
+        return self.put_archive(container, path, data)
+
     def create_container(self, image, command=None, hostname=None, user=None,
                          detach=False, stdin_open=False, tty=False, ports=None,
                          environment=None, volumes=None,
@@ -756,6 +910,10 @@ class ContainerApiMixin:
             ...    f.write(chunk)
             >>> f.close()
         """
+        res, stat = self._get_archive_response(container, path, encode_stream)
+        return self._stream_raw_result(res, chunk_size, False), stat
+
+    def _get_archive_response(self, container, path, encode_stream):
         params = {
             'path': path
         }
@@ -769,7 +927,7 @@ class ContainerApiMixin:
         self._raise_for_status(res)
         encoded_stat = res.headers.get('x-docker-container-path-stat')
         return (
-            self._stream_raw_result(res, chunk_size, False),
+            res,
             utils.decode_json_header(encoded_stat) if encoded_stat else None
         )
 
@@ -816,6 +974,28 @@ class ContainerApiMixin:
 
         self._raise_for_status(res)
 
+    def kill_many(self, containers, signal=None, concurrency=None,
+                  rate_limit=None):
+        """
+        Kill or send a signal to several containers concurrently. Failures
+        don't stop the operation on the other containers: they are returned
+        along with the container they happened on.
+
+        Args:
+            containers (list): The containers to kill
+            signal (str or int): The signal to send. Defaults to ``SIGKILL``
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        fn = partial(self.kill, signal=signal)
+        return self._bulk(fn, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def logs(self, container, stdout=True, stderr=True, stream=False,
              timestamps=False, tail='all', since=None, follow=None,
@@ -851,44 +1031,9 @@ class ContainerApiMixin:
         """
         if follow is None:
             follow = stream
-        params = {'stderr': stderr and 1 or 0,
-                  'stdout': stdout and 1 or 0,
-                  'timestamps': timestamps and 1 or 0,
-                  'follow': follow and 1 or 0,
-                  }
-        if tail != 'all' and (not isinstance(tail, int) or tail < 0):
-            tail = 'all'
-        params['tail'] = tail
-
-        if since is not None:
-            if isinstance(since, datetime):
-                params['since'] = utils.datetime_to_timestamp(since)
-            elif (isinstance(since, int) and since > 0):
-                params['since'] = since
-            elif (isinstance(since, float) and since > 0.0):
-                params['since'] = since
-            else:
-                raise errors.InvalidArgument(
-                    'since value should be datetime or positive int/float,'
-                    f' not {type(since)}'
-                )
-
-        if until is not None:
-            if utils.version_lt(self._version, '1.35'):
-                raise errors.InvalidVersion(
-                    'until is not supported for API version < 1.35'
-                )
-            if isinstance(until, datetime):
-                params['until'] = utils.datetime_to_timestamp(until)
-            elif (isinstance(until, int) and until > 0):
-                params['until'] = until
-            elif (isinstance(until, float) and until > 0.0):
-                params['until'] = until
-            else:
-                raise errors.InvalidArgument(
-                    f'until value should be datetime or positive int/float, '
-                    f'not {type(until)}'
-                )
+        params = self._logs_params(
+            stdout, stderr, timestamps, tail, since, follow, until
+        )
 
         url = self._url("/containers/{0}/logs", container)
         res = self._get(url, params=params, stream=stream)
@@ -915,6 +1060,25 @@ class ContainerApiMixin:
         res = self._post(url)
         self._raise_for_status(res)
 
+    def pause_many(self, containers, concurrency=None, rate_limit=None):
+        """
+        Pause several containers concurrently. Failures don't stop the
+        operation on the other containers: they are returned along with the
+        container they happened on.
+
+        Args:
+            containers (list): The containers to pause
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        return self._bulk(self.pause, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def port(self, container, private_port):
         """
@@ -1035,6 +1199,32 @@ class ContainerApiMixin:
         )
         self._raise_for_status(res)
 
+    def remove_many(self, containers, v=False, link=False, force=False,
+                    concurrency=None, rate_limit=None):
+        """
+        Remove several containers concurrently. Failures don't stop the
+        operation on the other containers: they are returned along with the
+        container they happened on.
+
+        Args:
+            containers (list): The containers to remove
+            v (bool): Remove the volumes associated with the containers
+            link (bool): Remove the specified links and not the underlying
+                containers
+            force (bool): Force the removal of running containers (uses
+                ``SIGKILL``)
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        fn = partial(self.remove_container, v=v, link=link, force=force)
+        return self._bulk(fn, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def rename(self, container, name):
         """
@@ -1096,6 +1286,30 @@ class ContainerApiMixin:
         res = self._post(url, params=params, timeout=conn_timeout)
         self._raise_for_status(res)
 
+    def restart_many(self, containers, timeout=10, concurrency=None,
+                     rate_limit=None):
+        """
+        Restart several containers concurrently. Failures don't stop the
+        operation on the other containers: they are returned along with the
+        container they happened on.
+
+        Args:
+            containers (list): The containers to restart
+            timeout (int): Number of seconds to try to stop for before killing
+                the containers. Once killed they will then be restarted.
+                Default is 10 seconds.
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        fn = partial(self.restart, timeout=timeout)
+        return self._bulk(fn, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def start(self, container, *args, **kwargs):
         """
@@ -1134,6 +1348,25 @@ class ContainerApiMixin:
         res = self._post(url)
         self._raise_for_status(res)
 
+    def start_many(self, containers, concurrency=None, rate_limit=None):
+        """
+        Start several containers concurrently. Failures don't stop the
+        operation on the other containers: they are returned along with the
+        container they happened on.
+
+        Args:
+            containers (list): The containers to start
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        return self._bulk(self.start, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def stats(self, container, decode=None, stream=True, one_shot=None):
         """
@@ -1210,6 +1443,31 @@ class ContainerApiMixin:
         res = self._post(url, params=params, timeout=conn_timeout)
         self._raise_for_status(res)
 
+    def stop_many(self, containers, timeout=None, concurrency=None,
+                  rate_limit=None):
+        """
+        Stop several containers concurrently. Failures don't stop the operation
+        on the other containers: they are returned along with the container
+        they happened on.
+
+        Args:
+            containers (list): The containers to stop
+            timeout (int): Timeout in seconds to wait for the containers to
+                stop before sending a ``SIGKILL``. If None, then the
+                StopTimeout value of each container will be used.
+                Default: None
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        fn = partial(self.stop, timeout=timeout)
+        return self._bulk(fn, containers, concurrency, rate_limit)
+
     @utils.check_resource('container')
     def top(self, container, ps_args=None):
         """
@@ -1244,6 +1502,25 @@ class ContainerApiMixin:
         res = self._post(url)
         self._raise_for_status(res)
 
+    def unpause_many(self, containers, concurrency=None, rate_limit=None):
+        """
+        Unpause several containers concurrently. Failures don't stop the
+        operation on the other containers: they are returned along with the
+        container they happened on.
+
+        Args:
+            containers (list): The containers to unpause
+            concurrency (int): The maximum number of requests made at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of requests started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of the operation on each container, in order.
+        """
+        return self._bulk(self.unpause, containers, concurrency, rate_limit)
+
     @utils.minimum_version('1.22')
     @utils.check_resource('container')
     def update_container(
@@ -1345,3 +1622,50 @@ class ContainerApiMixin:
 
         res = self._post(url, timeout=timeout, params=params)
         return self._result(res, True)
+
+    def _logs_params(self, stdout, stderr, timestamps, tail, since, follow,
+                     until):
+        params = {'stderr': stderr and 1 or 0,
+                  'stdout': stdout and 1 or 0,
+                  'timestamps': timestamps and 1 or 0,
+                  'follow': follow and 1 or 0,
+                  }
+        if tail != 'all' and (not isinstance(tail, int) or tail < 0):
+            tail = 'all'
+        params['tail'] = tail
+
+        if since is not None:
+            if isinstance(since, datetime):
+                params['since'] = utils.datetime_to_timestamp(since)
+            elif (isinstance(since, int) and since > 0):
+                params['since'] = since
+            elif (isinstance(since, float) and since > 0.0):
+                params['since'] = since
+            else:
+                raise errors.InvalidArgument(
+                    'since value should be datetime or positive int/float,'
+                    f' not {type(since)}'
+                )
+
+        if until is not None:
+            if utils.version_lt(self._version, '1.35'):
+                raise errors.InvalidVersion(
+                    'until is not supported for API version < 1.35'
+                )
+            if isinstance(until, datetime):
+                params['until'] = utils.datetime_to_timestamp(until)
+            elif (isinstance(until, int) and until > 0):
+                params['until'] = until
+            elif (isinstance(until, float) and until > 0.0):
+                params['until'] = until
+            else:
+                raise errors.InvalidArgument(
+                    f'until value should be datetime or positive int/float, '
+                    f'not {type(until)}'
+                )
+        return params
+
+    def _bulk(self, fn, containers, concurrency, rate_limit):
+        return map_results(
+            fn, containers, concurrency or pool_size(self), rate_limit
+        )
@@ -1,6 +1,27 @@
+import time
+from collections import namedtuple
+
 from .. import errors
 from .. import utils
 from ..types import CancellableStream
+from ..utils.concurrency import map_results, pool_size
+
+
+class ExecOutput(namedtuple(
+        'ExecOutput', ['exit_code', 'stdout', 'stderr', 'timings'])):
+    """
+    The outcome of a command run by
+    :py:meth:`~docker.api.exec_api.ExecApiMixin.exec_many`.
+
+    Attributes:
+        exit_code (int): The exit code of the command.
+        stdout (bytes): The standard output of the command.
+        stderr (bytes): The standard error of the command.
+        timings (dict): The time spent in each phase, in seconds: ``create``
+            (creating the exec instance), ``start`` (until the connection is
+            upgraded), ``output`` (reading the output until the command
+            exits), ``inspect`` (getting the exit code), and ``total``.
+    """
 
 
 class ExecApiMixin:
@@ -117,7 +138,7 @@ class ExecApiMixin:
 
     @utils.check_resource('exec_id')
     def exec_start(self, exec_id, detach=False, tty=False, stream=False,
-                   socket=False, demux=False):
+                   socket=False, demux=False, spool_threshold=None):
         """
         Start a previously set up exec instance.
 
@@ -131,6 +152,11 @@ class ExecApiMixin:
             socket (bool): Return the connection socket to allow custom
                 read/write operations. Must be closed by the caller when done.
             demux (bool): Return stdout and stderr separately
+            spool_threshold (int): Accumulate the output in
+                :py:class:`tempfile.SpooledTemporaryFile` objects which spill
+                to disk once they exceed this many bytes, and return them,
+                rewound, instead of bytes. Ignored if ``stream=True``.
+                Default: None
 
         Returns:
 
@@ -138,7 +164,8 @@ class ExecApiMixin:
             yielding response chunks. If ``socket=True``, a socket object for
             the connection. A string containing response data otherwise. If
             ``demux=True``, a tuple with two elements of type byte: stdout and
-            stderr.
+            stderr. If ``spool_threshold`` is set, file objects take the place
+            of bytes.
 
         Raises:
             :py:class:`docker.errors.APIError`
@@ -146,6 +173,94 @@ class ExecApiMixin:
         """
         # we want opened socket if socket == True
 
+        res = self._exec_start_request(exec_id, detach, tty)
+        if detach:
+            try:
+                return self._result(res)
+            finally:
+                res.close()
+        if socket:
+            sock = self._get_raw_response_socket(res)
+            self._detach_connection(res)
+            return sock
+
+        output = self._read_from_socket(
+            res, stream, tty=tty, demux=demux, spool_threshold=spool_threshold
+        )
+        if stream:
+            return CancellableStream(output, res)
+        else:
+            return output
+
+    def exec_many(self, jobs, stdout=True, stderr=True, privileged=False,
+                  user='', environment=None, workdir=None, concurrency=None,
+                  rate_limit=None):
+        """
+        Run many commands, in one or more containers, concurrently. Each
+        command is run like with ``exec_create``, ``exec_start`` and
+        ``exec_inspect``, and its exit code and output are returned together,
+        with the time spent in each of these steps.
+
+        Failures don't stop the other commands: they are returned along with
+        the command they happened on.
+
+        The connections used to create and inspect exec instances are kept
+        alive and reused. The connections carrying the output of commands
+        are closed by the server once the command exits, so they can't be.
+
+        Args:
+            jobs (list): ``(container, cmd)`` tuples, where ``cmd`` is a
+                string or a list.
+            stdout (bool): Attach to stdout. Default: ``True``
+            stderr (bool): Attach to stderr. Default: ``True``
+            privileged (bool): Run as privileged.
+            user (str): User to execute command as. Default: root
+            environment (dict or list): A dictionary or a list of strings in
+                the following format ``["PASSWORD=xxx"]`` or
+                ``{"PASSWORD": "xxx"}``.
+            workdir (str): Path to working directory for this exec session
+            concurrency (int): The maximum number of commands run at once.
+                Default: the size of the client's connection pool.
+            rate_limit (float): The maximum number of commands started per
+                second. Default: no limit.
+
+        Returns:
+            (list of :py:class:`~docker.utils.concurrency.BulkResult`): The
+            outcome of each job, in order, with an
+            :py:class:`ExecOutput` as result.
+        """
+        def run(job):
+            container, cmd = job
+            timings = {}
+            started = time.perf_counter()
+            exec_id = self.exec_create(
+                container, cmd, stdout=stdout, stderr=stderr,
+                privileged=privileged, user=user, environment=environment,
+                workdir=workdir
+            )['Id']
+            timings['create'] = time.perf_counter() - started
+
+            t = time.perf_counter()
+            res = self._exec_start_request(exec_id, False, False)
+            timings['start'] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            out, err = self._read_from_socket(
+                res, False, tty=False, demux=True
+            )
+            timings['output'] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            exit_code = self.exec_inspect(exec_id)['ExitCode']
+            timings['inspect'] = time.perf_counter() - t
+            timings['total'] = time.perf_counter() - started
+            return ExecOutput(exit_code, out or b'', err or b'', timings)
+
+        return map_results(
+            run, jobs, concurrency or pool_size(self), rate_limit
+        )
+
+    def _exec_start_request(self, exec_id, detach, tty):
         data = {
             'Tty': tty,
             'Detach': detach
@@ -156,22 +271,9 @@ class ExecApiMixin:
             'Upgrade': 'tcp'
         }
 
-        res = self._post_json(
+        return self._post_json(
             self._url('/exec/{0}/start', exec_id),
             headers=headers,
             data=data,
             stream=True
         )
-        if detach:
-            try:
-                return self._result(res)
-            finally:
-                res.close()
-        if socket:
-            return self._get_raw_response_socket(res)
-
-        output = self._read_from_socket(res, stream, tty=tty, demux=demux)
-        if stream:
-            return CancellableStream(output, res)
-        else:
-            return output
@@ -3,6 +3,7 @@ import os
 
 from .. import auth, errors, utils
 from ..constants import DEFAULT_DATA_CHUNK_SIZE
+from ..utils.transfer import FileReader, write_atomic
 
 log = logging.getLogger(__name__)
 
@@ -38,6 +39,55 @@ class ImageApiMixin:
         res = self._get(self._url("/images/{0}/get", image), stream=True)
         return self._stream_raw_result(res, chunk_size, False)
 
+    @utils.check_resource('image')
+    def get_image_to(self, image, path, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                     fsync=True, progress=None):
+        """
+        Write a tarball of an image to a file. Similar to the ``docker save
+        -o`` command.
+
+        The tarball is streamed to disk as it is received, and written to
+        ``<path>.part`` first, which is renamed to ``path`` once complete:
+        ``path`` never holds a partial tarball, even if the transfer is
+        interrupted.
+
+        Args:
+            image (str): Image name to get
+            path (str): The path of the file to write.
+            chunk_size (int): The maximum number of bytes held in memory at
+                a time. Default: 2 MB
+            fsync (bool): Flush the file to disk before returning.
+                Default: ``True``
+            progress (callable): Called with a
+                :py:class:`~docker.utils.transfer.TransferStats` after each
+                chunk written.
+
+        Returns:
+            (:py:class:`~docker.utils.transfer.TransferStats`): The size of
+            the tarball and the time it took to write it.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> stats = client.api.get_image_to(
+            ...     'busybox:latest', '/tmp/busybox-latest.tar')
+            >>> print(f'{stats.rate / 2 ** 20:.1f} MiB/s')
+        """
+        res = self._get(self._url("/images/{0}/get", image), stream=True)
+        try:
+            return write_atomic(
+                self._stream_raw_result(res, chunk_size, False), path,
+                fsync=fsync, progress=progress
+            )
+        except BaseException:
+            # Don't return the connection to the pool with the rest of the
+            # tarball pending
+            res.close()
+            raise
+
     @utils.check_resource('image')
     def history(self, image):
         """
@@ -323,6 +373,33 @@ class ImageApiMixin:
 
         self._raise_for_status(res)
 
+    def load_image_from(self, path, quiet=None, progress=None):
+        """
+        Load an image from a tarball on disk, such as one written by
+        :py:meth:`get_image_to` (or ``docker save -o``). Similar to
+        ``docker load -i``.
+
+        The file is sent as the connection consumes it, rather than read
+        into memory first.
+
+        Args:
+            path (str): The path of the tarball.
+            quiet (boolean): Suppress progress details in response.
+            progress (callable): Called with a
+                :py:class:`~docker.utils.transfer.TransferStats` each time a
+                block of the file has been sent.
+
+        Returns:
+            (generator): Progress output as JSON objects. Only available for
+                         API version >= 1.23
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        with FileReader(path, progress) as data:
+            return self.load_image(data, quiet=quiet)
+
     @utils.minimum_version('1.25')
     def prune_images(self, filters=None):
         """
@@ -25,7 +25,8 @@ class PluginApiMixin:
         return True
 
     @utils.minimum_version('1.25')
-    def create_plugin(self, name, plugin_data_dir, gzip=False):
+    def create_plugin(self, name, plugin_data_dir, gzip=False, gzip_level=9,
+                      gzip_workers=None):
         """
             Create a new plugin.
 
@@ -36,6 +37,10 @@ class PluginApiMixin:
                     Plugin data directory must contain the ``config.json``
                     manifest file and the ``rootfs`` directory.
                 gzip (bool): Compress the context using gzip. Default: False
+                gzip_level (int): The gzip compression level, from 0 to 9.
+                    Default: 9
+                gzip_workers (int): If set, compress the context with that
+                    many threads, using independently compressed blocks.
 
             Returns:
                 ``True`` if successful
@@ -44,7 +49,8 @@ class PluginApiMixin:
 
         with utils.create_archive(
             root=plugin_data_dir, gzip=gzip,
-            files=set(utils.build.walk(plugin_data_dir, []))
+            files=set(utils.build.walk(plugin_data_dir, [])),
+            gzip_level=gzip_level, gzip_workers=gzip_workers
         ) as archv:
             res = self._post(url, params={'name': name}, data=archv)
         self._raise_for_status(res)
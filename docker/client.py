@@ -1,15 +1,5 @@
 from .api.client import APIClient
 from .constants import (DEFAULT_TIMEOUT_SECONDS, DEFAULT_MAX_POOL_SIZE)
-from .models.configs import ConfigCollection
-from .models.containers import ContainerCollection
-from .models.images import ImageCollection
-from .models.networks import NetworkCollection
-from .models.nodes import NodeCollection
-from .models.plugins import PluginCollection
-from .models.secrets import SecretCollection
-from .models.services import ServiceCollection
-from .models.swarm import Swarm
-from .models.volumes import VolumeCollection
 from .utils import kwargs_from_env
 
 
@@ -40,6 +30,12 @@ class DockerClient:
             installed and configured on the host.
         max_pool_size (int): The maximum number of connections
             to save in the pool.
+        version_cache (:py:class:`~docker.utils.VersionCache` or bool): With
+            ``version='auto'``, look the version of the server up in this
+            cache, and record it there once retrieved.
+        lazy_version (bool): With ``version='auto'``, retrieve the version of
+            the server when it is first needed instead of when the client is
+            created.
     """
     def __init__(self, *args, **kwargs):
         self.api = APIClient(*args, **kwargs)
@@ -78,6 +74,12 @@ class DockerClient:
             use_ssh_client (bool): If set to `True`, an ssh connection is
                 made via shelling out to the ssh client. Ensure the ssh
                 client is installed and configured on the host.
+            version_cache (:py:class:`~docker.utils.VersionCache` or bool):
+                With ``version='auto'``, look the version of the server up in
+                this cache, and record it there once retrieved.
+            lazy_version (bool): With ``version='auto'``, retrieve the
+                version of the server when it is first needed instead of
+                when the client is created.
 
         Example:
 
@@ -91,11 +93,15 @@ class DockerClient:
         max_pool_size = kwargs.pop('max_pool_size', DEFAULT_MAX_POOL_SIZE)
         version = kwargs.pop('version', None)
         use_ssh_client = kwargs.pop('use_ssh_client', False)
+        version_cache = kwargs.pop('version_cache', None)
+        lazy_version = kwargs.pop('lazy_version', False)
         return cls(
             timeout=timeout,
             max_pool_size=max_pool_size,
             version=version,
             use_ssh_client=use_ssh_client,
+            version_cache=version_cache,
+            lazy_version=lazy_version,
             **kwargs_from_env(**kwargs)
         )
 
@@ -106,6 +112,7 @@ class DockerClient:
         An object for managing configs on the server. See the
         :doc:`configs documentation <configs>` for full details.
         """
+        from .models.configs import ConfigCollection
         return ConfigCollection(client=self)
 
     @property
@@ -114,6 +121,7 @@ class DockerClient:
         An object for managing containers on the server. See the
         :doc:`containers documentation <containers>` for full details.
         """
+        from .models.containers import ContainerCollection
         return ContainerCollection(client=self)
 
     @property
@@ -122,6 +130,7 @@ class DockerClient:
         An object for managing images on the server. See the
         :doc:`images documentation <images>` for full details.
         """
+        from .models.images import ImageCollection
         return ImageCollection(client=self)
 
     @property
@@ -130,6 +139,7 @@ class DockerClient:
         An object for managing networks on the server. See the
         :doc:`networks documentation <networks>` for full details.
         """
+        from .models.networks import NetworkCollection
         return NetworkCollection(client=self)
 
     @property
@@ -138,6 +148,7 @@ class DockerClient:
         An object for managing nodes on the server. See the
         :doc:`nodes documentation <nodes>` for full details.
         """
+        from .models.nodes import NodeCollection
         return NodeCollection(client=self)
 
     @property
@@ -146,6 +157,7 @@ class DockerClient:
         An object for managing plugins on the server. See the
         :doc:`plugins documentation <plugins>` for full details.
         """
+        from .models.plugins import PluginCollection
         return PluginCollection(client=self)
 
     @property
@@ -154,6 +166,7 @@ class DockerClient:
         An object for managing secrets on the server. See the
         :doc:`secrets documentation <secrets>` for full details.
         """
+        from .models.secrets import SecretCollection
         return SecretCollection(client=self)
 
     @property
@@ -162,6 +175,7 @@ class DockerClient:
         An object for managing services on the server. See the
         :doc:`services documentation <services>` for full details.
         """
+        from .models.services import ServiceCollection
         return ServiceCollection(client=self)
 
     @property
@@ -170,6 +184,7 @@ class DockerClient:
         An object for managing a swarm on the server. See the
         :doc:`swarm documentation <swarm>` for full details.
         """
+        from .models.swarm import Swarm
         return Swarm(client=self)
 
     @property
@@ -178,6 +193,7 @@ class DockerClient:
         An object for managing volumes on the server. See the
         :doc:`volumes documentation <volumes>` for full details.
         """
+        from .models.volumes import VolumeCollection
         return VolumeCollection(client=self)
 
     # Top-level methods
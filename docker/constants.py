@@ -36,6 +36,14 @@ DEFAULT_NUM_POOLS = 25
 # For more details see: https://github.com/docker/docker-py/issues/2246
 DEFAULT_NUM_POOLS_SSH = 9
 
+# The number of idle SSH sessions running ``docker system dial-stdio`` kept
+# open ahead of time. They count towards MaxSessions as well.
+DEFAULT_SSH_WARM_CHANNELS = 2
+
+# How long, in seconds, the OpenSSH master connection shared by the ``ssh``
+# processes of a client stays up once they have all exited.
+DEFAULT_SSH_CONTROL_PERSIST = 60
+
 DEFAULT_MAX_POOL_SIZE = 10
 
 DEFAULT_DATA_CHUNK_SIZE = 1024 * 2048
@@ -1,2 +1,6 @@
-from .context import Context
-from .api import ContextAPI
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'Context': '.context',
+    'ContextAPI': '.api',
+})
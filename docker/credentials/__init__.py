@@ -1,4 +1,4 @@
-from .store import Store
+from .._lazy import lazy_attributes
 from .errors import StoreError, CredentialsNotFound
 from .constants import (
     DEFAULT_LINUX_STORE,
@@ -6,3 +6,8 @@ from .constants import (
     DEFAULT_WIN32_STORE,
     PROGRAM_PREFIX,
 )
+
+# Only imported when a credentials store is configured
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'Store': '.store',
+})
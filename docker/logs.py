@@ -0,0 +1,405 @@
+import collections
+import os
+import selectors
+import socket
+import ssl
+import struct
+import threading
+
+from .constants import STREAM_HEADER_SIZE_BYTES
+from .errors import DockerException
+from .utils.concurrency import grow_pool, map_results, pool_size
+from .utils.socket import FRAME_BUFFER_SIZE, STDERR, STDOUT
+
+
+class LogRecord(collections.namedtuple(
+        'LogRecord', ['container', 'stream', 'line', 'timestamp'])):
+    """
+    A line of output of a container, as yielded by :py:class:`LogMux`.
+
+    Attributes:
+        container (str): The ID of the container.
+        stream (int): ``1`` for ``STDOUT``, ``2`` for ``STDERR``.
+        line (bytes): The line, without its trailing newline.
+        timestamp (str): The time the line was written, in the RFC 3339
+            format with nanoseconds, or ``None`` if timestamps are disabled.
+    """
+
+
+class _ChunkedDecoder:
+    """
+    Incrementally decodes a chunked-encoded HTTP body.
+    """
+
+    def __init__(self):
+        self.done = False
+        self._buffer = bytearray()
+        self._remaining = 0
+        self._skip = 0
+        self._trailer = False
+
+    def feed(self, data):
+        buf = self._buffer
+        buf += data
+        pos = 0
+        out = []
+        while not self.done:
+            if self._remaining:
+                n = min(self._remaining, len(buf) - pos)
+                if not n:
+                    break
+                out.append(bytes(buf[pos:pos + n]))
+                pos += n
+                self._remaining -= n
+                if not self._remaining:
+                    # The CRLF ending the chunk
+                    self._skip = 2
+                continue
+            if self._skip:
+                n = min(self._skip, len(buf) - pos)
+                pos += n
+                self._skip -= n
+                if self._skip:
+                    break
+                continue
+            end = buf.find(b'\r\n', pos)
+            if end < 0:
+                break
+            line = bytes(buf[pos:end])
+            pos = end + 2
+            if self._trailer:
+                self.done = not line
+            else:
+                size = int(line.split(b';', 1)[0], 16)
+                if size:
+                    self._remaining = size
+                else:
+                    self._trailer = True
+        del buf[:pos]
+        return out
+
+
+class _LogStream:
+    """
+    The state of the logs of one container: the non-blocking body of the
+    HTTP response, and the decoders turning it into lines.
+    """
+
+    def __init__(self, container, response, tty, timestamps):
+        self.container = container
+        self.response = response
+        self.tty = tty
+        self.timestamps = timestamps
+        self.fp = getattr(getattr(response.raw, '_fp', None), 'fp', None)
+        if not hasattr(self.fp, 'read1') or not hasattr(self.fp, 'fileno'):
+            # e.g. paramiko channels and named pipes
+            raise DockerException(
+                'Multiplexing logs is not supported for this transport'
+            )
+        self.fileno = self.fp.fileno()
+
+        sock = getattr(self.fp.raw, '_sock', None)
+        if sock is not None:
+            sock.setblocking(False)
+        else:
+            os.set_blocking(self.fileno, False)
+        # TLS sockets may hold decrypted data that select() can't see
+        self.pending = getattr(sock, 'pending', None)
+
+        self._chunks = _ChunkedDecoder() if response.raw.chunked else None
+        self._frames = bytearray()
+        self._lines = {STDOUT: bytearray(), STDERR: bytearray()}
+        self.started = False
+        self.ended = False
+
+    def read(self, n):
+        """
+        Read at most ``n`` bytes and return the complete lines received.
+        """
+        try:
+            data = self.fp.read1(n)
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return []
+        if not data and self.started:
+            # The socket was reported readable, this is the end of file
+            return self._end()
+        self.started = True
+
+        if self._chunks is not None:
+            pieces = self._chunks.feed(data)
+            if self._chunks.done:
+                return self._decode(pieces) + self._end()
+        else:
+            pieces = [data]
+        return self._decode(pieces)
+
+    def _decode(self, pieces):
+        records = []
+        for data in pieces:
+            if self.tty:
+                self._split(STDOUT, data, records)
+                continue
+            buf = self._frames
+            buf += data
+            pos = 0
+            while len(buf) - pos >= STREAM_HEADER_SIZE_BYTES:
+                stream, length = struct.unpack_from('>BxxxL', buf, pos)
+                start = pos + STREAM_HEADER_SIZE_BYTES
+                if len(buf) - start < length:
+                    break
+                self._split(stream, buf[start:start + length], records)
+                pos = start + length
+            del buf[:pos]
+        return records
+
+    def buffered(self):
+        """
+        Whether data was received but not read yet, which select() can't
+        report: data buffered by the response after a read limited to
+        ``read_size`` bytes, or decrypted by a TLS socket.
+        """
+        try:
+            if self.fp.peek(0):
+                return True
+        except (BlockingIOError, ssl.SSLWantReadError):
+            pass
+        return self.pending is not None and self.pending() > 0
+
+    def _split(self, stream, data, records):
+        partial = self._lines.get(stream)
+        if partial is None:
+            return
+        partial += data
+        start = 0
+        while True:
+            end = partial.find(b'\n', start)
+            if end < 0:
+                break
+            records.append(self._record(stream, bytes(partial[start:end])))
+            start = end + 1
+        del partial[:start]
+
+    def _record(self, stream, line):
+        timestamp = None
+        if self.timestamps:
+            timestamp, _, line = line.partition(b' ')
+            timestamp = timestamp.decode('ascii', 'replace')
+        return LogRecord(self.container, stream, line, timestamp)
+
+    def _end(self):
+        self.ended = True
+        records = []
+        for stream, partial in self._lines.items():
+            if partial:
+                records.append(self._record(stream, bytes(partial)))
+                partial.clear()
+        return records
+
+    def close(self):
+        self.response.close()
+
+
+class LogMux:
+    """
+    Follows the logs of many containers from a single thread.
+
+    The log streams of all containers are read without blocking as data
+    arrives, using a single :py:mod:`selectors` loop, instead of one
+    blocking generator (and thread) per container. Iterating over a
+    ``LogMux`` yields a :py:class:`LogRecord` per line, in the order the
+    lines were received. Lines split across frames or reads are reassembled.
+
+    Data is only read from the sockets when all the lines already received
+    have been consumed, and at most ``read_size`` bytes are read per
+    container at a time, so a slow consumer makes the server wait instead of
+    piling up output in memory.
+
+    Each container holds a connection while its logs are followed, so the
+    connection pool of the client grows by one connection per container
+    until they are dropped.
+
+    Iteration ends when the logs of all the containers have ended, e.g. once
+    they have all stopped. :py:meth:`close` can be called from another
+    thread to stop it early.
+
+    Example:
+
+        >>> with LogMux(client, client.containers.list()) as mux:
+        ...     for record in mux:
+        ...         print(record.container[:12], record.line.decode())
+
+    Args:
+        client (:py:class:`~docker.APIClient`): The client to use. A
+            :py:class:`~docker.DockerClient` is accepted too.
+        containers (list): The containers to follow, as IDs, names or
+            :py:class:`~docker.models.containers.Container` objects.
+        stdout (bool): Get ``STDOUT``. Default ``True``
+        stderr (bool): Get ``STDERR``. Default ``True``
+        timestamps (bool): Get the timestamp of each line. Default ``True``
+        tail (str or int): Output specified number of lines at the end of
+            logs. Either an integer of number of lines or the string
+            ``all``. Default ``all``
+        since (datetime, int, or float): Show logs since a given datetime,
+            integer epoch (in seconds) or float (in fractional seconds)
+        follow (bool): Follow log output. Default ``True``
+        read_size (int): The maximum number of bytes read from a container
+            at a time.
+
+    Raises:
+        :py:class:`docker.errors.APIError`
+            If the server returns an error.
+    """
+
+    def __init__(self, client, containers=(), stdout=True, stderr=True,
+                 timestamps=True, tail='all', since=None, follow=True,
+                 read_size=FRAME_BUFFER_SIZE):
+        self.api = getattr(client, 'api', client)
+        self.timestamps = timestamps
+        self.read_size = read_size
+        self._params = self.api._logs_params(
+            stdout, stderr, timestamps, tail, since, follow, None
+        )
+        self._selector = selectors.DefaultSelector()
+        self._streams = {}
+        self._pending = set()
+        self._records = collections.deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        try:
+            self.add(*containers)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._records:
+            if self._closed or not self._streams:
+                raise StopIteration
+            with self._lock:
+                # close() may have shut everything down in the meantime
+                if self._closed or not self._streams:
+                    raise StopIteration
+                self._poll()
+        return self._records.popleft()
+
+    @property
+    def containers(self):
+        """
+        The IDs of the containers whose logs are being followed.
+        """
+        return [stream.container for stream in self._streams.values()]
+
+    def add(self, *containers):
+        """
+        Start following the logs of more containers. The requests are made
+        concurrently.
+
+        Args:
+            containers: The containers, as IDs, names or
+                :py:class:`~docker.models.containers.Container` objects.
+        """
+        containers = [getattr(c, 'id', c) for c in containers]
+        # Each stream holds a connection until it is dropped
+        grow_pool(self.api, len(containers))
+        results = map_results(self._open, containers, pool_size(self.api))
+        for result in results:
+            if not result.ok:
+                for r in results:
+                    if r.ok:
+                        r.result.close()
+                grow_pool(self.api, -len(containers))
+                raise result.error
+        for stream in (r.result for r in results):
+            self._streams[stream.fileno] = stream
+            self._selector.register(stream.fileno, selectors.EVENT_READ)
+            # The response headers may have been read along with some data
+            self._pending.add(stream)
+
+    def remove(self, container):
+        """
+        Stop following the logs of a container.
+
+        Args:
+            container (str): The ID of the container.
+        """
+        for stream in list(self._streams.values()):
+            if stream.container == container:
+                self._drop(stream)
+
+    def close(self):
+        """
+        Stop following logs and close all the connections. Can be called
+        from another thread to interrupt an iteration.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._lock.acquire(blocking=False):
+            try:
+                self._shutdown()
+            finally:
+                self._lock.release()
+        else:
+            # Wake up the iterating thread, which shuts down
+            self._wakeup_w.send(b'\0')
+
+    def _open(self, container):
+        inspected = self.api.inspect_container(container)
+        url = self.api._url('/containers/{0}/logs', inspected['Id'])
+        response = self.api._get(url, params=self._params, stream=True)
+        self.api._raise_for_status(response)
+        try:
+            return _LogStream(
+                inspected['Id'], response, inspected['Config']['Tty'],
+                self.timestamps
+            )
+        except BaseException:
+            response.close()
+            raise
+
+    def _poll(self):
+        ready = set(self._pending)
+        self._pending.clear()
+        timeout = 0 if ready else None
+        for key, _ in self._selector.select(timeout):
+            if key.fileobj is self._wakeup_r:
+                continue
+            ready.add(self._streams[key.fileobj])
+        if self._closed:
+            self._shutdown()
+            return
+        for stream in ready:
+            if stream.fileno not in self._streams:
+                continue
+            self._records.extend(stream.read(self.read_size))
+            if stream.ended:
+                self._drop(stream)
+            elif stream.buffered():
+                self._pending.add(stream)
+
+    def _drop(self, stream):
+        del self._streams[stream.fileno]
+        self._pending.discard(stream)
+        self._selector.unregister(stream.fileno)
+        stream.close()
+        grow_pool(self.api, -1)
+
+    def _shutdown(self):
+        for stream in list(self._streams.values()):
+            self._drop(stream)
+        self._records.clear()
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
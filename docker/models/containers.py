@@ -8,7 +8,7 @@ from ..api import APIClient
 from ..constants import DEFAULT_DATA_CHUNK_SIZE
 from ..errors import (
     ContainerError, DockerException, ImageNotFound,
-    NotFound, create_unexpected_kwargs_error
+    create_unexpected_kwargs_error
 )
 from ..types import HostConfig, NetworkingConfig
 from ..utils import version_gte
@@ -147,6 +147,55 @@ class Container(Model):
                                       **kwargs)
         return self.client.images.get(resp['Id'])
 
+    def copy_from(self, path, host_path, **kwargs):
+        """
+        Copy a file or folder from this container to a directory of the
+        host, extracting it as it is received. Similar to the ``docker cp
+        CONTAINER:PATH HOST_PATH`` command.
+
+        Args:
+            path (str): Path to the file or folder to copy. It is created
+                under ``host_path`` with the same name.
+            host_path (str): The directory to copy it to. It is created if
+                it doesn't exist.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. Default: False
+            chunk_size (int): The number of bytes read at a time.
+                Default: 2 MB
+
+        Returns:
+            (dict): The ``stat`` information on the specified ``path``.
+
+        Raises:
+            :py:class:`~docker.errors.APIError` If an error occurs.
+        """
+        return self.client.api.copy_from(self.id, path, host_path, **kwargs)
+
+    def copy_to(self, host_path, path, **kwargs):
+        """
+        Copy a file or folder of the host into this container, archiving
+        it while it is being uploaded. Similar to the ``docker cp HOST_PATH
+        CONTAINER:PATH`` command.
+
+        Args:
+            host_path (str): Path to the file or folder to copy. It is
+                created under ``path`` with the same name.
+            path (str): Path inside the container where the file or folder
+                will be extracted. Must exist.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission, e.g. for remote
+                daemons. Default: False
+            chunk_size (int): The approximate size of the chunks of the
+                archive sent at a time. Default: 2 MB
+
+        Returns:
+            (bool): True if the call succeeds.
+
+        Raises:
+            :py:class:`~docker.errors.APIError` If an error occurs.
+        """
+        return self.client.api.copy_to(self.id, host_path, path, **kwargs)
+
     def diff(self):
         """
         Inspect changes on a container's filesystem.
@@ -163,7 +212,8 @@ class Container(Model):
 
     def exec_run(self, cmd, stdout=True, stderr=True, stdin=False, tty=False,
                  privileged=False, user='', detach=False, stream=False,
-                 socket=False, environment=None, workdir=None, demux=False):
+                 socket=False, environment=None, workdir=None, demux=False,
+                 spool_threshold=None):
         """
         Run a command inside this container. Similar to
         ``docker exec``.
@@ -186,6 +236,9 @@ class Container(Model):
                 ``{"PASSWORD": "xxx"}``.
             workdir (str): Path to working directory for this exec session
             demux (bool): Return stdout and stderr separately
+            spool_threshold (int): Accumulate the output in temporary files
+                which spill to disk once they exceed this many bytes, and
+                return those instead of bytes. Default: None
 
         Returns:
             (ExecResult): A tuple of (exit_code, output)
@@ -196,6 +249,8 @@ class Container(Model):
                     If ``stream=True``, a generator yielding response chunks.
                     If ``socket=True``, a socket object for the connection.
                     If ``demux=True``, a tuple of two bytes: stdout and stderr.
+                    If ``spool_threshold`` is set, file objects take the
+                    place of bytes.
                     A bytestring containing response data otherwise.
 
         Raises:
@@ -209,7 +264,7 @@ class Container(Model):
         )
         exec_output = self.client.api.exec_start(
             resp['Id'], detach=detach, tty=tty, stream=stream, socket=socket,
-            demux=demux
+            demux=demux, spool_threshold=spool_threshold
         )
         if socket or stream:
             return ExecResult(None, exec_output)
@@ -907,6 +962,48 @@ class ContainerCollection(Collection):
             [line for line in out]
         )
 
+    def copy_between(self, src, src_path, dst, dst_path, **kwargs):
+        """
+        Copy a file or folder from a container to another one without
+        staging it on the client. The containers can run on different
+        servers.
+
+        Args:
+            src (:py:class:`Container` or str): The container where the file
+                is located. A container ID or name refers to a container of
+                this client's server.
+            src_path (str): Path to the file or folder to copy. It is created
+                under ``dst_path`` with the same name.
+            dst (:py:class:`Container` or str): The container to copy the
+                file or folder to.
+            dst_path (str): Path inside ``dst`` where the file or folder
+                will be extracted. Must exist.
+            encode_stream (bool): Determines if data should be encoded
+                (gzip-compressed) during transmission. Default: False
+            chunk_size (int): The maximum number of bytes held in memory at
+                a time. Default: 2 MB
+
+        Returns:
+            (dict): The ``stat`` information on ``src_path``.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If one of the servers returns an error.
+
+        Example:
+
+            >>> builder = client.containers.get('builder')
+            >>> web = remote_client.containers.get('web')
+            >>> client.containers.copy_between(
+            ...     builder, '/out/dist', web, '/srv')
+        """
+        src_client = src.client if isinstance(src, Container) else self.client
+        dst_client = dst.client if isinstance(dst, Container) else self.client
+        return src_client.api.copy_between(
+            getattr(src, 'id', src), src_path, getattr(dst, 'id', dst),
+            dst_path, dst_client=dst_client.api, **kwargs
+        )
+
     def create(self, image, command=None, **kwargs):
         """
         Create a container without starting it. Similar to ``docker create``.
@@ -1009,21 +1106,96 @@ class ContainerCollection(Collection):
         if sparse:
             return [self.prepare_model(r) for r in resp]
         else:
-            containers = []
-            for r in resp:
-                try:
-                    containers.append(self.get(r['Id']))
-                # a container may have been removed while iterating
-                except NotFound:
-                    if not ignore_removed:
-                        raise
-            return containers
+            # a container may have been removed since it was listed
+            return self._get_many(
+                [r['Id'] for r in resp], ignore_removed=ignore_removed
+            )
 
     def prune(self, filters=None):
         return self.client.api.prune_containers(filters=filters)
 
     prune.__doc__ = APIClient.prune_containers.__doc__
 
+    def kill_many(self, containers, signal=None, concurrency=None,
+                  rate_limit=None):
+        return self._bulk(
+            self.client.api.kill_many, containers, signal=signal,
+            concurrency=concurrency, rate_limit=rate_limit
+        )
+
+    kill_many.__doc__ = APIClient.kill_many.__doc__
+
+    def pause_many(self, containers, concurrency=None, rate_limit=None):
+        return self._bulk(
+            self.client.api.pause_many, containers, concurrency=concurrency,
+            rate_limit=rate_limit
+        )
+
+    pause_many.__doc__ = APIClient.pause_many.__doc__
+
+    def remove_many(self, containers, v=False, link=False, force=False,
+                    concurrency=None, rate_limit=None):
+        return self._bulk(
+            self.client.api.remove_many, containers, v=v, link=link,
+            force=force, concurrency=concurrency, rate_limit=rate_limit
+        )
+
+    remove_many.__doc__ = APIClient.remove_many.__doc__
+
+    def restart_many(self, containers, timeout=10, concurrency=None,
+                     rate_limit=None):
+        return self._bulk(
+            self.client.api.restart_many, containers, timeout=timeout,
+            concurrency=concurrency, rate_limit=rate_limit
+        )
+
+    restart_many.__doc__ = APIClient.restart_many.__doc__
+
+    def start_many(self, containers, concurrency=None, rate_limit=None):
+        return self._bulk(
+            self.client.api.start_many, containers, concurrency=concurrency,
+            rate_limit=rate_limit
+        )
+
+    start_many.__doc__ = APIClient.start_many.__doc__
+
+    def stop_many(self, containers, timeout=None, concurrency=None,
+                  rate_limit=None):
+        return self._bulk(
+            self.client.api.stop_many, containers, timeout=timeout,
+            concurrency=concurrency, rate_limit=rate_limit
+        )
+
+    stop_many.__doc__ = APIClient.stop_many.__doc__
+
+    def unpause_many(self, containers, concurrency=None, rate_limit=None):
+        return self._bulk(
+            self.client.api.unpause_many, containers, concurrency=concurrency,
+            rate_limit=rate_limit
+        )
+
+    unpause_many.__doc__ = APIClient.unpause_many.__doc__
+
+    def exec_run_many(self, jobs, **kwargs):
+        jobs = list(jobs)
+        results = self.client.api.exec_many(
+            [(c.id if isinstance(c, Container) else c, cmd)
+             for c, cmd in jobs],
+            **kwargs
+        )
+        return [r._replace(item=job) for job, r in zip(jobs, results)]
+
+    exec_run_many.__doc__ = APIClient.exec_many.__doc__
+
+    def _bulk(self, method, containers, **kwargs):
+        containers = list(containers)
+        results = method(
+            [c.id if isinstance(c, Container) else c for c in containers],
+            **kwargs
+        )
+        # Report the containers as they were passed
+        return [r._replace(item=c) for c, r in zip(containers, results)]
+
 
 # kwargs to copy straight from run to create
 RUN_CREATE_KWARGS = [
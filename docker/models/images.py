@@ -5,7 +5,9 @@ import warnings
 from ..api import APIClient
 from ..constants import DEFAULT_DATA_CHUNK_SIZE
 from ..errors import BuildError, ImageLoadError, InvalidArgument
+from ..progress import PullProgress
 from ..utils import parse_repository_tag
+from ..utils.concurrency import map_results, pool_size
 from ..utils.json_stream import json_stream
 from .resource import Collection, Model
 
@@ -107,6 +109,49 @@ class Image(Model):
             >>>   f.write(chunk)
             >>> f.close()
         """
+        return self.client.api.get_image(self._save_name(named), chunk_size)
+
+    def save_to(self, path, named=False, chunk_size=DEFAULT_DATA_CHUNK_SIZE,
+                fsync=True, progress=None):
+        """
+        Write a tarball of an image to a file. Similar to the ``docker save
+        -o`` command.
+
+        The tarball is streamed to disk as it is received, through a
+        ``<path>.part`` file that is renamed to ``path`` once complete.
+
+        Args:
+            path (str): The path of the file to write.
+            named (str or bool): Whether the tarball retains repository and
+                tag information for this image, as in :py:meth:`save`.
+            chunk_size (int): The maximum number of bytes held in memory at
+                a time. Default: 2 MB
+            fsync (bool): Flush the file to disk before returning.
+                Default: ``True``
+            progress (callable): Called with a
+                :py:class:`~docker.utils.transfer.TransferStats` after each
+                chunk written.
+
+        Returns:
+            (:py:class:`~docker.utils.transfer.TransferStats`): The size of
+            the tarball and the time it took to write it.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+
+        Example:
+
+            >>> image = cli.images.get("busybox:latest")
+            >>> stats = image.save_to('/tmp/busybox-latest.tar')
+            >>> print(f'{stats.rate / 2 ** 20:.1f} MiB/s')
+        """
+        return self.client.api.get_image_to(
+            self._save_name(named), path, chunk_size=chunk_size, fsync=fsync,
+            progress=progress
+        )
+
+    def _save_name(self, named):
         img = self.id
         if named:
             img = self.tags[0] if self.tags else img
@@ -116,8 +161,7 @@ class Image(Model):
                         f"{named} is not a valid tag for this image"
                     )
                 img = named
-
-        return self.client.api.get_image(img, chunk_size)
+        return img
 
     def tag(self, repository, tag=None, **kwargs):
         """
@@ -249,6 +293,11 @@ class ImageCollection(Collection):
             forcerm (bool): Always remove intermediate containers, even after
                 unsuccessful builds
             dockerfile (str): path within the build context to the Dockerfile
+            gzip (bool): If set to ``True``, gzip compression/encoding is used
+            gzip_level (int): The gzip compression level, from 0 to 9.
+                Default: 9
+            gzip_workers (int): If set, compress the build context with that
+                many threads, using independently compressed blocks.
             buildargs (dict): A dictionary of build arguments
             container_limits (dict): A dictionary of limits applied to each
                 container created by the build process. Valid keys:
@@ -279,6 +328,11 @@ class ImageCollection(Collection):
                 configuration file (``~/.docker/config.json`` by default)
                 contains a proxy configuration, the corresponding environment
                 variables will be set in the container being built.
+            stream_context (bool or int): Archive the build context while
+                uploading it instead of writing it to a temporary file first.
+                An int sets the size of the upload buffer, in bytes.
+            context_cache (:py:class:`~docker.utils.build.BuildContextCache`):
+                A cache of the file metadata of the build context.
 
         Returns:
             (tuple): The first item is the :py:class:`Image` object for the
@@ -378,7 +432,7 @@ class ImageCollection(Collection):
                 If the server returns an error.
         """
         resp = self.client.api.images(name=name, all=all, filters=filters)
-        return [self.get(r["Id"]) for r in resp]
+        return self._get_many([r["Id"] for r in resp])
 
     def load(self, data):
         """
@@ -396,7 +450,35 @@ class ImageCollection(Collection):
             :py:class:`docker.errors.APIError`
                 If the server returns an error.
         """
-        resp = self.client.api.load_image(data)
+        return self._loaded(self.client.api.load_image(data))
+
+    def load_from(self, path, progress=None):
+        """
+        Load an image from a tarball on disk, such as one written by
+        :py:meth:`~docker.models.images.Image.save_to` (or ``docker save
+        -o``). Similar to ``docker load -i``.
+
+        The file is sent as the connection consumes it, rather than read
+        into memory first.
+
+        Args:
+            path (str): The path of the tarball.
+            progress (callable): Called with a
+                :py:class:`~docker.utils.transfer.TransferStats` each time a
+                block of the file has been sent.
+
+        Returns:
+            (list of :py:class:`Image`): The images.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        return self._loaded(
+            self.client.api.load_image_from(path, progress=progress)
+        )
+
+    def _loaded(self, resp):
         images = []
         for chunk in resp:
             if 'stream' in chunk:
@@ -474,6 +556,63 @@ class ImageCollection(Collection):
             return self.get(f'{repository}{sep}{tag}')
         return self.list(repository)
 
+    def pull_many(self, refs, concurrency=None, rate_limit=None,
+                  progress=None, **kwargs):
+        """
+        Pull many images in parallel. Similar to calling :py:meth:`pull`
+        for each of them, except that a failure doesn't stop the other
+        pulls.
+
+        The progress messages of all the pulls are merged into a
+        :py:class:`~docker.progress.PullProgress`, where layers shared by
+        several images are reported once.
+
+        Args:
+            refs (list): The images to pull, as ``repository[:tag]`` or
+                ``repository@digest`` strings. The tag defaults to
+                ``latest``.
+            concurrency (int): The maximum number of pulls running at the
+                same time. Defaults to the size of the connection pool.
+            rate_limit (float): The maximum number of pulls started per
+                second. Default: no limit
+            progress (:py:class:`~docker.progress.PullProgress`): The
+                progress to update, e.g. to read it from another thread
+                while the pulls are running.
+            auth_config (dict): Override the credentials that are found in
+                the config for these requests.
+            platform (str): Platform in the format ``os[/arch[/variant]]``
+
+        Returns:
+            (list): A :py:class:`~docker.utils.concurrency.BulkResult` per
+            reference, in the order of ``refs``, holding either the pulled
+            :py:class:`Image` or the exception raised while pulling it.
+
+        Example:
+
+            >>> progress = PullProgress()
+            >>> results = client.images.pull_many(
+            ...     ['busybox', 'alpine:3.19'], progress=progress)
+            >>> [r.result for r in results if r.ok]
+            [<Image: 'busybox:latest'>, <Image: 'alpine:3.19'>]
+        """
+        if progress is None:
+            progress = PullProgress()
+
+        def pull(ref):
+            repository, tag = parse_repository_tag(ref)
+            tag = tag or 'latest'
+            pull_log = self.client.api.pull(
+                repository, tag=tag, stream=True, decode=True, **kwargs
+            )
+            for event in pull_log:
+                progress.update(ref, event)
+            sep = '@' if tag.startswith('sha256:') else ':'
+            return self.get(f'{repository}{sep}{tag}')
+
+        return map_results(
+            pull, refs, concurrency or pool_size(self.client.api), rate_limit
+        )
+
     def push(self, repository, tag=None, **kwargs):
         return self.client.api.push(repository, tag=tag, **kwargs)
     push.__doc__ = APIClient.push.__doc__
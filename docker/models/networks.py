@@ -1,5 +1,6 @@
 from ..api import APIClient
 from ..utils import version_gte
+from ..utils.concurrency import map_concurrently, pool_size
 from .containers import Container
 from .resource import Model, Collection
 
@@ -209,8 +210,9 @@ class NetworkCollection(Collection):
         resp = self.client.api.networks(*args, **kwargs)
         networks = [self.prepare_model(item) for item in resp]
         if greedy and version_gte(self.client.api._version, '1.28'):
-            for net in networks:
-                net.reload()
+            map_concurrently(
+                Network.reload, networks, pool_size(self.client.api)
+            )
         return networks
 
     def prune(self, filters=None):
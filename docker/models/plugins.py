@@ -131,7 +131,8 @@ class Plugin(Model):
 class PluginCollection(Collection):
     model = Plugin
 
-    def create(self, name, plugin_data_dir, gzip=False):
+    def create(self, name, plugin_data_dir, gzip=False, gzip_level=9,
+               gzip_workers=None):
         """
             Create a new plugin.
 
@@ -142,11 +143,18 @@ class PluginCollection(Collection):
                     Plugin data directory must contain the ``config.json``
                     manifest file and the ``rootfs`` directory.
                 gzip (bool): Compress the context using gzip. Default: False
+                gzip_level (int): The gzip compression level, from 0 to 9.
+                    Default: 9
+                gzip_workers (int): If set, compress the context with that
+                    many threads, using independently compressed blocks.
 
             Returns:
                 (:py:class:`Plugin`): The newly created plugin.
         """
-        self.client.api.create_plugin(name, plugin_data_dir, gzip)
+        self.client.api.create_plugin(
+            name, plugin_data_dir, gzip, gzip_level=gzip_level,
+            gzip_workers=gzip_workers
+        )
         return self.get(name)
 
     def get(self, name):
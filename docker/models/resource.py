@@ -1,3 +1,7 @@
+from ..errors import NotFound
+from ..utils.concurrency import map_concurrently, pool_size
+
+
 class Model:
     """
     A base class for representing a single object on the server.
@@ -78,6 +82,24 @@ class Collection:
     def create(self, attrs=None):
         raise NotImplementedError
 
+    def _get_many(self, ids, ignore_removed=False):
+        """
+        Get the objects with the given IDs, in order, making as many
+        requests concurrently as the client's connection pools allow. If
+        ``ignore_removed`` is set, objects that were removed in the
+        meantime are left out instead of raising
+        :py:class:`docker.errors.NotFound`.
+        """
+        def get(key):
+            try:
+                return self.get(key)
+            except NotFound:
+                if not ignore_removed:
+                    raise
+
+        models = map_concurrently(get, ids, pool_size(self.client.api))
+        return [model for model in models if model is not None]
+
     def prepare_model(self, attrs):
         """
         Create a model from a set of attributes.
@@ -0,0 +1,351 @@
+import itertools
+import threading
+import time
+
+from .errors import APIError
+from .utils.json_stream import json_stream
+
+# The statuses reported for a layer while it is pulled or pushed, ranked in
+# the order they are reached
+_PHASES = {
+    'Pulling fs layer': 0,
+    'Preparing': 0,
+    'Waiting': 1,
+    'Downloading': 2,
+    'Pushing': 2,
+    'Verifying Checksum': 3,
+    'Download complete': 4,
+    'Extracting': 5,
+    'Pull complete': 6,
+    'Already exists': 6,
+    'Pushed': 6,
+    'Layer already exists': 6,
+}
+_TRANSFERRING = ('Downloading', 'Pushing')
+_DOWNLOADED = _PHASES['Download complete']
+_COMPLETE = _PHASES['Pull complete']
+_NO_DETAIL = {}
+
+
+def _phase(status):
+    phase = _PHASES.get(status)
+    if phase is None and status.startswith('Mounted from '):
+        # Pushed layers found in another repository of the registry
+        phase = _COMPLETE
+    return phase
+
+
+class Layer:
+    """
+    The progress of a layer being pulled or pushed.
+
+    Attributes:
+        id (str): The ID of the layer, i.e. the short form of its digest.
+        status (str): The most advanced status reported for the layer, e.g.
+            ``Downloading`` or ``Pull complete``.
+        current (int): The number of bytes transferred.
+        total (int): The size of the layer, or ``0`` if it isn't known yet.
+        refs (set): The references of the images sharing this layer, when
+            tracked by :py:class:`PullProgress`.
+    """
+
+    __slots__ = ('_phase', 'current', 'id', 'refs', 'status', 'total')
+
+    def __init__(self, id):
+        self.id = id
+        self.status = None
+        self.current = 0
+        self.total = 0
+        self.refs = set()
+        self._phase = -1
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__}: {self.id} {self.status} '
+            f'{self.current}/{self.total}>'
+        )
+
+    @property
+    def complete(self):
+        """
+        Whether the layer has been fully pulled or pushed.
+        """
+        return self._phase >= _COMPLETE
+
+    def _update(self, status, phase, detail):
+        if phase < self._phase:
+            # Another transfer of the same layer is further ahead
+            return
+        self._phase = phase
+        self.status = status
+        if status in _TRANSFERRING:
+            total = detail.get('total')
+            if total:
+                self.total = total
+            current = detail.get('current')
+            if current and current > self.current:
+                self.current = current
+        elif phase >= _DOWNLOADED:
+            self.current = self.total
+
+    def _copy(self):
+        layer = Layer.__new__(Layer)
+        layer.id = self.id
+        layer.status = self.status
+        layer.current = self.current
+        layer.total = self.total
+        layer.refs = set(self.refs)
+        layer._phase = self._phase
+        return layer
+
+
+class ProgressSnapshot:
+    """
+    The state of a pull or push at a point in time, as yielded by
+    :py:func:`iter_progress`.
+
+    Attributes:
+        layers (tuple): The progress of each :py:class:`Layer`, in the order
+            they were first reported.
+        current (int): The number of bytes transferred over all the layers.
+        total (int): The size of all the layers whose size is known.
+        status (str): The last status reported for the image as a whole,
+            e.g. ``Status: Downloaded newer image for busybox:latest``.
+        digest (str): The digest of the image, once it has been reported.
+        error (str): The error message if the operation failed, else
+            ``None``.
+        done (bool): Whether this is the last snapshot of the operation.
+    """
+
+    __slots__ = (
+        'current',
+        'digest',
+        'done',
+        'error',
+        'layers',
+        'status',
+        'total'
+    )
+
+    def __init__(self, layers, status, digest, error, done):
+        self.layers = layers
+        self.current = sum(layer.current for layer in layers)
+        self.total = sum(layer.total for layer in layers)
+        self.status = status
+        self.digest = digest
+        self.error = error
+        self.done = done
+
+    def __repr__(self):
+        return (
+            f'<{self.__class__.__name__}: {len(self.layers)} layers '
+            f'{self.current}/{self.total}>'
+        )
+
+
+class Progress:
+    """
+    Folds the progress messages of a single pull or push into a table of
+    :py:class:`Layer` records, updated in place.
+
+    Most callers should use :py:func:`iter_progress`, which feeds a
+    ``Progress`` from a stream and yields throttled snapshots of it.
+    """
+
+    __slots__ = ('_layers', 'digest', 'error', 'status')
+
+    def __init__(self):
+        self._layers = {}
+        self.status = None
+        self.digest = None
+        self.error = None
+
+    def update(self, event):
+        """
+        Fold a decoded progress message.
+
+        Args:
+            event (dict): The progress message.
+        """
+        if 'error' in event:
+            self.error = event['error']
+            return
+        status = event.get('status', '')
+        phase = _phase(status)
+        id = event.get('id')
+        if phase is None or id is None:
+            aux = event.get('aux')
+            if aux and 'Digest' in aux:
+                # The result of a push
+                self.digest = aux['Digest']
+            elif status.startswith('Digest: '):
+                self.digest = status[len('Digest: '):]
+            elif status:
+                self.status = status
+            return
+        layer = self._layers.get(id)
+        if layer is None:
+            layer = self._layers[id] = Layer(id)
+        layer._update(
+            status, phase, event.get('progressDetail') or _NO_DETAIL
+        )
+
+    def snapshot(self, done=False):
+        """
+        Return a :py:class:`ProgressSnapshot` of the current state.
+        """
+        return ProgressSnapshot(
+            tuple(layer._copy() for layer in self._layers.values()),
+            self.status, self.digest, self.error, done
+        )
+
+
+def iter_progress(stream, interval=0.5):
+    """
+    Fold the progress stream of a pull or a push into a per-layer table,
+    and yield snapshots of it at most every ``interval`` seconds instead
+    of a dictionary per message.
+
+    The last snapshot yielded has ``done`` set, and holds the digest of the
+    image, or the error message if the operation failed. Errors are not
+    raised.
+
+    Example:
+
+        >>> stream = client.api.pull('busybox', stream=True)
+        >>> for snapshot in iter_progress(stream, interval=1):
+        ...     print(f'{snapshot.current}/{snapshot.total}')
+        >>> snapshot.digest
+        'sha256:650fd573e056...'
+
+    Args:
+        stream (generator): The output of
+            :py:meth:`~docker.api.image.ImageApiMixin.pull` or
+            :py:meth:`~docker.api.image.ImageApiMixin.push` with
+            ``stream=True``, decoded or not.
+        interval (float): The minimum number of seconds between two
+            snapshots. With ``0``, a snapshot is yielded per message.
+
+    Returns:
+        (generator): A stream of :py:class:`ProgressSnapshot`.
+    """
+    progress = Progress()
+    stream = iter(stream)
+    first = next(stream, None)
+    if first is not None:
+        stream = itertools.chain([first], stream)
+        if not isinstance(first, dict):
+            stream = json_stream(stream)
+        last = time.monotonic()
+        for event in stream:
+            progress.update(event)
+            if progress.error is not None:
+                break
+            now = time.monotonic()
+            if now - last >= interval:
+                last = now
+                yield progress.snapshot()
+    yield progress.snapshot(done=True)
+
+
+class PullProgress:
+    """
+    The aggregate progress of many image pulls, as used by
+    :py:meth:`~docker.models.images.ImageCollection.pull_many`.
+
+    The progress messages of all the pulls are merged into a single table
+    keyed by layer ID, so a layer shared by several images is reported once,
+    with the most advanced status any of the pulls reported for it. It can
+    be read from another thread while the pulls are running, e.g. to render
+    a progress bar.
+
+    Example:
+
+        >>> progress = PullProgress()
+        >>> for event in client.api.pull('busybox', stream=True,
+        ...                              decode=True):
+        ...     progress.update('busybox', event)
+        >>> progress.current, progress.total
+        (2155688, 2155688)
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self._statuses = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    def update(self, ref, event):
+        """
+        Merge a decoded progress message.
+
+        Args:
+            ref (str): The reference of the image being pulled.
+            event (dict): The progress message.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the message reports an error.
+        """
+        with self._lock:
+            if 'error' in event:
+                self._statuses[ref] = event['error']
+                raise APIError(event['error'])
+
+            status = event.get('status', '')
+            phase = _phase(status)
+            id = event.get('id')
+            if phase is None or id is None:
+                if status.startswith('Digest: '):
+                    self._digests[ref] = status[len('Digest: '):]
+                self._statuses[ref] = status
+                return
+
+            layer = self._layers.get(id)
+            if layer is None:
+                layer = self._layers[id] = Layer(id)
+            layer.refs.add(ref)
+            layer._update(
+                status, phase, event.get('progressDetail') or _NO_DETAIL
+            )
+
+    @property
+    def layers(self):
+        """
+        A copy of the progress of each layer: a list of :py:class:`Layer`,
+        in the order they were first reported.
+        """
+        with self._lock:
+            return [layer._copy() for layer in self._layers.values()]
+
+    @property
+    def current(self):
+        """
+        The number of bytes downloaded over all the layers.
+        """
+        with self._lock:
+            return sum(layer.current for layer in self._layers.values())
+
+    @property
+    def total(self):
+        """
+        The size of all the layers whose size is known.
+        """
+        with self._lock:
+            return sum(layer.total for layer in self._layers.values())
+
+    def status(self, ref):
+        """
+        The last status reported for the image as a whole, e.g.
+        ``Status: Downloaded newer image for busybox:latest``, or the error
+        message if the pull failed.
+        """
+        with self._lock:
+            return self._statuses.get(ref)
+
+    def digest(self, ref):
+        """
+        The digest of the image, once it has been reported.
+        """
+        with self._lock:
+            return self._digests.get(ref)
@@ -0,0 +1,594 @@
+import array
+import logging
+import math
+import re
+import threading
+import time
+import warnings
+from datetime import datetime
+
+from . import utils
+from .errors import DockerException, NotFound
+from .utils.concurrency import grow_pool, map_results, pool_size
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+log = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+#: The metrics read from the statistics returned by the server
+RAW_METRICS = (
+    'time', 'cpu_usage', 'system_cpu_usage', 'online_cpus', 'memory_usage',
+    'memory_cache', 'memory_limit', 'rx_bytes', 'tx_bytes', 'read_bytes',
+    'write_bytes', 'pids',
+)
+
+#: The metrics computed from the raw metrics of consecutive samples
+DERIVED_METRICS = (
+    'cpu_percent', 'memory', 'memory_percent', 'rx_rate', 'tx_rate',
+    'read_rate', 'write_rate',
+)
+
+METRICS = RAW_METRICS + DERIVED_METRICS
+
+_RFC3339 = re.compile(
+    r'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:\d\d)$'
+)
+
+
+def _parse_time(value):
+    """
+    The Unix timestamp of an RFC 3339 date with up to nanosecond precision,
+    as returned by the server, or ``None`` if it is missing, zero or
+    invalid.
+    """
+    match = _RFC3339.match(value or '')
+    if match is None or value.startswith('0001-01-01'):
+        return None
+    seconds, fraction, offset = match.groups()
+    if offset == 'Z':
+        offset = '+00:00'
+    timestamp = datetime.fromisoformat(seconds + offset).timestamp()
+    return timestamp + float(f'0.{fraction or 0}')
+
+
+def parse_stats(stats, now=None):
+    """
+    Extract the raw metrics from the statistics of a container, as returned
+    by :py:meth:`~docker.api.container.ContainerApiMixin.stats`.
+
+    Args:
+        stats (dict): The statistics.
+        now (float): The time the statistics were read at, if the
+            statistics don't have a ``read`` date. Default: the current
+            time.
+
+    Returns:
+        (tuple of float): The values of :py:data:`RAW_METRICS`, in order.
+        Missing values are ``nan``.
+    """
+    cpu = stats.get('cpu_stats') or {}
+    cpu_usage = cpu.get('cpu_usage') or {}
+    online_cpus = cpu.get('online_cpus') or len(
+        cpu_usage.get('percpu_usage') or ()
+    ) or NAN
+
+    memory = stats.get('memory_stats') or {}
+    memory_usage = memory.get('usage', NAN)
+    memory_stats = memory.get('stats') or {}
+    # Like the docker CLI, only count inactive page cache as reclaimable
+    cache = memory_stats.get('total_inactive_file')  # cgroup v1
+    if cache is None or not cache < memory_usage:
+        cache = memory_stats.get('inactive_file')  # cgroup v2
+    if cache is None or not cache < memory_usage:
+        cache = 0
+
+    rx_bytes = tx_bytes = 0
+    for network in (stats.get('networks') or {}).values():
+        rx_bytes += network.get('rx_bytes', 0)
+        tx_bytes += network.get('tx_bytes', 0)
+
+    read_bytes = write_bytes = 0
+    blkio = (stats.get('blkio_stats') or {}).get(
+        'io_service_bytes_recursive'
+    ) or ()
+    for entry in blkio:
+        op = entry.get('op', '').lower()
+        if op == 'read':
+            read_bytes += entry.get('value', 0)
+        elif op == 'write':
+            write_bytes += entry.get('value', 0)
+
+    read = _parse_time(stats.get('read'))
+    if read is None:
+        read = time.time() if now is None else now
+
+    return (
+        read,
+        cpu_usage.get('total_usage', NAN),
+        cpu.get('system_cpu_usage', NAN),
+        online_cpus,
+        memory_usage,
+        cache,
+        memory.get('limit', NAN),
+        rx_bytes,
+        tx_bytes,
+        read_bytes,
+        write_bytes,
+        (stats.get('pids_stats') or {}).get('current', NAN),
+    )
+
+
+# Element-wise operations on the columns of ring buffers, which are arrays
+# when NumPy is available, and lists otherwise.
+
+def _sub(a, b):
+    if numpy is not None:
+        return a - b
+    return [x - y for x, y in zip(a, b)]
+
+
+def _ratio(num, den, scale):
+    """
+    ``num / den * scale``, or ``nan`` where ``den`` isn't positive or
+    ``num`` is negative, e.g. when a counter was reset.
+    """
+    if numpy is not None:
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            return numpy.where(
+                (den > 0) & (num >= 0), num / den * scale, numpy.nan
+            )
+    if not isinstance(scale, list):
+        scale = [scale] * len(num)
+    return [
+        n / d * s if d > 0 and n >= 0 else NAN
+        for n, d, s in zip(num, den, scale)
+    ]
+
+
+def _percentile(values, q):
+    # Linear interpolation, like numpy.nanpercentile
+    values = sorted(v for v in values if not math.isnan(v))
+    if not values:
+        return NAN
+    k = (len(values) - 1) * q / 100.0
+    low = math.floor(k)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+class _RingBuffer:
+    """
+    The last ``size`` values of a metric for each container: a matrix with a
+    row per container and a column per sampling round, where round ``i`` is
+    stored in column ``i % size``. Backed by a NumPy array if available, or
+    by an :py:class:`array.array` per row.
+    """
+
+    def __init__(self, rows, size):
+        self.size = size
+        self.data = self._empty(rows)
+
+    def _empty(self, rows):
+        if numpy is not None:
+            return numpy.full((rows, self.size), numpy.nan)
+        return [array.array('d', [NAN]) * self.size for _ in range(rows)]
+
+    def grow(self, rows):
+        extra = self._empty(rows - len(self.data))
+        if numpy is not None:
+            self.data = numpy.vstack([self.data, extra])
+        else:
+            self.data.extend(extra)
+
+    def clear(self, row):
+        if numpy is not None:
+            self.data[row] = numpy.nan
+        else:
+            self.data[row] = array.array('d', [NAN]) * self.size
+
+    def column(self, col):
+        if numpy is not None:
+            return self.data[:, col]
+        return [r[col] for r in self.data]
+
+    def set_column(self, col, values):
+        if numpy is not None:
+            self.data[:, col] = values
+        else:
+            for r, value in zip(self.data, values):
+                r[col] = value
+
+    def row(self, row, start, count):
+        """
+        The ``count`` values of a row from column ``start``, wrapping
+        around.
+        """
+        values = list(self.data[row][start:]) + list(self.data[row][:start])
+        return [float(v) for v in values[:count]]
+
+
+class _StatsStream:
+    """
+    A statistics stream, read in a background thread which only keeps the
+    latest sample, so that the rounds of a collector don't fall behind the
+    stream when they are slower than the server.
+    """
+
+    def __init__(self, response, samples):
+        self.response = response
+        self._samples = samples
+        self._latest = None
+        self._error = None
+        self._done = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._read, name='docker-stats-stream', daemon=True
+        )
+        self._thread.start()
+
+    def _read(self):
+        try:
+            for stats in self._samples:
+                with self._cond:
+                    self._latest = (stats, time.time())
+                    self._cond.notify_all()
+        except Exception as e:
+            with self._cond:
+                self._error = e
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def next(self):
+        """
+        The latest sample and the time it was received at, waiting for one
+        if none was received since the previous call.
+
+        Raises:
+            StopIteration: If the stream ended.
+        """
+        with self._cond:
+            while self._latest is None and not self._done:
+                self._cond.wait()
+            latest, self._latest = self._latest, None
+            if latest is not None:
+                return latest
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+
+    def close(self):
+        self.response.close()
+
+
+class StatsCollector:
+    """
+    Samples the statistics of many containers at once, and keeps a window of
+    the last samples of each metric to compute rates and percentiles.
+
+    At every round, the statistics of all containers are requested
+    concurrently. With API version 1.41 and above, single one-shot requests
+    are made; otherwise, a statistics stream is kept open per container and
+    its latest sample read, and the connection pool of the client grows by
+    one connection per stream. The streams are read in background threads,
+    which only keep the latest sample of each stream. The values are stored
+    in a fixed-size ring buffer per metric, covering all containers, and the
+    derived metrics are computed for all of them at once. NumPy is used for
+    storage and computations if it is installed.
+
+    The available metrics are :py:data:`RAW_METRICS`, and the following
+    metrics derived from them:
+
+    - ``cpu_percent``: The CPU usage since the previous sample, as a
+      percentage of one CPU, like ``docker stats``.
+    - ``memory``: The memory usage, minus the inactive page cache.
+    - ``memory_percent``: ``memory``, as a percentage of the limit.
+    - ``rx_rate``, ``tx_rate``: Bytes received and sent per second.
+    - ``read_rate``, ``write_rate``: Bytes read and written per second on
+      block devices.
+
+    Example:
+
+        >>> collector = StatsCollector(client, window=300)
+        >>> collector.start(interval=1)
+        >>> collector.percentile('cpu_percent', 95)
+        {'5d9b2b7bc2d1...': 12.5, ...}
+
+    Args:
+        client (:py:class:`~docker.APIClient`): The client to use. A
+            :py:class:`~docker.DockerClient` is accepted too.
+        containers (list): The containers to sample, as IDs or
+            :py:class:`~docker.models.containers.Container` objects.
+            Default: all running containers, listed again at every round.
+        window (int): The number of samples kept for each container. At
+            least 2, as rates are computed from consecutive samples.
+        max_workers (int): The number of requests made concurrently.
+            Default: the size of the client's connection pool.
+        one_shot (bool): Whether to make one-shot requests. Default: if the
+            API version supports them.
+    """
+
+    def __init__(self, client, containers=None, window=60, max_workers=None,
+                 one_shot=None):
+        if window < 2:
+            raise ValueError(f'window must be at least 2, got {window}')
+        self.api = getattr(client, 'api', client)
+        self.window = window
+        self.max_workers = max_workers
+        if one_shot is None:
+            one_shot = utils.version_gte(self.api.api_version, '1.41')
+        self.one_shot = one_shot
+        self._auto = containers is None
+        self._slots = {}
+        self._free = []
+        self._rings = {m: _RingBuffer(0, window) for m in METRICS}
+        self._round = 0
+        self._streams = {}
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stopped = threading.Event()
+        if containers:
+            self.add(*containers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def containers(self):
+        """
+        The IDs of the sampled containers.
+        """
+        with self._lock:
+            return list(self._slots)
+
+    def add(self, *containers):
+        """
+        Start sampling more containers.
+        """
+        with self._lock:
+            for container in containers:
+                container = getattr(container, 'id', container)
+                if container in self._slots:
+                    continue
+                if not self._free:
+                    rows = len(self._rings['time'].data)
+                    new_rows = max(rows * 2, 16)
+                    for ring in self._rings.values():
+                        ring.grow(new_rows)
+                    self._free = list(range(new_rows - 1, rows - 1, -1))
+                self._slots[container] = self._free.pop()
+
+    def remove(self, container):
+        """
+        Stop sampling a container, and discard its samples.
+        """
+        container = getattr(container, 'id', container)
+        with self._lock:
+            slot = self._slots.pop(container, None)
+            if slot is not None:
+                for ring in self._rings.values():
+                    ring.clear(slot)
+                self._free.append(slot)
+        self._close_stream(container)
+
+    def sample(self):
+        """
+        Sample the statistics of all containers once.
+
+        Containers that no longer exist are removed. Other errors are
+        logged, and leave a gap in the samples of the container.
+        """
+        if self._auto:
+            running = [c['Id'] for c in self.api.containers(quiet=True)]
+            for container in set(self._slots) - set(running):
+                self.remove(container)
+            self.add(*running)
+
+        containers = self.containers
+        results = map_results(
+            self._fetch, containers,
+            self.max_workers or pool_size(self.api)
+        )
+
+        with self._lock:
+            rows = len(self._rings['time'].data)
+            columns = [[NAN] * rows for _ in RAW_METRICS]
+            for result in results:
+                slot = self._slots.get(result.item)
+                if slot is None:
+                    continue
+                if result.ok:
+                    for column, value in zip(columns, result.result):
+                        column[slot] = value
+                elif isinstance(result.error, NotFound):
+                    self.remove(result.item)
+                else:
+                    self._close_stream(result.item)
+                    log.warning(
+                        'Error while sampling statistics of %s: %s',
+                        result.item, result.error
+                    )
+
+            col = self._round % self.window
+            for metric, column in zip(RAW_METRICS, columns):
+                self._rings[metric].set_column(col, column)
+            self._derive(col, (self._round - 1) % self.window)
+            self._round += 1
+
+    def _fetch(self, container):
+        if self.one_shot:
+            stats = self.api.stats(container, stream=False, one_shot=True)
+            return parse_stats(stats)
+        stream = self._streams.get(container)
+        if stream is None:
+            url = self.api._url('/containers/{0}/stats', container)
+            # The stream holds a connection until it is closed
+            grow_pool(self.api, 1)
+            try:
+                response = self.api._get(
+                    url, params={'stream': True}, stream=True
+                )
+                self.api._raise_for_status(response)
+            except BaseException:
+                grow_pool(self.api, -1)
+                raise
+            stream = _StatsStream(
+                response, self.api._stream_helper(response, True)
+            )
+            self._streams[container] = stream
+        try:
+            stats, received = stream.next()
+        except StopIteration:
+            raise NotFound(f'Statistics of {container} ended') from None
+        return parse_stats(stats, now=received)
+
+    def _close_stream(self, container):
+        stream = self._streams.pop(container, None)
+        if stream is not None:
+            stream.close()
+            grow_pool(self.api, -1)
+
+    def _derive(self, col, prev):
+        def current(metric):
+            return self._rings[metric].column(col)
+
+        def delta(metric):
+            return _sub(current(metric), self._rings[metric].column(prev))
+
+        online_cpus = current('online_cpus')
+        if numpy is not None:
+            cpu_scale = online_cpus * 100
+        else:
+            cpu_scale = [n * 100 for n in online_cpus]
+        elapsed = delta('time')
+        memory = _sub(current('memory_usage'), current('memory_cache'))
+
+        derived = {
+            'cpu_percent': _ratio(
+                delta('cpu_usage'), delta('system_cpu_usage'), cpu_scale
+            ),
+            'memory': memory,
+            'memory_percent': _ratio(memory, current('memory_limit'), 100),
+            'rx_rate': _ratio(delta('rx_bytes'), elapsed, 1),
+            'tx_rate': _ratio(delta('tx_bytes'), elapsed, 1),
+            'read_rate': _ratio(delta('read_bytes'), elapsed, 1),
+            'write_rate': _ratio(delta('write_bytes'), elapsed, 1),
+        }
+        for metric, values in derived.items():
+            self._rings[metric].set_column(col, values)
+
+    def latest(self, metric):
+        """
+        The last sampled value of a metric for each container.
+
+        Args:
+            metric (str): The name of the metric.
+
+        Returns:
+            (dict): The values, by container ID. Values that couldn't be
+            sampled or computed are ``nan``.
+        """
+        with self._lock:
+            if not self._round:
+                return dict.fromkeys(self._slots, NAN)
+            column = self._rings[metric].column(
+                (self._round - 1) % self.window
+            )
+            return {c: float(column[s]) for c, s in self._slots.items()}
+
+    def series(self, container, metric):
+        """
+        The values of a metric for a container, from the oldest sample in
+        the window to the latest.
+
+        Args:
+            container (str): The ID of the container.
+            metric (str): The name of the metric.
+
+        Returns:
+            (list of float): The values.
+        """
+        container = getattr(container, 'id', container)
+        with self._lock:
+            count = min(self._round, self.window)
+            start = (self._round - count) % self.window
+            return self._rings[metric].row(
+                self._slots[container], start, count
+            )
+
+    def percentile(self, metric, q):
+        """
+        A percentile of the values of a metric in the window, for each
+        container.
+
+        Args:
+            metric (str): The name of the metric.
+            q (float): The percentile, between 0 and 100.
+
+        Returns:
+            (dict): The percentiles, by container ID.
+        """
+        with self._lock:
+            containers = list(self._slots.items())
+            data = self._rings[metric].data
+            if numpy is not None:
+                rows = data[[s for _, s in containers]]
+                with warnings.catch_warnings():
+                    # Rows without any sample yet
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    values = numpy.nanpercentile(rows, q, axis=1) if len(
+                        rows) else []
+                return {
+                    c: float(v) for (c, _), v in zip(containers, values)
+                }
+            return {c: _percentile(data[s], q) for c, s in containers}
+
+    def start(self, interval=1.0):
+        """
+        Sample the statistics every ``interval`` seconds in a background
+        thread.
+        """
+        if self._thread is not None:
+            raise DockerException('The collector is already started')
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name='docker-stats',
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop sampling in the background.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        """
+        Stop sampling and close the statistics streams.
+        """
+        self.stop()
+        for container in list(self._streams):
+            self._close_stream(container)
+
+    def _run(self, interval):
+        next_round = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                self.sample()
+            except Exception:
+                log.warning('Error while sampling statistics', exc_info=True)
+            next_round = max(next_round + interval, time.monotonic())
+            self._stopped.wait(next_round - time.monotonic())
@@ -1,11 +1,14 @@
+from .._lazy import lazy_attributes
+from .poolstats import PoolStats, PoolStatsSnapshot
+from .tcpconn import TCPHTTPAdapter
 from .unixconn import UnixHTTPAdapter
-try:
-    from .npipeconn import NpipeHTTPAdapter
-    from .npipesocket import NpipeSocket
-except ImportError:
-    pass
 
-try:
-    from .sshconn import SSHHTTPAdapter
-except ImportError:
-    pass
+# npipeconn requires pywin32, and sshconn imports paramiko, which is slow to
+# import: they are only imported when used. If their dependencies are
+# missing, accessing them raises AttributeError, which "from docker.transport
+# import ..." turns into ImportError.
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'NpipeHTTPAdapter': '.npipeconn',
+    'NpipeSocket': '.npipesocket',
+    'SSHHTTPAdapter': '.sshconn',
+})
@@ -1,8 +1,58 @@
+import urllib.parse
+
 import requests.adapters
 
+from .poolstats import PoolStats
+
 
 class BaseHTTPAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, *args, **kwargs):
+        self.pool_stats = PoolStats()
+        super().__init__(*args, **kwargs)
+
     def close(self):
         super().close()
         if hasattr(self, 'pools'):
             self.pools.clear()
+
+    @staticmethod
+    def _pool_key(url):
+        # Connections are shared by all the requests to a server, whatever
+        # their path
+        scheme, netloc = urllib.parse.urlsplit(url)[:2]
+        return f'{scheme}://{netloc}'
+
+    def _pool_for(self, url, verify, cert):
+        return self.get_connection(url)
+
+    def warm_pool(self, url, n, verify=True, cert=None):
+        """
+        Open connections to the server at ``url`` until ``n`` of them, at
+        most ``max_pool_size``, are idle in its pool.
+
+        Args:
+            url (str): The URL of the server.
+            n (int): The number of connections to have open.
+            verify (bool or str): Whether to verify the certificate of the
+                server, or the path of the CA bundle to verify it with.
+            cert (str or tuple): The client certificate.
+
+        Returns:
+            (int): The number of connections opened.
+        """
+        return self._pool_for(url, verify, cert).warm(n)
+
+    def grow_pool(self, url, n, verify=True, cert=None):
+        """
+        Keep ``n`` more connections to the server at ``url`` in its pool,
+        beyond ``max_pool_size``, e.g. while as many long-lived streams
+        each hold one. A negative ``n`` shrinks the pool back.
+
+        Args:
+            url (str): The URL of the server.
+            n (int): The number of connections to add.
+            verify (bool or str): Whether to verify the certificate of the
+                server, or the path of the CA bundle to verify it with.
+            cert (str or tuple): The client certificate.
+        """
+        self._pool_for(url, verify, cert).grow(n)
@@ -4,6 +4,7 @@ import requests.adapters
 from docker.transport.basehttpadapter import BaseHTTPAdapter
 from .. import constants
 from .npipesocket import NpipeSocket
+from .poolstats import PoolStatsMixin
 
 import urllib3
 import urllib3.connection
@@ -26,7 +27,8 @@ class NpipeHTTPConnection(urllib3.connection.HTTPConnection):
         self.sock = sock
 
 
-class NpipeHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+class NpipeHTTPConnectionPool(PoolStatsMixin,
+                              urllib3.connectionpool.HTTPConnectionPool):
     def __init__(self, npipe_path, timeout=60, maxsize=10):
         super().__init__(
             'localhost', timeout=timeout, maxsize=maxsize
@@ -41,8 +43,8 @@ class NpipeHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
 
     # When re-using connections, urllib3 tries to call select() on our
     # NpipeSocket instance, causing a crash. To circumvent this, we override
-    # _get_conn, where that check happens.
-    def _get_conn(self, timeout):
+    # _take_conn, where that check happens.
+    def _take_conn(self, timeout):
         conn = None
         try:
             conn = self.pool.get(block=self.block, timeout=timeout)
@@ -80,6 +82,7 @@ class NpipeHTTPAdapter(BaseHTTPAdapter):
         super().__init__()
 
     def get_connection(self, url, proxies=None):
+        url = self._pool_key(url)
         with self.pools.lock:
             pool = self.pools.get(url)
             if pool:
@@ -89,6 +92,7 @@ class NpipeHTTPAdapter(BaseHTTPAdapter):
                 self.npipe_path, self.timeout,
                 maxsize=self.max_pool_size
             )
+            pool.pool_stats = self.pool_stats
             self.pools[url] = pool
 
         return pool
@@ -0,0 +1,273 @@
+import threading
+import time
+from collections import namedtuple
+
+import urllib3
+import urllib3.connectionpool
+
+HOOK_EVENTS = (
+    'created', 'reused', 'released', 'discarded', 'exhausted', 'waited'
+)
+
+
+class PoolStatsSnapshot(namedtuple('PoolStatsSnapshot', [
+        'created', 'reused', 'discarded', 'exhausted', 'wait_time',
+        'in_flight', 'max_in_flight'])):
+    """
+    The use of the connections of an adapter at a point in time, as
+    returned by :py:meth:`PoolStats.snapshot`.
+
+    Attributes:
+        created (int): The number of connections opened.
+        reused (int): The number of requests sent on a connection that was
+            already open.
+        discarded (int): The number of connections closed after use instead
+            of being kept in the pool, e.g. because the pool was full or
+            the server closed them.
+        exhausted (int): The number of requests for a connection made while
+            ``max_pool_size`` of them were already in use. These either
+            waited for one, failed with
+            :py:class:`urllib3.exceptions.EmptyPoolError`, or were sent on
+            an extra connection discarded afterwards.
+        wait_time (float): The total number of seconds spent getting a
+            connection from the pool.
+        in_flight (int): The number of connections in use. Connections
+            taken over by an attach or exec socket are counted as discarded
+            instead, as they may never be returned to the pool.
+        max_in_flight (int): The highest number of connections in use at
+            once.
+    """
+
+
+class PoolStats:
+    """
+    Counts how the connections of an adapter are created, reused and
+    discarded, e.g. to tell whether ``max_pool_size`` is too low for the
+    load. It is shared by all the connection pools of the adapter, and can
+    be read from any thread.
+
+    Hooks registered with :py:meth:`register_hook` are called as the
+    connections are used.
+
+    Example:
+
+        >>> client = docker.APIClient()
+        >>> client.warm_pool(4)
+        4
+        >>> client.pool_stats.snapshot()
+        PoolStatsSnapshot(created=4, reused=0, discarded=0, exhausted=0,
+        wait_time=0.0, in_flight=0, max_in_flight=0)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks = {event: [] for event in HOOK_EVENTS}
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+        self._exhausted = 0
+        self._wait_time = 0.0
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+    def register_hook(self, event, hook):
+        """
+        Call ``hook(event, value)`` on an event. ``value`` is the number of
+        seconds spent for ``waited``, and the number of connections in use
+        for the other events.
+
+        Hooks are called in the thread using the connection, so they
+        should return quickly.
+
+        Args:
+            event (str): One of ``created`` or ``reused``, when a
+                connection is taken from the pool, ``released`` when it is
+                returned to it, ``discarded`` when it is closed instead,
+                ``exhausted`` when all the connections of the pool are in
+                use, and ``waited`` once a connection has been obtained.
+            hook (callable): The function to call.
+
+        Raises:
+            ValueError: If the event is unknown.
+        """
+        if event not in self._hooks:
+            raise ValueError(f'Unknown pool event: {event!r}')
+        self._hooks[event].append(hook)
+
+    def snapshot(self):
+        """
+        Return a :py:class:`PoolStatsSnapshot` of the counters.
+        """
+        with self._lock:
+            return PoolStatsSnapshot(
+                self._created, self._reused, self._discarded,
+                self._exhausted, self._wait_time, self._in_flight,
+                self._max_in_flight
+            )
+
+    def _call_hooks(self, event, value):
+        for hook in self._hooks[event]:
+            hook(event, value)
+
+    def _checked_out(self, reused, wait_time):
+        with self._lock:
+            if reused:
+                self._reused += 1
+            else:
+                self._created += 1
+            self._wait_time += wait_time
+            self._in_flight += 1
+            in_flight = self._in_flight
+            self._max_in_flight = max(self._max_in_flight, in_flight)
+        self._call_hooks('reused' if reused else 'created', in_flight)
+        self._call_hooks('waited', wait_time)
+
+    def _checked_in(self, discarded):
+        with self._lock:
+            self._in_flight -= 1
+            if discarded:
+                self._discarded += 1
+            in_flight = self._in_flight
+        self._call_hooks('released', in_flight)
+        if discarded:
+            self._call_hooks('discarded', in_flight)
+
+    def _connected(self):
+        with self._lock:
+            self._created += 1
+            in_flight = self._in_flight
+        self._call_hooks('created', in_flight)
+
+    def _exhausted_pool(self):
+        with self._lock:
+            self._exhausted += 1
+            in_flight = self._in_flight
+        self._call_hooks('exhausted', in_flight)
+
+
+class PoolStatsMixin:
+    """
+    Records the use of the connections of a urllib3 connection pool in its
+    ``pool_stats``, a :py:class:`PoolStats` set by the adapter, and opens
+    connections ahead of time with :py:meth:`warm`.
+
+    Pools overriding how connections are taken from the pool override
+    ``_take_conn`` instead of ``_get_conn``.
+    """
+
+    # Set on the connections passed to detach()
+    _detached_attr = '_pool_stats_detached'
+
+    pool_stats = None
+
+    def _take_conn(self, timeout):
+        return super()._get_conn(timeout)
+
+    def _get_conn(self, timeout=None):
+        stats = self.pool_stats
+        if stats is None:
+            return self._take_conn(timeout)
+        if self.pool is not None and self.pool.empty():
+            stats._exhausted_pool()
+        start = time.monotonic()
+        conn = self._take_conn(timeout)
+        stats._checked_out(conn.sock is not None, time.monotonic() - start)
+        return conn
+
+    def _put_conn(self, conn):
+        super()._put_conn(conn)
+        if conn is not None and conn.__dict__.pop(self._detached_attr, False):
+            return
+        if self.pool_stats is not None:
+            # Connections closed on errors are released as None
+            self.pool_stats._checked_in(conn is None or conn.sock is None)
+
+    def detach(self, conn):
+        """
+        Stop counting ``conn`` as in use, because it has been taken over,
+        e.g. by an attach or exec socket. It is counted as discarded, and
+        not again if it is returned to the pool afterwards.
+        """
+        if (self.pool_stats is None or conn is None or
+                hasattr(conn, self._detached_attr)):
+            return
+        setattr(conn, self._detached_attr, True)
+        self.pool_stats._checked_in(True)
+
+    def grow(self, n):
+        """
+        Keep ``n`` more connections in the pool, e.g. while as many
+        long-lived streams each hold one. A negative ``n`` shrinks it back,
+        closing the idle connections that no longer fit.
+        """
+        pool = self.pool
+        if pool is None:
+            return
+        with pool.mutex:
+            pool.maxsize = max(pool.maxsize + n, 1)
+            # The queue is a list or a deque whose last item is taken first:
+            # free slots are put first so that idle connections are still
+            # reused, and are dropped before the least recently used ones.
+            items = [None] * max(n, 0) + list(pool.queue)
+            idle = items[:max(-n, 0)]
+            pool.queue.clear()
+            pool.queue.extend(items[len(idle):])
+            if n > 0:
+                pool.not_empty.notify(n)
+        for conn in idle:
+            if conn is not None:
+                conn.close()
+
+    def warm(self, n):
+        """
+        Open connections until ``n`` of them, at most the size of the pool,
+        are idle in the pool.
+
+        Returns:
+            (int): The number of connections opened.
+        """
+        conns = []
+        opened = 0
+        try:
+            for _ in range(min(n, self.pool.maxsize)):
+                conn = self._take_conn(None)
+                conns.append(conn)
+                if conn.sock is None:
+                    conn.connect()
+                    opened += 1
+                    if self.pool_stats is not None:
+                        self.pool_stats._connected()
+        finally:
+            for conn in conns:
+                super()._put_conn(conn)
+        return opened
+
+
+class HTTPConnectionPool(PoolStatsMixin,
+                         urllib3.connectionpool.HTTPConnectionPool):
+    pass
+
+
+class HTTPSConnectionPool(PoolStatsMixin,
+                          urllib3.connectionpool.HTTPSConnectionPool):
+    pass
+
+
+class PoolManager(urllib3.PoolManager):
+    """
+    A :py:class:`urllib3.PoolManager` whose pools record their use in
+    ``pool_stats``.
+    """
+
+    def __init__(self, *args, pool_stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_classes_by_scheme = {
+            'http': HTTPConnectionPool,
+            'https': HTTPSConnectionPool,
+        }
+        self.pool_stats = pool_stats
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.pool_stats = self.pool_stats
+        return pool
@@ -2,25 +2,53 @@ import paramiko
 import queue
 import urllib.parse
 import requests.adapters
+import collections
+import contextlib
+import errno
+import io
 import logging
 import os
+import select
+import shutil
 import signal
 import socket
 import subprocess
+import tempfile
+import threading
 
 from docker.transport.basehttpadapter import BaseHTTPAdapter
 from .. import constants
+from .poolstats import PoolStatsMixin
 
 import urllib3
 import urllib3.connection
 
 RecentlyUsedContainer = urllib3._collections.RecentlyUsedContainer
 
+log = logging.getLogger(__name__)
 
-class SSHSocket(socket.socket):
-    def __init__(self, host):
-        super().__init__(
-            socket.AF_INET, socket.SOCK_STREAM)
+DIAL_STDIO_COMMAND = 'docker system dial-stdio'
+
+# The amount of data sent within SSHSocket.corked() that is buffered before
+# being written
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Pipes can't be polled, nor made non-blocking, on Windows
+_NON_BLOCKING_PIPES = not constants.IS_WINDOWS_PLATFORM
+
+
+class SSHSocket:
+    """
+    A socket-like object over the pipes of an ``ssh ... docker system
+    dial-stdio`` process.
+
+    The pipes are non-blocking, so timeouts are honoured and
+    :py:meth:`fileno` can be polled like a socket, for reading. Data sent
+    within :py:meth:`corked` is written to the pipe in as few calls as
+    possible; otherwise it is written right away.
+    """
+
+    def __init__(self, host, control_path=None):
         self.host = host
         self.port = None
         self.user = None
@@ -29,7 +57,13 @@ class SSHSocket(socket.socket):
         if '@' in self.host:
             self.user, self.host = self.host.split('@')
 
+        # With a control path, the ssh processes share a single master
+        # connection, so only the first one pays for the SSH handshake
+        self.control_path = control_path
         self.proc = None
+        self._timeout = None
+        self._corked = False
+        self._write_buffer = bytearray()
 
     def connect(self, **kwargs):
         args = ['ssh']
@@ -39,7 +73,15 @@ class SSHSocket(socket.socket):
         if self.port:
             args = args + ['-p', self.port]
 
-        args = args + ['--', self.host, 'docker system dial-stdio']
+        if self.control_path:
+            args = args + [
+                '-o', 'ControlMaster=auto',
+                '-o', f'ControlPath={self.control_path}',
+                '-o',
+                f'ControlPersist={constants.DEFAULT_SSH_CONTROL_PERSIST}',
+            ]
+
+        args = args + ['--', self.host, DIAL_STDIO_COMMAND]
 
         preexec_func = None
         if not constants.IS_WINDOWS_PLATFORM:
@@ -58,69 +100,323 @@ class SSHSocket(socket.socket):
             env=env,
             stdout=subprocess.PIPE,
             stdin=subprocess.PIPE,
+            bufsize=0,
             preexec_fn=preexec_func)
 
-    def _write(self, data):
-        if not self.proc or self.proc.stdin.closed:
-            raise Exception('SSH subprocess not initiated.'
+        if _NON_BLOCKING_PIPES:
+            os.set_blocking(self.proc.stdout.fileno(), False)
+            os.set_blocking(self.proc.stdin.fileno(), False)
+
+    def _check_connected(self):
+        if not self.proc:
+            raise Exception('SSH subprocess not initiated. '
                             'connect() must be called first.')
-        written = self.proc.stdin.write(data)
-        self.proc.stdin.flush()
-        return written
+
+    def fileno(self):
+        """
+        The file descriptor to poll for incoming data, or ``-1`` once
+        closed.
+        """
+        if not self.proc or self.proc.stdout.closed:
+            return -1
+        return self.proc.stdout.fileno()
+
+    def settimeout(self, timeout):
+        self._timeout = timeout
+
+    def gettimeout(self):
+        return self._timeout
+
+    def setblocking(self, flag):
+        self._timeout = None if flag else 0.0
+
+    def _wait(self, pipe, event):
+        if self._timeout == 0:
+            raise BlockingIOError(errno.EWOULDBLOCK, 'SSH pipe not ready')
+        poller = select.poll()
+        poller.register(pipe, event)
+        timeout = None if self._timeout is None else self._timeout * 1000
+        if not poller.poll(timeout):
+            raise socket.timeout('timed out')
+
+    def _write(self, data):
+        self._check_connected()
+        stdin = self.proc.stdin
+        view = memoryview(data).cast('B')
+        while view:
+            written = stdin.write(view)
+            if written is None:
+                self._wait(stdin, select.POLLOUT)
+            else:
+                view = view[written:]
+        return len(data)
+
+    def flush(self):
+        """
+        Write the data buffered by :py:meth:`sendall` within
+        :py:meth:`corked`.
+        """
+        if self._write_buffer:
+            data, self._write_buffer = self._write_buffer, bytearray()
+            self._write(data)
+
+    @contextlib.contextmanager
+    def corked(self):
+        """
+        Buffer the data sent in the ``with`` block, and write it once the
+        block exits, or as soon as :py:data:`WRITE_BUFFER_SIZE` bytes are
+        pending. The buffered data is dropped if the block raises.
+        """
+        self._corked = True
+        try:
+            yield
+        except BaseException:
+            self._write_buffer.clear()
+            raise
+        finally:
+            self._corked = False
+        self.flush()
 
     def sendall(self, data):
-        self._write(data)
+        if self._corked:
+            self._write_buffer += data
+            if len(self._write_buffer) >= WRITE_BUFFER_SIZE:
+                self.flush()
+        else:
+            self.flush()
+            self._write(data)
 
     def send(self, data):
-        return self._write(data)
+        self.sendall(data)
+        return len(data)
 
     def recv(self, n):
-        if not self.proc:
-            raise Exception('SSH subprocess not initiated.'
-                            'connect() must be called first.')
-        return self.proc.stdout.read(n)
-
-    def makefile(self, mode):
+        self._check_connected()
+        self.flush()
+        stdout = self.proc.stdout
+        while not stdout.closed:
+            data = stdout.read(n)
+            if data is not None:
+                return data
+            self._wait(stdout, select.POLLIN)
+        return b''
+
+    def recv_into(self, buffer, nbytes=0):
+        self._check_connected()
+        self.flush()
+        view = memoryview(buffer).cast('B')
+        if nbytes:
+            view = view[:nbytes]
+        stdout = self.proc.stdout
+        while not stdout.closed:
+            received = stdout.readinto(view)
+            if received is not None:
+                return received
+            self._wait(stdout, select.POLLIN)
+        return 0
+
+    def makefile(self, mode='rb', buffering=-1):
         if not self.proc:
             self.connect()
-        self.proc.stdout.channel = self
+        if buffering is None or buffering < 0:
+            buffering = io.DEFAULT_BUFFER_SIZE
+        reader = io.BufferedReader(_SSHSocketIO(self), buffering)
+        reader.channel = self
+        return reader
 
-        return self.proc.stdout
+    def shutdown(self, how):
+        if not self.proc:
+            return
+        if how in (socket.SHUT_WR, socket.SHUT_RDWR):
+            self.proc.stdin.close()
+        if how in (socket.SHUT_RD, socket.SHUT_RDWR):
+            # Pending and future reads then see the end of the stream
+            self.proc.terminate()
 
     def close(self):
-        if not self.proc or self.proc.stdin.closed:
+        if not self.proc or self.proc.stdout.closed:
             return
-        self.proc.stdin.write(b'\n\n')
-        self.proc.stdin.flush()
+        if not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.write(b'\n\n')
+                self.proc.stdin.close()
+            except OSError:
+                pass
         self.proc.terminate()
+        self.proc.stdout.close()
+
+    @property
+    def dropped(self):
+        return self.proc is not None and self.proc.poll() is not None
+
+
+class _SSHSocketIO(io.RawIOBase):
+    # The raw stream under the file returned by SSHSocket.makefile()
+
+    def __init__(self, sock):
+        super().__init__()
+        self._sock = sock
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        return self._sock.recv_into(b)
+
+    def fileno(self):
+        return self._sock.fileno()
+
+
+def _channel_usable(channel, transport):
+    return (
+        not channel.closed and not channel.exit_status_ready() and
+        channel.get_transport() is transport and transport.is_active()
+    )
+
+
+class SSHChannelPool:
+    """
+    Keeps up to ``size`` sessions running ``docker system dial-stdio`` open
+    ahead of time on a paramiko client, so that new connections don't have
+    to wait for a channel to be opened and the command to start.
+
+    The pool is refilled in a background thread as sessions are taken.
+    """
+
+    def __init__(self, ssh_client, size=constants.DEFAULT_SSH_WARM_CHANNELS):
+        self.ssh_client = ssh_client
+        self.size = size
+        self._channels = collections.deque()
+        self._lock = threading.Lock()
+        self._filling = False
+        self._closed = False
+
+    def _open(self):
+        channel = self.ssh_client.get_transport().open_session()
+        channel.exec_command(DIAL_STDIO_COMMAND)
+        return channel
+
+    def get(self):
+        """
+        Return a session running ``docker system dial-stdio``, opening one
+        if none is ready.
+        """
+        channel = None
+        transport = self.ssh_client.get_transport()
+        with self._lock:
+            while self._channels:
+                warm = self._channels.popleft()
+                if transport and _channel_usable(warm, transport):
+                    channel = warm
+                    break
+                warm.close()
+        if channel is None:
+            channel = self._open()
+        self.fill()
+        return channel
+
+    def fill(self):
+        """
+        Open sessions in the background until ``size`` of them are ready.
+        """
+        with self._lock:
+            if (self._filling or self._closed or
+                    len(self._channels) >= self.size):
+                return
+            self._filling = True
+        threading.Thread(
+            target=self._fill, name='docker-ssh-channels', daemon=True
+        ).start()
+
+    def _fill(self):
+        try:
+            while True:
+                with self._lock:
+                    if self._closed or len(self._channels) >= self.size:
+                        return
+                try:
+                    channel = self._open()
+                except (paramiko.SSHException, OSError) as e:
+                    log.debug(f'Could not open an SSH session: {e}')
+                    return
+                with self._lock:
+                    if self._closed:
+                        channel.close()
+                        return
+                    self._channels.append(channel)
+        finally:
+            with self._lock:
+                self._filling = False
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            channels = list(self._channels)
+            self._channels.clear()
+        for channel in channels:
+            channel.close()
 
 
 class SSHConnection(urllib3.connection.HTTPConnection):
-    def __init__(self, ssh_transport=None, timeout=60, host=None):
+    def __init__(self, ssh_transport=None, timeout=60, host=None,
+                 channel_pool=None, control_path=None):
         super().__init__(
             'localhost', timeout=timeout
         )
         self.ssh_transport = ssh_transport
         self.timeout = timeout
         self.ssh_host = host
+        self.channel_pool = channel_pool
+        self.control_path = control_path
 
     def connect(self):
-        if self.ssh_transport:
+        if self.channel_pool:
+            sock = self.channel_pool.get()
+            sock.settimeout(self.timeout)
+        elif self.ssh_transport:
             sock = self.ssh_transport.open_session()
             sock.settimeout(self.timeout)
-            sock.exec_command('docker system dial-stdio')
+            sock.exec_command(DIAL_STDIO_COMMAND)
         else:
-            sock = SSHSocket(self.ssh_host)
+            sock = SSHSocket(self.ssh_host, self.control_path)
             sock.settimeout(self.timeout)
             sock.connect()
 
         self.sock = sock
 
-
-class SSHConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+    def _corked(self):
+        if self.sock is None:
+            self.connect()
+        if isinstance(self.sock, SSHSocket):
+            return self.sock.corked()
+        return contextlib.nullcontext()
+
+    # Write each request, including its body, with as few writes to the
+    # pipe of the ssh process as possible
+    def request(self, *args, **kwargs):
+        with self._corked():
+            return super().request(*args, **kwargs)
+
+    def request_chunked(self, *args, **kwargs):
+        with self._corked():
+            return super().request_chunked(*args, **kwargs)
+
+    @property
+    def dropped(self):
+        sock = self.sock
+        if sock is None:
+            return False
+        if isinstance(sock, SSHSocket):
+            return sock.dropped
+        return sock.closed or sock.exit_status_ready()
+
+
+class SSHConnectionPool(PoolStatsMixin,
+                        urllib3.connectionpool.HTTPConnectionPool):
     scheme = 'ssh'
 
-    def __init__(self, ssh_client=None, timeout=60, maxsize=10, host=None):
+    def __init__(self, ssh_client=None, timeout=60, maxsize=10, host=None,
+                 channel_pool=None, control_path=None):
         super().__init__(
             'localhost', timeout=timeout, maxsize=maxsize
         )
@@ -129,14 +425,19 @@ class SSHConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
         if ssh_client:
             self.ssh_transport = ssh_client.get_transport()
         self.ssh_host = host
+        self.channel_pool = channel_pool
+        self.control_path = control_path
 
     def _new_conn(self):
-        return SSHConnection(self.ssh_transport, self.timeout, self.ssh_host)
+        return SSHConnection(
+            self.ssh_transport, self.timeout, self.ssh_host,
+            channel_pool=self.channel_pool, control_path=self.control_path
+        )
 
     # When re-using connections, urllib3 calls fileno() on our
     # SSH channel instance, quickly overloading our fd limit. To avoid this,
-    # we override _get_conn
-    def _get_conn(self, timeout):
+    # we override _take_conn
+    def _take_conn(self, timeout):
         conn = None
         try:
             conn = self.pool.get(block=self.block, timeout=timeout)
@@ -153,6 +454,11 @@ class SSHConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
                 ) from None
             # Oh well, we'll create a new connection then
 
+        if conn is not None and conn.dropped:
+            # The ssh process or the session ended, e.g. on a timeout
+            conn.close()
+            conn = None
+
         return conn or self._new_conn()
 
 
@@ -165,11 +471,23 @@ class SSHHTTPAdapter(BaseHTTPAdapter):
     def __init__(self, base_url, timeout=60,
                  pool_connections=constants.DEFAULT_NUM_POOLS,
                  max_pool_size=constants.DEFAULT_MAX_POOL_SIZE,
-                 shell_out=False):
+                 shell_out=False,
+                 warm_channels=constants.DEFAULT_SSH_WARM_CHANNELS,
+                 multiplex=True):
         self.ssh_client = None
+        self.channel_pool = None
+        self._control_dir = None
         if not shell_out:
             self._create_paramiko_client(base_url)
             self._connect()
+            if warm_channels:
+                self.channel_pool = SSHChannelPool(
+                    self.ssh_client, warm_channels
+                )
+                self.channel_pool.fill()
+        elif multiplex and not constants.IS_WINDOWS_PLATFORM:
+            # OpenSSH for Windows doesn't support connection sharing
+            self._control_dir = tempfile.mkdtemp(prefix='docker-ssh-')
 
         self.ssh_host = base_url
         if base_url.startswith('ssh://'):
@@ -217,14 +535,18 @@ class SSHHTTPAdapter(BaseHTTPAdapter):
         if self.ssh_client:
             self.ssh_client.connect(**self.ssh_params)
 
+    @property
+    def control_path(self):
+        """
+        The path of the socket of the OpenSSH master connection shared by
+        the ``ssh`` processes, or ``None`` if they don't share one.
+        """
+        if self._control_dir is None:
+            return None
+        return os.path.join(self._control_dir, 'master')
+
     def get_connection(self, url, proxies=None):
-        if not self.ssh_client:
-            return SSHConnectionPool(
-                ssh_client=self.ssh_client,
-                timeout=self.timeout,
-                maxsize=self.max_pool_size,
-                host=self.ssh_host
-            )
+        url = self._pool_key(url)
         with self.pools.lock:
             pool = self.pools.get(url)
             if pool:
@@ -238,13 +560,35 @@ class SSHHTTPAdapter(BaseHTTPAdapter):
                 ssh_client=self.ssh_client,
                 timeout=self.timeout,
                 maxsize=self.max_pool_size,
-                host=self.ssh_host
+                host=self.ssh_host,
+                channel_pool=self.channel_pool,
+                control_path=self.control_path
             )
+            pool.pool_stats = self.pool_stats
             self.pools[url] = pool
 
         return pool
 
+    def _stop_control_master(self):
+        host = urllib.parse.urlparse(f'ssh://{self.ssh_host}').hostname
+        try:
+            subprocess.run(
+                ['ssh', '-o', f'ControlPath={self.control_path}',
+                 '-O', 'exit', '--', host or 'localhost'],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, timeout=self.timeout, check=False
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            log.debug(f'Could not stop the SSH master connection: {e}')
+
     def close(self):
         super().close()
+        if self.channel_pool:
+            self.channel_pool.close()
         if self.ssh_client:
             self.ssh_client.close()
+        if self._control_dir is not None:
+            if os.path.exists(self.control_path):
+                self._stop_control_master()
+            shutil.rmtree(self._control_dir, ignore_errors=True)
+            self._control_dir = None
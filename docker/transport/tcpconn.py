@@ -0,0 +1,33 @@
+import requests
+
+from .basehttpadapter import BaseHTTPAdapter
+from .poolstats import PoolManager
+
+
+class TCPHTTPAdapter(BaseHTTPAdapter):
+    """
+    The adapter for servers listening on TCP, with or without TLS, whose
+    connection pools record their use in ``pool_stats``.
+    """
+
+    def init_poolmanager(self, connections, maxsize,
+                         block=requests.adapters.DEFAULT_POOLBLOCK,
+                         **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        self.poolmanager = PoolManager(
+            num_pools=connections, maxsize=maxsize, block=block,
+            pool_stats=getattr(self, 'pool_stats', None), **pool_kwargs
+        )
+
+    def _pool_for(self, url, verify, cert):
+        if hasattr(self, 'get_connection_with_tls_context'):
+            # requests >= 2.32 keys the pools on the TLS options as well
+            request = requests.Request('GET', url).prepare()
+            return self.get_connection_with_tls_context(
+                request, verify, cert=cert
+            )
+        pool = self.get_connection(url)
+        self.cert_verify(pool, url, verify, cert)
+        return pool
@@ -3,6 +3,7 @@ import socket
 
 from docker.transport.basehttpadapter import BaseHTTPAdapter
 from .. import constants
+from .poolstats import PoolStatsMixin
 
 import urllib3
 import urllib3.connection
@@ -28,7 +29,8 @@ class UnixHTTPConnection(urllib3.connection.HTTPConnection):
         self.sock = sock
 
 
-class UnixHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+class UnixHTTPConnectionPool(PoolStatsMixin,
+                             urllib3.connectionpool.HTTPConnectionPool):
     def __init__(self, base_url, socket_path, timeout=60, maxsize=10):
         super().__init__(
             'localhost', timeout=timeout, maxsize=maxsize
@@ -65,6 +67,7 @@ class UnixHTTPAdapter(BaseHTTPAdapter):
         super().__init__()
 
     def get_connection(self, url, proxies=None):
+        url = self._pool_key(url)
         with self.pools.lock:
             pool = self.pools.get(url)
             if pool:
@@ -74,6 +77,7 @@ class UnixHTTPAdapter(BaseHTTPAdapter):
                 url, self.socket_path, self.timeout,
                 maxsize=self.max_pool_size
             )
+            pool.pool_stats = self.pool_stats
             self.pools[url] = pool
 
         return pool
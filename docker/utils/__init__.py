@@ -1,5 +1,8 @@
 
-from .build import match_tag, create_archive, exclude_paths, mkbuildcontext, tar
+from .build import (
+    match_tag, archive_digest, create_archive, context_digest, exclude_paths,
+    mkbuildcontext, stream_archive, stream_tar, tar, BuildContextCache
+)
 from .decorators import check_resource, minimum_version, update_headers
 from .utils import (
     compare_version, convert_port_bindings, convert_volume_binds,
@@ -11,3 +14,4 @@ from .utils import (
     format_environment, format_extra_hosts
 )
 
+from .version_cache import VersionCache
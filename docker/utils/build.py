@@ -1,11 +1,16 @@
+import hashlib
 import io
+import json
 import os
 import re
+import stat
 import tarfile
 import tempfile
+import zlib
 
-from .fnmatch import fnmatch
-from ..constants import IS_WINDOWS_PLATFORM
+from .fnmatch import fnmatch, translate
+from .parallel_gzip import ParallelGzipCompressor, ParallelGzipWriter
+from ..constants import DEFAULT_DATA_CHUNK_SIZE, IS_WINDOWS_PLATFORM
 
 
 _SEP = re.compile('/|\\\\') if IS_WINDOWS_PLATFORM else re.compile('/')
@@ -19,7 +24,40 @@ def match_tag(tag: str) -> bool:
     return bool(_TAG.match(tag))
 
 
-def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
+def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False,
+        cache=None, gzip_level=9, gzip_workers=None):
+    return create_archive(
+        fileobj=fileobj, gzip=gzip, cache=cache, gzip_level=gzip_level,
+        gzip_workers=gzip_workers,
+        **_context_archive_args(path, exclude, dockerfile)
+    )
+
+
+def stream_tar(path, exclude=None, dockerfile=None, gzip=False,
+               buffer_size=DEFAULT_DATA_CHUNK_SIZE, cache=None, gzip_level=9,
+               gzip_workers=None):
+    """
+    Like :py:func:`tar`, but returns a generator of archive chunks produced
+    by :py:func:`stream_archive` instead of a file object.
+    """
+    return stream_archive(
+        gzip=gzip, buffer_size=buffer_size, cache=cache,
+        gzip_level=gzip_level, gzip_workers=gzip_workers,
+        **_context_archive_args(path, exclude, dockerfile)
+    )
+
+
+def context_digest(path, exclude=None, dockerfile=None, cache=None):
+    """
+    Return a digest of the build context that :py:func:`tar` would create
+    with the same arguments. See :py:func:`archive_digest`.
+    """
+    return archive_digest(
+        cache=cache, **_context_archive_args(path, exclude, dockerfile)
+    )
+
+
+def _context_archive_args(path, exclude, dockerfile):
     root = os.path.abspath(path)
     exclude = exclude or []
     dockerfile = dockerfile or (None, None)
@@ -32,10 +70,11 @@ def tar(path, exclude=None, dockerfile=None, fileobj=None, gzip=False):
             ('.dockerignore', dockerignore_contents),
             dockerfile,
         ]
-    return create_archive(
-        files=sorted(exclude_paths(root, exclude, dockerfile=dockerfile[0])),
-        root=root, fileobj=fileobj, gzip=gzip, extra_files=extra_files
-    )
+    return {
+        'files': sorted(exclude_paths(root, exclude, dockerfile=dockerfile[0])),
+        'root': root,
+        'extra_files': extra_files,
+    }
 
 
 def exclude_paths(root, patterns, dockerfile=None):
@@ -68,11 +107,287 @@ def build_file_list(root):
 
 
 def create_archive(root, files=None, fileobj=None, gzip=False,
-                   extra_files=None):
-    extra_files = extra_files or []
+                   extra_files=None, cache=None, gzip_level=9,
+                   gzip_workers=None):
+    """
+    Write a tar archive of ``files``, relative to ``root``, to ``fileobj`` or
+    a temporary file, and return it rewound. If ``gzip`` is set, the archive
+    is compressed at ``gzip_level``, with a :py:class:`ParallelGzipWriter`
+    using ``gzip_workers`` threads if it is set.
+    """
     if not fileobj:
         fileobj = tempfile.NamedTemporaryFile()
-    t = tarfile.open(mode='w:gz' if gzip else 'w', fileobj=fileobj)
+    gzip_writer = None
+    if gzip and gzip_workers:
+        gzip_writer = ParallelGzipWriter(
+            fileobj, compresslevel=gzip_level, workers=gzip_workers
+        )
+        t = tarfile.open(mode='w', fileobj=gzip_writer)
+    elif gzip:
+        t = tarfile.open(
+            mode='w:gz', fileobj=fileobj, compresslevel=gzip_level
+        )
+    else:
+        t = tarfile.open(mode='w', fileobj=fileobj)
+    try:
+        for i, source in _archive_members(
+                t, root, files, extra_files, cache):
+            if isinstance(source, bytes):
+                t.addfile(i, io.BytesIO(source))
+            elif source is not None:
+                try:
+                    with open(source, 'rb') as f:
+                        t.addfile(i, f)
+                except OSError as oe:
+                    raise OSError(
+                        f'Can not read file in context: {source}'
+                    ) from oe
+            else:
+                # Directories, FIFOs, symlinks... don't need to be read.
+                t.addfile(i, None)
+
+        t.close()
+        if gzip_writer is not None:
+            gzip_writer.close()
+    finally:
+        if gzip_writer is not None:
+            # Only stops the compression threads if the archive failed
+            gzip_writer.abort()
+    fileobj.seek(0)
+    return fileobj
+
+
+def stream_archive(root, files=None, gzip=False, extra_files=None,
+                   buffer_size=DEFAULT_DATA_CHUNK_SIZE, cache=None,
+                   gzip_level=9, gzip_workers=None):
+    """
+    Generate the same archive as :py:func:`create_archive`, as chunks of
+    about ``buffer_size`` bytes. Files are read as the archive is consumed,
+    so nothing is staged on disk and memory use is bounded by
+    ``buffer_size``. The generator can be used as a chunked request body.
+    """
+    # Only used to build headers, keeping track of hard links
+    t = tarfile.open(mode='w', fileobj=io.BytesIO())
+    compressor = None
+    if gzip and gzip_workers:
+        compressor = ParallelGzipCompressor(gzip_level, gzip_workers)
+    elif gzip:
+        compressor = zlib.compressobj(
+            gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    out = bytearray()
+    blocks = _tar_blocks(t, root, files, extra_files, buffer_size, cache)
+    try:
+        for data in blocks:
+            if compressor is not None:
+                data = compressor.compress(data)
+            if not out and len(data) >= buffer_size:
+                yield data
+                continue
+            out += data
+            if len(out) >= buffer_size:
+                yield bytes(out)
+                out.clear()
+        if compressor is not None:
+            out += compressor.flush()
+    finally:
+        # Also runs when the generator is abandoned, e.g. by a failed
+        # request, so that the compression threads don't leak
+        if isinstance(compressor, ParallelGzipCompressor):
+            compressor.close()
+    if out:
+        yield bytes(out)
+
+
+def _tar_blocks(t, root, files, extra_files, buffer_size, cache):
+    offset = 0
+    for i, source in _archive_members(t, root, files, extra_files, cache):
+        header = i.tobuf(t.format, t.encoding, t.errors)
+        offset += len(header)
+        yield header
+        if source is None:
+            continue
+        if isinstance(source, bytes):
+            yield source
+        else:
+            try:
+                yield from _read_file(source, i.size, buffer_size)
+            except OSError as oe:
+                raise OSError(
+                    f'Can not read file in context: {source}'
+                ) from oe
+        offset += i.size
+        remainder = i.size % tarfile.BLOCKSIZE
+        if remainder:
+            offset += tarfile.BLOCKSIZE - remainder
+            yield tarfile.NUL * (tarfile.BLOCKSIZE - remainder)
+
+    # End of archive marker, padded to a full record like tarfile does
+    offset += tarfile.BLOCKSIZE * 2
+    remainder = offset % tarfile.RECORDSIZE
+    yield tarfile.NUL * (
+        tarfile.BLOCKSIZE * 2 +
+        (tarfile.RECORDSIZE - remainder if remainder else 0)
+    )
+
+
+def _read_file(path, size, buffer_size):
+    with open(path, 'rb') as f:
+        while size > 0:
+            data = f.read(min(size, buffer_size))
+            if not data:
+                raise OSError('unexpected end of data')
+            size -= len(data)
+            yield data
+
+
+def archive_digest(root, files=None, extra_files=None, cache=None):
+    """
+    Return a ``sha256:``-prefixed digest of the archive that
+    :py:func:`create_archive` would create with the same arguments. It
+    covers the name, type, mode and contents of every entry, but not
+    timestamps or ownership, so it only changes when the build context does.
+
+    With a :py:class:`BuildContextCache`, the contents of files that weren't
+    modified since they were last hashed aren't read again.
+    """
+    t = tarfile.open(mode='w', fileobj=io.BytesIO())
+    digest = hashlib.sha256()
+    for i, source in _archive_members(t, root, files, extra_files, cache):
+        if isinstance(source, bytes):
+            content_digest = hashlib.sha256(source).hexdigest()
+        elif source is None:
+            content_digest = ''
+        elif cache is not None:
+            content_digest = cache.file_digest(source)
+        else:
+            content_digest = _file_digest(source)
+        digest.update('\0'.join((
+            i.name, i.type.decode('ascii'), oct(i.mode), i.linkname,
+            content_digest
+        )).encode('utf-8', 'surrogateescape') + b'\n')
+    return f'sha256:{digest.hexdigest()}'
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for data in iter(lambda: f.read(DEFAULT_DATA_CHUNK_SIZE), b''):
+                digest.update(data)
+    except OSError as oe:
+        raise OSError(f'Can not read file in context: {path}') from oe
+    return digest.hexdigest()
+
+
+class BuildContextCache:
+    """
+    A persistent cache of build context metadata, stored as JSON in the file
+    at ``path``. For every file of a context, keyed on its path, size,
+    modification time and mode, it records the tar member header fields and
+    the digest of its contents. Unchanged files then don't need to be looked
+    up again to be archived, nor read again to compute
+    :py:func:`archive_digest`.
+
+    Changes are only written to disk by :py:meth:`save`. Entries of files
+    that weren't archived or hashed since the cache was loaded are dropped
+    at that point.
+
+    Example:
+
+        >>> cache = BuildContextCache('/tmp/context-cache.json')
+        >>> digest = client.api.build_context_digest(
+        ...     '/src/app', context_cache=cache
+        ... )
+        >>> if digest != last_digest:
+        ...     client.images.build(path='/src/app', context_cache=cache)
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = {}
+        self._used = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self._entries = data.get('entries', {})
+
+    def _entry(self, full_path, st):
+        key = [st.st_size, st.st_mtime_ns, st.st_mode]
+        entry = self._used.get(full_path)
+        if entry is None or entry['key'] != key:
+            entry = self._entries.get(full_path)
+            if entry is None or entry['key'] != key:
+                entry = {'key': key}
+            self._used[full_path] = entry
+        return entry
+
+    def gettarinfo(self, t, full_path, arcname):
+        """
+        Return the :py:class:`tarfile.TarInfo` for a file, like
+        :py:meth:`tarfile.TarFile.gettarinfo`.
+        """
+        st = os.lstat(full_path)
+        entry = self._entry(full_path, st)
+        info = entry.get('info')
+        if info is not None:
+            i = tarfile.TarInfo(arcname)
+            for k, v in info.items():
+                setattr(i, k, v)
+            i.type = i.type.encode('ascii')
+            return i
+
+        i = t.gettarinfo(full_path, arcname=arcname)
+        # The tar file tracks hard links to refer to the first one, so their
+        # headers depend on the order files are archived in.
+        if i is not None and not (stat.S_ISREG(st.st_mode) and
+                                  st.st_nlink > 1):
+            entry['info'] = {
+                'mode': i.mode, 'uid': i.uid, 'gid': i.gid, 'size': i.size,
+                'mtime': i.mtime, 'type': i.type.decode('ascii'),
+                'linkname': i.linkname, 'uname': i.uname, 'gname': i.gname,
+            }
+        return i
+
+    def file_digest(self, full_path):
+        """
+        Return the hex SHA-256 digest of the contents of a file.
+        """
+        entry = self._entry(full_path, os.stat(full_path))
+        if 'digest' not in entry:
+            entry['digest'] = _file_digest(full_path)
+        return entry['digest']
+
+    def save(self):
+        """
+        Write the cache to disk.
+        """
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(dirname, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+                'w', dir=dirname, delete=False) as f:
+            json.dump(
+                {'version': self.VERSION, 'entries': self._used}, f,
+                separators=(',', ':')
+            )
+        os.replace(f.name, self.path)
+        self._entries = self._used
+        self._used = {}
+
+
+def _archive_members(t, root, files, extra_files, cache=None):
+    """
+    Yields ``(tarinfo, source)`` pairs for the entries of a context archive.
+    ``source`` is the path of a regular file to read the contents from, the
+    contents of an extra file as bytes, or ``None`` for entries without data.
+    """
+    extra_files = extra_files or []
     if files is None:
         files = build_file_list(root)
     extra_names = {e[0] for e in extra_files}
@@ -82,7 +397,10 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
             continue
         full_path = os.path.join(root, path)
 
-        i = t.gettarinfo(full_path, arcname=path)
+        if cache is not None:
+            i = cache.gettarinfo(t, full_path, path)
+        else:
+            i = t.gettarinfo(full_path, arcname=path)
         if i is None:
             # This happens when we encounter a socket file. We can safely
             # ignore it and proceed.
@@ -97,27 +415,13 @@ def create_archive(root, files=None, fileobj=None, gzip=False,
             # and directories executable by default.
             i.mode = i.mode & 0o755 | 0o111
 
-        if i.isfile():
-            try:
-                with open(full_path, 'rb') as f:
-                    t.addfile(i, f)
-            except OSError as oe:
-                raise OSError(
-                    f'Can not read file in context: {full_path}'
-                ) from oe
-        else:
-            # Directories, FIFOs, symlinks... don't need to be read.
-            t.addfile(i, None)
+        yield i, full_path if i.isfile() else None
 
     for name, contents in extra_files:
         info = tarfile.TarInfo(name)
         contents_encoded = contents.encode('utf-8')
         info.size = len(contents_encoded)
-        t.addfile(info, io.BytesIO(contents_encoded))
-
-    t.close()
-    fileobj.seek(0)
-    return fileobj
+        yield info, contents_encoded
 
 
 def mkbuildcontext(dockerfile):
@@ -162,61 +466,102 @@ class PatternMatcher:
             lambda p: p.dirs, [Pattern(p) for p in patterns]
         ))
         self.patterns.append(Pattern('!.dockerignore'))
+        self._compile()
+
+    def _compile(self):
+        # The last matching pattern decides whether a path is excluded. As
+        # alternatives are tried in order, listing the patterns last to first
+        # makes the first successful alternative the one that takes
+        # precedence. Besides the whole path, a pattern also matches a
+        # parent directory with as many components as the pattern has, so
+        # those get one regex per component count.
+        indexed = list(enumerate(self.patterns))[::-1]
+        self._path_regex = _compile_alternation(indexed)
+        by_depth = {}
+        for index, pattern in indexed:
+            by_depth.setdefault(len(pattern.dirs), []).append(
+                (index, pattern)
+            )
+        self._parent_regexes = [
+            (depth, _compile_alternation(by_depth[depth]))
+            for depth in sorted(by_depth)
+        ]
+        # A directory that matches can't be skipped if an exclusion
+        # pattern (e.g. !dir/file) starts with it
+        self._exclusion_prefixes = {
+            pattern.cleaned_pattern[:i]
+            for pattern in self.patterns if pattern.exclusion
+            for i in range(len(pattern.cleaned_pattern) + 1)
+        }
 
     def matches(self, filepath):
-        matched = False
-        parent_path = os.path.dirname(filepath)
-        parent_path_dirs = split_path(parent_path)
-
-        for pattern in self.patterns:
-            negative = pattern.exclusion
-            match = pattern.match(filepath)
-            if not match and parent_path != '':
-                if len(pattern.dirs) <= len(parent_path_dirs):
-                    match = pattern.match(
-                        os.path.sep.join(parent_path_dirs[:len(pattern.dirs)])
-                    )
+        parent_path_dirs = split_path(os.path.dirname(filepath))
+        return self._matches(
+            normalize_slashes(filepath), _parent_prefixes(parent_path_dirs)
+        )
 
-            if match:
-                matched = not negative
+    def _matches(self, filepath, parent_prefixes):
+        """
+        ``parent_prefixes`` holds the lowercased paths of the parent
+        directories of ``filepath``, from the topmost one.
+        """
+        last = _last_match(self._path_regex, filepath.lower())
+        for depth, regex in self._parent_regexes:
+            if depth > len(parent_prefixes):
+                break
+            last = max(last, _last_match(regex, parent_prefixes[depth - 1]))
 
-        return matched
+        return last >= 0 and not self.patterns[last].exclusion
 
     def walk(self, root):
-        def rec_walk(current_dir):
-            for f in os.listdir(current_dir):
-                fpath = os.path.join(
-                    os.path.relpath(current_dir, root), f
-                )
-                if fpath.startswith(f".{os.path.sep}"):
-                    fpath = fpath[2:]
-                match = self.matches(fpath)
+        def rec_walk(current_dir, parent, parent_prefixes):
+            with os.scandir(current_dir) as it:
+                entries = list(it)
+            for entry in entries:
+                fpath = entry.name
+                if parent:
+                    fpath = os.path.join(parent, fpath)
+                normalized = normalize_slashes(fpath)
+                match = self._matches(normalized, parent_prefixes)
                 if not match:
                     yield fpath
 
-                cur = os.path.join(root, fpath)
-                if not os.path.isdir(cur) or os.path.islink(cur):
+                if not entry.is_dir(follow_symlinks=False):
                     continue
 
-                if match:
-                    # If we want to skip this file and it's a directory
-                    # then we should first check to see if there's an
-                    # excludes pattern (e.g. !dir/file) that starts with this
-                    # dir. If so then we can't skip this dir.
-                    skip = True
-
-                    for pat in self.patterns:
-                        if not pat.exclusion:
-                            continue
-                        if pat.cleaned_pattern.startswith(
-                                normalize_slashes(fpath)):
-                            skip = False
-                            break
-                    if skip:
-                        continue
-                yield from rec_walk(cur)
-
-        return rec_walk(root)
+                if match and normalized not in self._exclusion_prefixes:
+                    # We want to skip this directory, and no exclusion
+                    # pattern can match anything inside of it.
+                    continue
+
+                yield from rec_walk(
+                    entry.path, fpath,
+                    parent_prefixes + [normalized.lower()]
+                )
+
+        return rec_walk(root, '', [])
+
+
+def _compile_alternation(indexed_patterns):
+    return re.compile('|'.join(
+        f'(?P<p{index}>{translate(pattern.cleaned_pattern.lower())})'
+        for index, pattern in indexed_patterns
+    ))
+
+
+def _last_match(regex, path):
+    m = regex.match(path)
+    if m is None:
+        return -1
+    return int(m.lastgroup[1:])
+
+
+def _parent_prefixes(dirs):
+    prefixes = []
+    for d in dirs:
+        d = d.lower()
+        prefixes.append(f'{prefixes[-1]}/{d}' if prefixes else d)
+    return prefixes
 
 
 class Pattern:
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ..constants import DEFAULT_MAX_POOL_SIZE
+
+
+def pool_size(api_client):
+    """
+    Return the number of connections kept by each of the connection pools of
+    ``api_client``, i.e. the number of requests it can make concurrently
+    without opening connections that are discarded afterwards.
+    """
+    adapter = getattr(api_client, '_custom_adapter', None)
+    if adapter is None:
+        # Plain TCP and TLS connections go through requests' own adapters
+        adapter = api_client.get_adapter(api_client.base_url)
+    size = getattr(adapter, 'max_pool_size', None)
+    if not isinstance(size, int) or size < 1:
+        size = getattr(adapter, '_pool_maxsize', None)
+    if not isinstance(size, int) or size < 1:
+        return DEFAULT_MAX_POOL_SIZE
+    return size
+
+
+def grow_pool(api_client, n):
+    """
+    Keep ``n`` more connections in the connection pool of ``api_client``
+    while as many long-lived streams each hold one, so that the pool is not
+    filled up by them. A negative ``n`` shrinks it back. Does nothing if the
+    adapter of ``api_client`` can't grow its pool.
+    """
+    get_adapter = getattr(api_client, 'get_adapter', None)
+    if get_adapter is None or not n:
+        return
+    adapter = get_adapter(api_client.base_url)
+    if hasattr(adapter, 'grow_pool'):
+        adapter.grow_pool(
+            api_client.base_url, n, verify=api_client.verify,
+            cert=api_client.cert
+        )
+
+
+def map_concurrently(fn, items, max_workers):
+    """
+    Like ``map(fn, items)``, but calls ``fn`` from up to ``max_workers``
+    threads and returns the results as a list, in the order of ``items``.
+
+    If a call raises an exception, the calls that haven't started yet are
+    cancelled, and the exception of the first failing item is raised.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(fn, item) for item in items]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+class BulkResult(namedtuple('BulkResult', ['item', 'result', 'error'])):
+    """
+    The outcome of an operation on one of the items of a bulk call.
+
+    Attributes:
+        item: The item, e.g. the container, the operation was made on.
+        result: The return value of the operation, or ``None`` if it failed.
+        error (Exception): The exception raised by the operation, or
+            ``None`` if it succeeded.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class RateLimiter:
+    """
+    Spread calls to :py:meth:`wait` from any number of threads so that no
+    more than ``rate`` of them return per second.
+    """
+
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def map_results(fn, items, max_workers, rate_limit=None):
+    """
+    Like :py:func:`map_concurrently`, but every item is processed even if
+    some calls fail: a list of :py:class:`BulkResult` is returned, in the
+    order of ``items``, holding either the result or the exception of each
+    call.
+
+    If ``rate_limit`` is set, no more than that many calls start per second.
+    """
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def call(item):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            return BulkResult(item, fn(item), None)
+        except Exception as e:
+            return BulkResult(item, None, e)
+
+    return map_concurrently(call, items, max_workers)
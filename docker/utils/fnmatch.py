@@ -84,7 +84,7 @@ def translate(pat):
                     # is "**"
                     # Note that this allows for any # of /'s (even 0) because
                     # the .* will eat everything, even /'s
-                    res = f"{res}(.*/)?"
+                    res = f"{res}(?:.*/)?"
             else:
                 # is "*" so map it to anything but "/"
                 res = f"{res}[^/]*"
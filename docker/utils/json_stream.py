@@ -1,5 +1,6 @@
 import json
 import json.decoder
+import re
 
 from ..errors import StreamParseError
 
@@ -33,12 +34,193 @@ def json_splitter(buffer):
         return None
 
 
+class JSONStreamDecoder:
+    """Incremental decoder for a stream of concatenated JSON values.
+
+    Data is accumulated as bytes. Whenever a chunk completes one or more
+    lines, everything up to the last newline is decoded to text in one go and
+    parsed with an index cursor, so each value is decoded and copied once no
+    matter how many arrive per chunk. The value left incomplete, after the
+    last newline or spanning several lines, is scanned for its end instead,
+    resuming where the previous chunk left off, and is only parsed once it
+    is complete. :py:class:`~docker.errors.StreamParseError` is raised as
+    soon as a complete value is not valid JSON.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        # Scans the incomplete value at the start of the buffer
+        self._scanner = None
+
+    def decode(self, data):
+        """Feed ``data`` (bytes or text) to the decoder and return a list of
+        the values it completes.
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        buf = self._buffer
+        result = []
+        buf += data
+
+        while True:
+            if self._scanner is None:
+                end = buf.rfind(b'\n') + 1
+                if end:
+                    # A newline can't be part of a multi-byte character, so
+                    # the block decodes cleanly on its own.
+                    text = str(memoryview(buf)[:end], 'utf-8', 'replace')
+                    index = _decode_values(text, result)
+                    if index < len(text):
+                        # A value spans past the last newline
+                        buf[:end] = text[index:].encode('utf-8')
+                    else:
+                        del buf[:end]
+                start = _BYTES_WHITESPACE.match(buf).end()
+                if start == len(buf):
+                    buf.clear()
+                    return result
+                del buf[:start]
+                self._scanner = _ValueScanner()
+
+            end = self._scanner.scan(buf)
+            if end is None:
+                return result
+            self._scanner = None
+            result.append(_decode_value(buf[:end]))
+            del buf[:end]
+
+    def flush(self):
+        """Decode whatever remains at the end of the stream. Raises
+        :py:class:`~docker.errors.StreamParseError` if it is not valid JSON.
+        """
+        text = self._buffer.decode('utf-8', 'replace')
+        self._buffer = bytearray()
+        self._scanner = None
+        result = []
+        index = _decode_values(text, result)
+        if text[index:].strip():
+            try:
+                json_decoder.decode(text[index:])
+            except ValueError as e:
+                raise StreamParseError(e) from e
+        return result
+
+
+_BYTES_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# The bytes changing the nesting of a value outside of strings, and ending
+# a string or a scalar
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_STRING_END = re.compile(rb'["\\\x00-\x1f]')
+_SCALAR_END = re.compile(rb'[ \t\n\r"{}\[\],:]')
+
+
+class _ValueScanner:
+    """Finds the end of the JSON value at the start of a buffer that keeps
+    growing, without parsing it. Each call resumes from where the previous
+    one stopped, so the bytes of a value are scanned once whatever the
+    number of chunks it arrives in.
+    """
+
+    def __init__(self):
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._scalar = False
+
+    def scan(self, buf):
+        """Return the index just past the end of the value, or ``None`` if
+        it is incomplete. The value may be invalid JSON."""
+        pos = self._offset
+        if not pos:
+            first = buf[:1]
+            if first in (b'{', b'['):
+                self._depth = 1
+            elif first == b'"':
+                self._in_string = True
+            else:
+                self._scalar = True
+            pos = 1
+        if self._scalar:
+            match = _SCALAR_END.search(buf, pos)
+            if match is None:
+                self._offset = len(buf)
+                return None
+            return match.start()
+
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(buf, pos)
+                if match is None:
+                    self._offset = len(buf)
+                    return None
+                char = buf[match.start()]
+                if char == 0x5c:
+                    # Skip the escaped character once it has arrived
+                    if match.end() == len(buf):
+                        self._offset = match.start()
+                        return None
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                if char != 0x22:
+                    # A control character: the string can't be valid
+                    return pos
+                self._in_string = False
+                if not self._depth:
+                    return pos
+                continue
+
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                self._offset = len(buf)
+                return None
+            char = buf[match.start()]
+            pos = match.end()
+            if char == 0x22:
+                self._in_string = True
+            elif char in b'{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if not self._depth:
+                    return pos
+
+
+def _decode_value(data):
+    """Decode the single JSON value in ``data``, raising
+    :py:class:`~docker.errors.StreamParseError` if it is not valid."""
+    try:
+        return json_decoder.decode(data.decode('utf-8', 'replace'))
+    except ValueError as e:
+        raise StreamParseError(e) from e
+
+
+def _decode_values(text, result):
+    """Append the complete JSON values found in ``text`` to ``result``, and
+    return the index at which parsing stopped."""
+    match = json.decoder.WHITESPACE.match
+    raw_decode = json_decoder.raw_decode
+    index = match(text, 0).end()
+    length = len(text)
+    while index < length:
+        try:
+            obj, end = raw_decode(text, index)
+        except ValueError:
+            break
+        result.append(obj)
+        index = match(text, end).end()
+    return index
+
+
 def json_stream(stream):
-    """Given a stream of text, return a stream of json objects.
+    """Given a stream of bytes or text, return a stream of json objects.
     This handles streams which are inconsistently buffered (some entries may
     be newline delimited, and others are not).
     """
-    return split_buffer(stream, json_splitter, json_decoder.decode)
+    decoder = JSONStreamDecoder()
+    for data in stream:
+        yield from decoder.decode(data)
+    yield from decoder.flush()
 
 
 def line_splitter(buffer, separator='\n'):
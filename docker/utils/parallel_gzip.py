@@ -0,0 +1,172 @@
+import collections
+import io
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BLOCK_SIZE = 128 * 1024
+
+# Size of the deflate window, and of the dictionary each block is primed with
+_DICT_SIZE = 32 * 1024
+
+
+def _compress_block(data, zdict, level, last):
+    if zdict:
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # A sync flush ends the block on a byte boundary without marking the end
+    # of the stream, so compressed blocks can simply be concatenated.
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelGzipWriter:
+    """
+    A write-only file object compressing data to ``fileobj`` in the gzip
+    format, using multiple threads.
+
+    Like ``pigz``, the input is split into blocks that are deflated
+    concurrently, each primed with the last 32KiB of the previous block so
+    that the compression ratio is close to that of a single stream. The
+    compressed blocks are written in order and form a single, standard gzip
+    member. ``zlib`` releases the GIL while compressing, so this scales with
+    the number of cores.
+
+    ``fileobj`` is not closed by :py:meth:`close`.
+
+    Args:
+        fileobj: A writable file-like object.
+        compresslevel (int): The compression level, from 0 to 9.
+            Default: 9
+        workers (int): The number of compression threads. Default: the
+            number of CPUs.
+        block_size (int): The size of the blocks compressed concurrently,
+            in bytes.
+    """
+
+    def __init__(self, fileobj, compresslevel=9, workers=None,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        self.fileobj = fileobj
+        self.compresslevel = compresslevel
+        self.block_size = block_size
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='docker-gzip'
+        )
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+        self._zdict = b''
+        self._crc = 0
+        self._size = 0
+        self.closed = False
+        self.fileobj.write(
+            b'\x1f\x8b\x08\x00' + struct.pack('<L', int(time.time())) +
+            (b'\x02' if compresslevel == 9 else b'\x00') + b'\xff'
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._size
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError('write to closed file')
+        self._buffer += data
+        length = len(memoryview(data))
+        self._size += length
+        if len(self._buffer) >= self.block_size:
+            buf = self._buffer
+            end = len(buf) - len(buf) % self.block_size
+            for start in range(0, end, self.block_size):
+                self._submit(bytes(buf[start:start + self.block_size]))
+            del buf[:end]
+        return length
+
+    def _submit(self, block, last=False):
+        self._crc = zlib.crc32(block, self._crc)
+        self._pending.append(self._executor.submit(
+            _compress_block, block, self._zdict, self.compresslevel, last
+        ))
+        self._zdict = block[-_DICT_SIZE:]
+        # Bound memory use by waiting for the oldest blocks
+        while self._pending and (
+                len(self._pending) > 2 * self.workers or
+                self._pending[0].done()):
+            self.fileobj.write(self._pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer = bytearray()
+            while self._pending:
+                self.fileobj.write(self._pending.popleft().result())
+            self.fileobj.write(
+                struct.pack('<LL', self._crc, self._size & 0xffffffff)
+            )
+        finally:
+            self._executor.shutdown()
+            self.closed = True
+
+    def abort(self):
+        """
+        Stop the compression threads without writing the rest of the
+        stream, e.g. when the data to compress couldn't be read. Does
+        nothing once closed.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown()
+
+
+class ParallelGzipCompressor:
+    """
+    A compressor with the interface of :py:func:`zlib.compressobj`, producing
+    a gzip stream with a :py:class:`ParallelGzipWriter`.
+    """
+
+    def __init__(self, compresslevel=9, workers=None,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        self._output = io.BytesIO()
+        self._writer = ParallelGzipWriter(
+            self._output, compresslevel, workers, block_size
+        )
+
+    def _drain(self):
+        data = self._output.getvalue()
+        self._output.seek(0)
+        self._output.truncate()
+        return data
+
+    def compress(self, data):
+        self._writer.write(data)
+        return self._drain()
+
+    def flush(self):
+        self._writer.close()
+        return self._drain()
+
+    def close(self):
+        """
+        Stop the compression threads if :py:meth:`flush` wasn't called.
+        """
+        self._writer.abort()
@@ -1,8 +1,13 @@
 import errno
+import io
 import os
 import select
 import socket as pysocket
 import struct
+import tempfile
+import weakref
+
+from ..constants import STREAM_HEADER_SIZE_BYTES
 
 try:
     from ..transport import NpipeSocket
@@ -13,6 +18,10 @@ except ImportError:
 STDOUT = 1
 STDERR = 2
 
+# The pollers of the sockets read from, so that each socket is only
+# registered once however many reads are made
+_pollers = weakref.WeakKeyDictionary()
+
 
 class SocketError(Exception):
     pass
@@ -22,22 +31,24 @@ class SocketError(Exception):
 # pywintypes.error: (109, 'ReadFile', 'The pipe has been ended.')
 NPIPE_ENDED = 109
 
+RECOVERABLE_ERRORS = (errno.EINTR, errno.EDEADLK, errno.EWOULDBLOCK)
+
+# Docker writes frames of at most 32KiB, so a frame payload is usually
+# received with a single call.
+FRAME_BUFFER_SIZE = 64 * 1024
+
+
+def _is_pipe_ended(socket, e):
+    return (isinstance(socket, NpipeSocket) and
+            len(e.args) > 0 and
+            e.args[0] == NPIPE_ENDED)
+
 
 def read(socket, n=4096):
     """
     Reads at most n bytes from socket
     """
-
-    recoverable_errors = (errno.EINTR, errno.EDEADLK, errno.EWOULDBLOCK)
-
-    if not isinstance(socket, NpipeSocket):
-        if not hasattr(select, "poll"):
-            # Limited to 1024
-            select.select([socket], [], [])
-        else:
-            poll = select.poll()
-            poll.register(socket, select.POLLIN | select.POLLPRI)
-            poll.poll()
+    _wait_for_input(socket)()
 
     try:
         if hasattr(socket, 'recv'):
@@ -46,31 +57,187 @@ def read(socket, n=4096):
             return socket.read(n)
         return os.read(socket.fileno(), n)
     except OSError as e:
-        if e.errno not in recoverable_errors:
+        if e.errno not in RECOVERABLE_ERRORS:
             raise
     except Exception as e:
-        is_pipe_ended = (isinstance(socket, NpipeSocket) and
-                         len(e.args) > 0 and
-                         e.args[0] == NPIPE_ENDED)
-        if is_pipe_ended:
+        if _is_pipe_ended(socket, e):
             # npipes don't support duplex sockets, so we interpret
             # a PIPE_ENDED error as a close operation (0-length read).
             return ''
         raise
 
 
+def _wait_for_input(socket):
+    """
+    Returns a callable that blocks until socket is readable, registering the
+    socket with a poller that is reused for every call, and by the later
+    calls for the same socket.
+    """
+    if isinstance(socket, NpipeSocket):
+        # NpipeSockets block in ReadFile instead
+        return lambda: None
+
+    if not hasattr(select, "poll"):
+        # Limited to 1024
+        return lambda: select.select([socket], [], [])
+
+    try:
+        poll = _pollers.get(socket)
+    except TypeError:
+        # Not weakly referenceable
+        poll = None
+    if poll is None:
+        poll = select.poll()
+        poll.register(socket, select.POLLIN | select.POLLPRI)
+        try:
+            _pollers[socket] = poll
+        except TypeError:
+            pass
+    pending = getattr(socket, 'pending', None)
+    if pending is None:
+        return poll.poll
+
+    def wait():
+        # SSL sockets may hold decrypted data that poll() can't see
+        if not pending():
+            poll.poll()
+    return wait
+
+
+def _recv_into_function(socket):
+    """
+    Returns a callable receiving at most ``len(view)`` bytes from socket into
+    view and returning the number of bytes received.
+    """
+    if hasattr(socket, 'recv_into'):
+        return socket.recv_into
+    if isinstance(socket, pysocket.SocketIO):
+        return socket.readinto
+    if hasattr(socket, 'recv'):
+        # e.g. paramiko channels
+        def recv_into(view):
+            data = socket.recv(len(view))
+            view[:len(data)] = data
+            return len(data)
+        return recv_into
+    fileno = socket.fileno()
+    return lambda view: os.readv(fileno, [view])
+
+
+class FrameReader:
+    """
+    Reads multiplexed frames from a socket into a preallocated buffer.
+
+    A single poller is registered for the lifetime of the reader, and data is
+    received with ``recv_into`` where the socket supports it, so no memory is
+    allocated per read. Frames are yielded as :py:class:`memoryview` objects
+    over the reader's buffer, which are only valid until the next frame is
+    read; pass ``as_bytes=True`` to get copies instead.
+
+    Args:
+        socket: The socket to read from.
+        buffer_size (int): The size of the read buffer. Larger frames are
+            yielded in pieces of at most this size.
+    """
+
+    def __init__(self, socket, buffer_size=FRAME_BUFFER_SIZE):
+        self.socket = socket
+        self._wait = _wait_for_input(socket)
+        self._recv_into = _recv_into_function(socket)
+        self._view = memoryview(bytearray(buffer_size))
+        self._header = memoryview(bytearray(STREAM_HEADER_SIZE_BYTES))
+
+    def readinto(self, view):
+        """
+        Reads at most ``len(view)`` bytes into view. Returns the number of
+        bytes read, 0 on EOF, or ``None`` if the read was interrupted.
+        """
+        self._wait()
+        try:
+            return self._recv_into(view)
+        except OSError as e:
+            if e.errno not in RECOVERABLE_ERRORS:
+                raise
+        except Exception as e:
+            if _is_pipe_ended(self.socket, e):
+                # npipes don't support duplex sockets, so we interpret
+                # a PIPE_ENDED error as a close operation (0-length read).
+                return 0
+            raise
+
+    def read_exactly_into(self, view):
+        """
+        Fills view with data from the socket.
+        Raises SocketError if there isn't enough data
+        """
+        received = 0
+        size = len(view)
+        while received < size:
+            count = self.readinto(view[received:])
+            if count is None:
+                continue
+            if count == 0:
+                raise SocketError("Unexpected EOF")
+            received += count
+
+    def next_frame_header(self):
+        """
+        Returns the stream and size of the next frame, or ``(-1, -1)`` if the
+        socket was closed. See :py:func:`next_frame_header`.
+        """
+        try:
+            self.read_exactly_into(self._header)
+        except SocketError:
+            return (-1, -1)
+        return struct.unpack('>BxxxL', self._header)
+
+    def frames(self, as_bytes=False):
+        """
+        Returns a generator of ``(stream, data)`` tuples read from the socket
+        when the tty setting is not enabled.
+        """
+        view = self._view
+        size = len(view)
+        while True:
+            (stream, n) = self.next_frame_header()
+            if n < 0:
+                break
+            while n > 0:
+                count = self.readinto(view[:min(n, size)])
+                if count is None:
+                    continue
+                if count == 0:
+                    # We have reached EOF
+                    return
+                n -= count
+                data = view[:count]
+                yield (stream, bytes(data) if as_bytes else data)
+
+    def chunks(self, as_bytes=False):
+        """
+        Returns a generator of data read from the socket when the tty setting
+        is enabled.
+        """
+        view = self._view
+        while True:
+            count = self.readinto(view)
+            if count is None:
+                continue
+            if count == 0:
+                # We have reached EOF
+                return
+            data = view[:count]
+            yield bytes(data) if as_bytes else data
+
+
 def read_exactly(socket, n):
     """
     Reads exactly n bytes from socket
     Raises SocketError if there isn't enough data
     """
-    data = bytes()
-    while len(data) < n:
-        next_data = read(socket, n - len(data))
-        if not next_data:
-            raise SocketError("Unexpected EOF")
-        data += next_data
-    return data
+    data = bytearray(n)
+    FrameReader(socket, buffer_size=0).read_exactly_into(memoryview(data))
+    return bytes(data)
 
 
 def next_frame_header(socket):
@@ -80,27 +247,27 @@ def next_frame_header(socket):
 
     https://docs.docker.com/engine/api/v1.24/#attach-to-a-container
     """
-    try:
-        data = read_exactly(socket, 8)
-    except SocketError:
-        return (-1, -1)
-
-    stream, actual = struct.unpack('>BxxxL', data)
-    return (stream, actual)
+    return FrameReader(socket, buffer_size=0).next_frame_header()
 
 
-def frames_iter(socket, tty):
+def frames_iter(socket, tty, as_bytes=True):
     """
     Return a generator of frames read from socket. A frame is a tuple where
     the first item is the stream number and the second item is a chunk of data.
 
     If the tty setting is enabled, the streams are multiplexed into the stdout
     stream.
+
+    If ``as_bytes`` is False, chunks are memoryviews over a shared buffer, which
+    are only valid until the next frame is read.
     """
+    reader = FrameReader(socket)
     if tty:
-        return ((STDOUT, frame) for frame in frames_iter_tty(socket))
+        return (
+            (STDOUT, frame) for frame in reader.chunks(as_bytes=as_bytes)
+        )
     else:
-        return frames_iter_no_tty(socket)
+        return reader.frames(as_bytes=as_bytes)
 
 
 def frames_iter_no_tty(socket):
@@ -108,20 +275,7 @@ def frames_iter_no_tty(socket):
     Returns a generator of data read from the socket when the tty setting is
     not enabled.
     """
-    while True:
-        (stream, n) = next_frame_header(socket)
-        if n < 0:
-            break
-        while n > 0:
-            result = read(socket, n)
-            if result is None:
-                continue
-            data_length = len(result)
-            if data_length == 0:
-                # We have reached EOF
-                return
-            n -= data_length
-            yield (stream, result)
+    return FrameReader(socket).frames(as_bytes=True)
 
 
 def frames_iter_tty(socket):
@@ -129,18 +283,16 @@ def frames_iter_tty(socket):
     Return a generator of data read from the socket when the tty setting is
     enabled.
     """
-    while True:
-        result = read(socket)
-        if len(result) == 0:
-            # We have reached EOF
-            return
-        yield result
+    return FrameReader(socket).chunks(as_bytes=True)
 
 
-def consume_socket_output(frames, demux=False):
+def consume_socket_output(frames, demux=False, spool_threshold=None):
     """
     Iterate through frames read from the socket and return the result.
 
+    Frames are written to a buffer as they arrive, so they may be memoryviews
+    that are only valid until the next frame is read.
+
     Args:
 
         demux (bool):
@@ -148,11 +300,19 @@ def consume_socket_output(frames, demux=False):
             concatenation of all the frames. If True, the streams are
             demultiplexed, and the result is a 2-tuple where each item is the
             concatenation of frames belonging to the same stream.
+        spool_threshold (int):
+            If set, the output is accumulated in
+            :py:class:`tempfile.SpooledTemporaryFile` objects which are written
+            to disk once they exceed this many bytes, and those file objects,
+            rewound to the start, are returned instead of bytes.
     """
     if demux is False:
         # If the streams are multiplexed, the generator returns strings, that
         # we just need to concatenate.
-        return bytes().join(frames)
+        buf = _output_buffer(spool_threshold)
+        for frame in frames:
+            buf.write(frame)
+        return _output_result(buf, spool_threshold)
 
     # If the streams are demultiplexed, the generator yields tuples
     # (stdout, stderr)
@@ -161,17 +321,27 @@ def consume_socket_output(frames, demux=False):
         # It is guaranteed that for each frame, one and only one stream
         # is not None.
         assert frame != (None, None)
-        if frame[0] is not None:
-            if out[0] is None:
-                out[0] = frame[0]
-            else:
-                out[0] += frame[0]
-        else:
-            if out[1] is None:
-                out[1] = frame[1]
-            else:
-                out[1] += frame[1]
-    return tuple(out)
+        i = 0 if frame[0] is not None else 1
+        if out[i] is None:
+            out[i] = _output_buffer(spool_threshold)
+        out[i].write(frame[i])
+    return tuple(
+        None if buf is None else _output_result(buf, spool_threshold)
+        for buf in out
+    )
+
+
+def _output_buffer(spool_threshold):
+    if spool_threshold is None:
+        return io.BytesIO()
+    return tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+
+
+def _output_result(buf, spool_threshold):
+    if spool_threshold is None:
+        return buf.getvalue()
+    buf.seek(0)
+    return buf
 
 
 def demux_adaptor(stream_id, data):
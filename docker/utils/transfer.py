@@ -0,0 +1,217 @@
+import os
+import tarfile
+import time
+from collections import namedtuple
+
+from ..constants import IS_WINDOWS_PLATFORM
+
+
+class TransferStats(namedtuple('TransferStats', ['bytes', 'seconds'])):
+    """
+    The amount of data transferred to or from the server, and the time it
+    took.
+
+    Attributes:
+        bytes (int): The number of bytes transferred.
+        seconds (float): The time elapsed since the transfer started.
+    """
+
+    @property
+    def rate(self):
+        """
+        The average number of bytes transferred per second.
+        """
+        if not self.seconds:
+            return 0.0
+        return self.bytes / self.seconds
+
+
+def write_atomic(chunks, path, fsync=True, progress=None):
+    """
+    Write a stream of chunks to ``path`` without holding more than a chunk
+    in memory.
+
+    The data is written to ``<path>.part`` first, which is renamed to
+    ``path`` once complete, so ``path`` never holds a partial file. If the
+    stream fails, the partial file is removed and the previous content of
+    ``path``, if any, is left untouched.
+
+    Args:
+        chunks (iterable): The data to write, as bytes.
+        path (str): The path of the file to write.
+        fsync (bool): Flush the file and its directory to disk before
+            returning.
+        progress (callable): Called with a :py:class:`TransferStats` after
+            each chunk.
+
+    Returns:
+        (:py:class:`TransferStats`): The number of bytes written.
+    """
+    path = os.fspath(path)
+    part = f'{path}.part'
+    start = time.monotonic()
+    written = 0
+    try:
+        with open(part, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+                if progress is not None:
+                    progress(
+                        TransferStats(written, time.monotonic() - start)
+                    )
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(part, path)
+    except BaseException:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        fsync_dir(os.path.dirname(os.path.abspath(path)))
+    return TransferStats(written, time.monotonic() - start)
+
+
+def fsync_dir(path):
+    """
+    Flush the entries of a directory, e.g. a rename, to disk. Does nothing
+    on Windows, where directories can't be opened.
+    """
+    if IS_WINDOWS_PLATFORM:
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FileReader:
+    """
+    A file opened for reading that can be passed as the body of a request,
+    and reports how much of it was sent.
+
+    The file is sent in blocks as the connection consumes them, rather than
+    read into memory first. It is opened when entering the reader as a
+    context manager, and closed on exit.
+
+    Args:
+        path (str): The path of the file.
+        progress (callable): Called with a :py:class:`TransferStats` after
+            each block.
+    """
+
+    def __init__(self, path, progress=None):
+        self._path = path
+        self._file = None
+        self._size = os.stat(path).st_size
+        self._progress = progress
+        self._start = None
+        self.sent = 0
+
+    def __len__(self):
+        # The Content-Length of the request
+        return self._size
+
+    def __enter__(self):
+        self._file = open(self._path, 'rb')
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self, size=-1):
+        if self._start is None:
+            self._start = time.monotonic()
+        data = self._file.read(size)
+        self.sent += len(data)
+        if data and self._progress is not None:
+            self._progress(self.stats)
+        return data
+
+    @property
+    def stats(self):
+        """
+        A :py:class:`TransferStats` of the data sent so far.
+        """
+        if self._start is None:
+            return TransferStats(0, 0.0)
+        return TransferStats(self.sent, time.monotonic() - self._start)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class ChunkReader:
+    """
+    A read-only file object over an iterable of bytes, such as a stream of
+    archive data received from the server.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._view = memoryview(b'')
+        self._pos = 0
+
+    def read(self, size=-1):
+        while self._pos >= len(self._view):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b''
+            self._view = memoryview(chunk)
+            self._pos = 0
+        end = len(self._view)
+        if 0 <= size < end - self._pos:
+            end = self._pos + size
+        data = bytes(self._view[self._pos:end])
+        self._pos = end
+        return data
+
+
+def extract_archive(chunks, path):
+    """
+    Extract a tar archive, possibly compressed, into the directory ``path``
+    while it is being received, without staging it in memory or on disk.
+
+    As with ``docker cp``, members are extracted with their permissions,
+    but the ones that would end up outside of ``path`` are refused.
+
+    Args:
+        chunks (iterable): The archive data.
+        path (str): The directory to extract the archive to. It is created
+            if it doesn't exist.
+
+    Raises:
+        :py:class:`tarfile.TarError`
+            If the archive is invalid or a member is refused.
+    """
+    os.makedirs(path, exist_ok=True)
+    with tarfile.open(mode='r|*', fileobj=ChunkReader(chunks)) as t:
+        if hasattr(tarfile, 'tar_filter'):
+            t.extractall(path, filter='tar')
+        else:
+            t.extractall(path, members=_checked_members(t, path))
+
+
+def _checked_members(t, path):
+    # For Python versions without extraction filters, like the ``tar``
+    # filter: leading slashes are stripped, and members that would be
+    # written outside of ``path``, e.g. through ``..`` or a symbolic link
+    # extracted earlier, are refused.
+    root = os.path.realpath(path)
+    for member in t:
+        member.name = member.name.lstrip('/' + os.sep)
+        targets = [member.name]
+        if member.islnk():
+            targets.append(member.linkname)
+        for name in targets:
+            target = os.path.realpath(os.path.join(root, name))
+            if os.path.commonpath([root, target]) != root:
+                raise tarfile.ExtractError(
+                    f'{name!r} would be extracted outside of {path!r}'
+                )
+        yield member
@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+import tempfile
+import time
+import urllib.parse
+
+from .config import home_dir
+
+log = logging.getLogger(__name__)
+
+
+def default_version_cache_path():
+    cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        home_dir(), '.cache'
+    )
+    return os.path.join(cache_dir, 'docker-py', 'api-versions.json')
+
+
+class VersionCache:
+    """
+    A persistent cache of the API versions negotiated with servers, stored
+    as JSON in the file at ``path``, so that clients created with
+    ``version='auto'`` don't have to ask the server for it every time.
+
+    Entries are keyed on the URL of the server. For servers listening on a
+    unix socket, the identity of the socket file is recorded too, so that
+    a restarted (possibly upgraded) daemon, which creates a new socket, is
+    asked again. Entries expire after ``ttl`` seconds.
+
+    The file is shared by all the processes using it. Errors reading or
+    writing it are ignored: the version is then retrieved from the server.
+
+    Example:
+
+        >>> cache = VersionCache(ttl=600)
+        >>> client = docker.APIClient(version='auto', version_cache=cache)
+
+    Args:
+        path (str): The path of the cache file. Default:
+            ``$XDG_CACHE_HOME/docker-py/api-versions.json``, or
+            ``~/.cache/docker-py/api-versions.json``
+        ttl (float): The number of seconds entries are valid for.
+            Default: one hour
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, ttl=3600):
+        self.path = path or default_version_cache_path()
+        self.ttl = ttl
+
+    def get(self, base_url):
+        """
+        Return the API version cached for the server at ``base_url``, or
+        ``None`` if there is no valid entry for it.
+        """
+        entry = self._load().get(base_url)
+        if not isinstance(entry, dict):
+            return None
+        if entry.get('identity') != _server_identity(base_url):
+            return None
+        if not 0 <= time.time() - entry.get('time', 0) < self.ttl:
+            return None
+        return entry.get('version')
+
+    def put(self, base_url, version):
+        """
+        Record the API version of the server at ``base_url``.
+        """
+        now = time.time()
+        entries = {
+            url: entry for url, entry in self._load().items()
+            if isinstance(entry, dict) and
+            0 <= now - entry.get('time', 0) < self.ttl
+        }
+        entries[base_url] = {
+            'version': version,
+            'identity': _server_identity(base_url),
+            'time': now,
+        }
+        try:
+            dirname = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(dirname, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=dirname)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(
+                        {'version': self.VERSION, 'entries': entries}, f
+                    )
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            log.debug(f'Could not write the version cache: {e}')
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.VERSION:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+
+
+def _server_identity(base_url):
+    # The socket file of a daemon is created anew when it starts
+    if not base_url.startswith('http+unix://'):
+        return None
+    path = urllib.parse.urlparse(base_url).path
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_dev, st.st_ino, st.st_mtime_ns]
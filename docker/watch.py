@@ -0,0 +1,504 @@
+import collections
+import functools
+import logging
+import threading
+
+from .errors import DockerException, NotFound
+from .utils.concurrency import map_concurrently, pool_size
+
+log = logging.getLogger(__name__)
+
+ADDED = 'added'
+UPDATED = 'updated'
+REMOVED = 'removed'
+
+KINDS = ('container', 'image', 'network', 'volume')
+
+# Container actions that don't change what inspecting the container returns
+_IGNORED_ACTIONS = {
+    'container': frozenset([
+        'attach', 'detach', 'commit', 'copy', 'archive-path',
+        'extract-to-dir', 'export', 'exec_create', 'exec_start', 'exec_die',
+        'exec_detach', 'resize', 'top',
+    ]),
+    'volume': frozenset(['mount', 'unmount']),
+}
+
+_REMOVE_ACTIONS = frozenset(['destroy', 'delete', 'remove'])
+
+
+class Change(collections.namedtuple(
+        'Change', ['action', 'kind', 'id', 'old', 'new'])):
+    """
+    A change to an object in an :py:class:`Informer`'s stores, as passed to
+    change handlers.
+
+    Attributes:
+        action (str): One of ``added``, ``updated`` or ``removed``.
+        kind (str): The type of object, e.g. ``container``.
+        id (str): The ID of the object.
+        old (dict): The previous representation of the object, or ``None``
+            if it was added.
+        new (dict): The new representation of the object, or ``None`` if it
+            was removed.
+    """
+
+
+def _container_names(attrs):
+    name = attrs.get('Name')
+    return [name.lstrip('/')] if name else []
+
+
+def _image_names(attrs):
+    return attrs.get('RepoTags') or []
+
+
+def _object_names(attrs):
+    name = attrs.get('Name')
+    return [name] if name else []
+
+
+def _config_labels(attrs):
+    return (attrs.get('Config') or {}).get('Labels') or {}
+
+
+def _object_labels(attrs):
+    return attrs.get('Labels') or {}
+
+
+def _volume_list(api):
+    # Listed volumes are identical to inspected ones
+    return api.volumes().get('Volumes') or []
+
+
+# For each type of object: a function listing them, returning either their
+# IDs or their full representation, a function inspecting one of them, the
+# key of their ID, and functions returning their names and labels.
+_Kind = collections.namedtuple(
+    '_Kind', ['list', 'inspect', 'id_key', 'names', 'labels']
+)
+
+_KINDS = {
+    'container': _Kind(
+        lambda api: [c['Id'] for c in api.containers(all=True, quiet=True)],
+        lambda api, id: api.inspect_container(id),
+        'Id', _container_names, _config_labels,
+    ),
+    'image': _Kind(
+        lambda api: [i['Id'] for i in api.images()],
+        lambda api, id: api.inspect_image(id),
+        'Id', _image_names, _config_labels,
+    ),
+    'network': _Kind(
+        lambda api: [n['Id'] for n in api.networks()],
+        lambda api, id: api.inspect_network(id),
+        'Id', _object_names, _object_labels,
+    ),
+    'volume': _Kind(
+        _volume_list,
+        lambda api, id: api.inspect_volume(id),
+        'Name', _object_names, _object_labels,
+    ),
+}
+
+
+class Store:
+    """
+    An in-memory collection of objects of one type, indexed by ID, name and
+    label. Stores are filled and kept up to date by an :py:class:`Informer`,
+    and are safe to read from any thread.
+
+    The returned objects are the dictionaries returned by the inspect
+    endpoints, shared with the store: they must not be modified.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._spec = _KINDS[kind]
+        self._lock = threading.RLock()
+        self._objects = {}
+        self._names = {}
+        # label key -> label value -> set of IDs
+        self._labels = collections.defaultdict(
+            lambda: collections.defaultdict(set)
+        )
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key):
+        """
+        Get an object by ID, name or ID prefix.
+
+        Args:
+            key (str): The full ID, name, or a unique prefix of the ID of the
+                object.
+
+        Returns:
+            (dict): The object, or ``None`` if there is no such object.
+        """
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is None:
+                obj = self._names.get(key)
+            if obj is None and key:
+                if self.kind == 'image' and ':' not in key:
+                    obj = self._names.get(f'{key}:latest')
+                if obj is None:
+                    prefixes = (key, f'sha256:{key}')
+                    matches = [
+                        o for id, o in self._objects.items()
+                        if id.startswith(prefixes)
+                    ]
+                    if len(matches) == 1:
+                        obj = matches[0]
+            return obj
+
+    def list(self, name=None, label=None):
+        """
+        List objects, optionally filtered.
+
+        Args:
+            name (str): Only return the object with this name.
+            label (str or list): Only return objects with these labels,
+                given either as ``key`` or ``key=value``.
+
+        Returns:
+            (list of dict): The objects.
+        """
+        with self._lock:
+            if name is not None:
+                obj = self._names.get(name)
+                objects = [obj] if obj is not None else []
+            else:
+                objects = list(self._objects.values())
+            if not label:
+                return objects
+            if isinstance(label, str):
+                label = [label]
+            ids = None
+            for item in label:
+                key, sep, value = item.partition('=')
+                values = self._labels.get(key, {})
+                matched = values.get(value, set()) if sep else set().union(
+                    *values.values()
+                )
+                ids = matched if ids is None else ids & matched
+            return [
+                o for o in objects if o[self._spec.id_key] in ids
+            ]
+
+    def _put(self, attrs):
+        """
+        Add or replace an object, and return the previous version.
+        """
+        with self._lock:
+            old = self._remove(attrs[self._spec.id_key])
+            obj_id = attrs[self._spec.id_key]
+            self._objects[obj_id] = attrs
+            for name in self._spec.names(attrs):
+                self._names[name] = attrs
+            for key, value in self._spec.labels(attrs).items():
+                self._labels[key][value].add(obj_id)
+            return old
+
+    def _remove(self, obj_id):
+        """
+        Remove an object, and return it, or ``None`` if it wasn't there.
+        """
+        with self._lock:
+            old = self._objects.pop(obj_id, None)
+            if old is None:
+                return None
+            for name in self._spec.names(old):
+                if self._names.get(name) is old:
+                    del self._names[name]
+            for key, value in self._spec.labels(old).items():
+                ids = self._labels[key][value]
+                ids.discard(obj_id)
+                if not ids:
+                    del self._labels[key][value]
+                    if not self._labels[key]:
+                        del self._labels[key]
+            return old
+
+    def _ids(self):
+        with self._lock:
+            return set(self._objects)
+
+
+class Informer:
+    """
+    Keeps an in-memory view of the containers, images, networks and volumes
+    on the server, so that they can be read without making any request.
+
+    The stores are seeded by listing and inspecting every object once, then
+    kept up to date by a background thread consuming the events stream,
+    which only inspects again the objects that an event is about. When the
+    events stream is interrupted, it is reopened from the time of the last
+    event processed, so that no event is missed.
+
+    Example:
+
+        >>> informer = docker.watch.Informer(client)
+        >>> informer.add_handler(print, kinds=['container'])
+        >>> informer.start()
+        >>> informer.containers.list(label='com.example.app=web')
+        >>> informer.stop()
+
+    Args:
+        client (:py:class:`~docker.APIClient`): The client to use. A
+            :py:class:`~docker.DockerClient` is accepted too.
+        kinds (list of str): The types of objects to watch, among
+            ``container``, ``image``, ``network`` and ``volume``. Default:
+            all of them.
+        max_workers (int): The number of objects inspected concurrently when
+            seeding the stores. Default: the size of the client's connection
+            pool.
+        reconnect_delay (float): The time to wait before reopening an
+            interrupted events stream, in seconds.
+    """
+
+    def __init__(self, client, kinds=None, max_workers=None,
+                 reconnect_delay=1.0):
+        self.api = getattr(client, 'api', client)
+        kinds = list(kinds or KINDS)
+        for kind in kinds:
+            if kind not in _KINDS:
+                raise DockerException(f'Unknown object type: {kind}')
+        self.stores = {kind: Store(kind) for kind in kinds}
+        self.max_workers = max_workers
+        self.reconnect_delay = reconnect_delay
+        self._handlers = []
+        self._since = None
+        self._stream = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def containers(self):
+        """The :py:class:`Store` of containers."""
+        return self.stores.get('container')
+
+    @property
+    def images(self):
+        """The :py:class:`Store` of images."""
+        return self.stores.get('image')
+
+    @property
+    def networks(self):
+        """The :py:class:`Store` of networks."""
+        return self.stores.get('network')
+
+    @property
+    def volumes(self):
+        """The :py:class:`Store` of volumes."""
+        return self.stores.get('volume')
+
+    def add_handler(self, handler, kinds=None):
+        """
+        Register a function called with a :py:class:`Change` every time an
+        object is added, updated or removed. Handlers are called from the
+        informer's thread, after the stores have been updated.
+
+        Args:
+            handler (callable): The function to call.
+            kinds (list of str): Only call the handler for these types of
+                objects. Default: all of them.
+        """
+        self._handlers.append((handler, frozenset(kinds) if kinds else None))
+
+    def remove_handler(self, handler):
+        """
+        Unregister a function added with :py:meth:`add_handler`.
+        """
+        self._handlers = [h for h in self._handlers if h[0] != handler]
+
+    def start(self):
+        """
+        Seed the stores and start following events in a background thread.
+        Returns once the stores are filled.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        if self._thread is not None:
+            raise DockerException('The informer is already started')
+        self._stopped.clear()
+        # Subscribe first, so that changes made while listing aren't missed
+        self._stream = self._subscribe()
+        try:
+            self.resync()
+        except BaseException:
+            self._close_stream()
+            raise
+        self._thread = threading.Thread(
+            target=self._run, name='docker-informer', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop following events. The stores keep their contents.
+
+        Args:
+            timeout (float): The time to wait for the background thread to
+                exit, in seconds. Default: no limit.
+        """
+        self._stopped.set()
+        self._close_stream()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def resync(self):
+        """
+        List and inspect all watched objects again, replacing the contents
+        of the stores. Change handlers are called for the differences.
+
+        Raises:
+            :py:class:`docker.errors.APIError`
+                If the server returns an error.
+        """
+        workers = self.max_workers or pool_size(self.api)
+        for kind, store in self.stores.items():
+            spec = _KINDS[kind]
+            listed = spec.list(self.api)
+            ids = [item for item in listed if isinstance(item, str)]
+            objects = [item for item in listed if not isinstance(item, str)]
+            objects += [
+                attrs for attrs in map_concurrently(
+                    functools.partial(self._inspect, kind), ids, workers
+                ) if attrs is not None
+            ]
+            seen = set()
+            for attrs in objects:
+                seen.add(attrs[spec.id_key])
+                obj_id = attrs[spec.id_key]
+                self._notify(kind, obj_id, store._put(attrs), attrs)
+            for obj_id in store._ids() - seen:
+                self._notify(kind, obj_id, store._remove(obj_id), None)
+
+    def _inspect(self, kind, obj_id):
+        try:
+            return _KINDS[kind].inspect(self.api, obj_id)
+        except NotFound:
+            return None
+
+    def _refresh(self, kind, key):
+        store = self.stores[kind]
+        attrs = self._inspect(kind, key)
+        if attrs is not None:
+            obj_id = attrs[_KINDS[kind].id_key]
+            self._notify(kind, obj_id, store._put(attrs), attrs)
+        else:
+            self._forget(kind, key)
+
+    def _forget(self, kind, key):
+        store = self.stores[kind]
+        obj = store.get(key)
+        if obj is not None:
+            obj_id = obj[_KINDS[kind].id_key]
+            self._notify(kind, obj_id, store._remove(obj_id), None)
+
+    def _notify(self, kind, obj_id, old, new):
+        if old == new:
+            return
+        if old is None:
+            change = Change(ADDED, kind, obj_id, None, new)
+        elif new is None:
+            change = Change(REMOVED, kind, obj_id, old, None)
+        else:
+            change = Change(UPDATED, kind, obj_id, old, new)
+        for handler, kinds in self._handlers:
+            if kinds is not None and kind not in kinds:
+                continue
+            try:
+                handler(change)
+            except Exception:
+                log.exception('Error in informer change handler')
+
+    def _handle_event(self, event):
+        kind = event.get('Type')
+        if kind in self.stores:
+            action = event.get('Action', '').split(':', 1)[0]
+            actor = event.get('Actor') or {}
+            obj_id = actor.get('ID')
+            if obj_id and action not in _IGNORED_ACTIONS.get(kind, ()):
+                if action in _REMOVE_ACTIONS:
+                    self._forget(kind, obj_id)
+                else:
+                    self._refresh(kind, obj_id)
+            container = (actor.get('Attributes') or {}).get('container')
+            if kind == 'network' and container and 'container' in self.stores:
+                # (Dis)connecting a container changes its network settings
+                self._refresh('container', container)
+
+        # Events are only marked as processed once the stores are updated
+        if 'timeNano' in event:
+            seconds, nanos = divmod(event['timeNano'], 10 ** 9)
+            self._since = f'{seconds}.{nanos:09d}'
+        elif 'time' in event:
+            self._since = event['time']
+
+    def _subscribe(self, since=None):
+        return self.api.events(
+            since=since, decode=True, filters={'type': list(self.stores)}
+        )
+
+    def _close_stream(self):
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.close()
+            except DockerException:
+                # SSH streams can't be interrupted, the thread is a daemon
+                pass
+
+    def _run(self):
+        while not self._stopped.is_set():
+            stream = self._stream
+            if stream is not None:
+                try:
+                    for event in stream:
+                        self._handle_event(event)
+                except Exception:
+                    if not self._stopped.is_set():
+                        log.warning(
+                            'Error while following events', exc_info=True
+                        )
+            self._reconnect()
+
+    def _reconnect(self):
+        while not self._stopped.wait(self.reconnect_delay):
+            stream = None
+            try:
+                stream = self._subscribe(since=self._since)
+                if self._since is None:
+                    # No event was processed, so there is no point to resume
+                    # from: compare the stores with the server instead.
+                    self.resync()
+            except Exception:
+                log.warning('Error while reconnecting', exc_info=True)
+                if stream is not None:
+                    stream.close()
+                continue
+            with self._lock:
+                if not self._stopped.is_set():
+                    self._stream = stream
+                    return
+            stream.close()
+            return
@@ -29,6 +29,9 @@ extras_require = {
 
     # Only required when using websockets
     'websockets': ['websocket-client >= 1.3.0'],
+
+    # Optional, speeds up docker.stats.StatsCollector
+    'stats': ['numpy >= 1.17'],
 }
 
 with open('./test-requirements.txt') as test_reqs_txt:
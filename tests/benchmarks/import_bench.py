@@ -0,0 +1,68 @@
+"""
+Measure the import time of the package with ``python -X importtime``, for a
+bare import and for the creation of clients over a unix socket, and list the
+slowest modules imported. Fails if paramiko is imported while no ssh:// URL
+is used.
+
+Usage: python -m tests.benchmarks.import_bench [runs]
+"""
+import subprocess
+import sys
+
+STATEMENTS = [
+    'import docker',
+    'import docker.errors',
+    'import docker; docker.APIClient('
+    "base_url='unix:///var/run/docker.sock', version='1.41')",
+    'import docker; docker.DockerClient('
+    "base_url='unix:///var/run/docker.sock', version='1.41').containers",
+]
+
+
+def importtime(statement):
+    """
+    Run ``statement`` in a new interpreter and return the cumulative import
+    time of each top-level module it imported, in microseconds, and the
+    self time of all the modules.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True,
+    ).stderr
+    top_level, modules = {}, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            # Modules imported at startup, before the statement runs
+            if name.strip() == 'site':
+                top_level, modules = {}, {}
+                continue
+            top_level[name.strip()] = int(cumulative)
+        modules[name.strip()] = int(self_us)
+    return top_level, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    failed = False
+    for statement in STATEMENTS:
+        results = [importtime(statement) for _ in range(runs)]
+        top_level, modules = min(
+            results, key=lambda r: sum(r[0].values())
+        )
+        total = sum(top_level.values())
+        print(f'{total / 1000:8.1f} ms  {statement}')
+        slowest = sorted(modules.items(), key=lambda m: -m[1])[:5]
+        print('            ' + ', '.join(
+            f'{name} {us / 1000:.1f}' for name, us in slowest
+        ))
+        if 'paramiko' in modules:
+            print('            paramiko was imported')
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
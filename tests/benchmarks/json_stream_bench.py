@@ -0,0 +1,53 @@
+"""
+Compare the incremental JSON stream decoder against the previous
+text-buffer implementation on a synthetic pull progress stream.
+
+Usage: python -m tests.benchmarks.json_stream_bench [messages] [chunk_size]
+"""
+import json
+import sys
+import timeit
+
+from docker.utils.json_stream import (
+    json_decoder, json_splitter, json_stream, split_buffer
+)
+
+
+def legacy_json_stream(stream):
+    return split_buffer(stream, json_splitter, json_decoder.decode)
+
+
+def progress_stream(messages, chunk_size):
+    lines = []
+    for i in range(messages):
+        lines.append(json.dumps({
+            'status': 'Downloading',
+            'progressDetail': {'current': i * 1024, 'total': messages * 1024},
+            'progress': '[=====>     ]  {}kB/{}kB'.format(i, messages),
+            'id': 'a3ed95caeb02',
+        }))
+    data = ('\r\n'.join(lines) + '\r\n').encode('utf-8')
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 32768
+    chunks = progress_stream(messages, chunk_size)
+    # Not compared value by value: the legacy splitter strips trailing
+    # whitespace from partial buffers, which corrupts strings that straddle
+    # a chunk boundary.
+    assert len(list(json_stream(chunks))) == messages
+
+    for name, fn in (('legacy', legacy_json_stream), ('bytes', json_stream)):
+        elapsed = min(timeit.repeat(
+            lambda fn=fn: sum(1 for _ in fn(chunks)), number=1, repeat=5
+        ))
+        print(
+            f'{name:>8}: {elapsed * 1000:8.1f} ms '
+            f'({messages / elapsed:,.0f} messages/s)'
+        )
+
+
+if __name__ == '__main__':
+    main()
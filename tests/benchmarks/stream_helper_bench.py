@@ -0,0 +1,92 @@
+"""
+Measure the throughput of APIClient._stream_helper against a local fake
+daemon serving a chunked response over a unix socket, comparing the
+chunk-at-a-time reader with the previous 1-byte + chunk_left reads.
+
+Usage: python -m tests.benchmarks.stream_helper_bench [megabytes] [chunk_size]
+"""
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from docker.api import APIClient
+
+
+def legacy_stream_helper(response):
+    reader = response.raw
+    while not reader.closed:
+        data = reader.read(1)
+        if not data:
+            break
+        if reader._fp.chunk_left:
+            data += reader.read(reader._fp.chunk_left)
+        yield data
+
+
+def serve(server_sock, total, chunk_size):
+    chunk = b'%x\r\n%b\r\n' % (chunk_size, b'x' * chunk_size)
+    head = (
+        b'HTTP/1.1 200 OK\r\n'
+        b'Content-Type: application/json\r\n'
+        b'Transfer-Encoding: chunked\r\n\r\n'
+    )
+    while True:
+        try:
+            conn, _ = server_sock.accept()
+        except OSError:
+            return
+        with conn:
+            request = b''
+            while b'\r\n\r\n' not in request:
+                request += conn.recv(4096)
+            conn.sendall(head)
+            for _ in range(total // chunk_size):
+                conn.sendall(chunk)
+            conn.sendall(b'0\r\n\r\n')
+
+
+def run(client, helper, total):
+    response = client._get(client._url('/stream'), stream=True)
+    start = time.perf_counter()
+    received = sum(len(data) for data in helper(response))
+    elapsed = time.perf_counter() - start
+    assert received == total, received
+    return elapsed
+
+
+def main():
+    total = int(sys.argv[1] if len(sys.argv) > 1 else 256) * 1024 * 1024
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 32768
+    total -= total % chunk_size
+
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, 'docker.sock')
+    server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server_sock.bind(socket_path)
+    server_sock.listen(1)
+    threading.Thread(
+        target=serve, args=(server_sock, total, chunk_size), daemon=True
+    ).start()
+
+    client = APIClient(base_url=f'unix://{socket_path}', version='1.41')
+    try:
+        for name, helper in (
+                ('legacy', legacy_stream_helper),
+                ('chunked', client._stream_helper)):
+            elapsed = run(client, helper, total)
+            print(
+                f'{name:>8}: {total / elapsed / 1024 / 1024:8.1f} MB/s '
+                f'({total // chunk_size / elapsed:,.0f} chunks/s)'
+            )
+    finally:
+        client.close()
+        server_sock.close()
+        shutil.rmtree(socket_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+import asyncio
+import base64
+import json
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker import errors
+from docker.aio import AsyncAPIClient
+from docker.aio.transport import (
+    AsyncTransport, _write_chunked, encode_params
+)
+from docker.constants import IS_WINDOWS_PLATFORM
+
+
+def chunked(*chunks):
+    body = b''.join(b'%x\r\n%b\r\n' % (len(c), c) for c in chunks)
+    return body + b'0\r\n\r\n'
+
+
+def frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+class FakeDaemon:
+    """
+    A minimal HTTP/1.1 server on a unix socket. ``routes`` maps a
+    ``(method, path)`` tuple to a ``(status, headers, body)`` tuple.
+    """
+
+    def __init__(self, socket_path, routes):
+        self.socket_path = socket_path
+        self.routes = routes
+        self.requests = []
+        self.connections = 0
+
+    async def start(self):
+        self.server = await asyncio.start_unix_server(
+            self.handle, self.socket_path
+        )
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, _ = line.decode().split(' ', 2)
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b'\r\n', b''):
+                        break
+                    k, v = h.decode().split(':', 1)
+                    headers[k.strip().lower()] = v.strip()
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+                path, _, query = target.partition('?')
+                self.requests.append((method, path, query))
+                status, resp_headers, body = self.routes[(method, path)]
+                head = [f'HTTP/1.1 {status}']
+                head += [f'{k}: {v}' for k, v in resp_headers.items()]
+                if not {'Transfer-Encoding', 'Content-Length'} & set(
+                        resp_headers) and status != '101 UPGRADED':
+                    head.append(f'Content-Length: {len(body)}')
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode())
+                writer.write(body)
+                await writer.drain()
+                if status.startswith('101') or resp_headers.get(
+                        'Connection') == 'close':
+                    break
+        finally:
+            writer.close()
+
+
+def json_response(data, status='200 OK'):
+    return (
+        status, {'Content-Type': 'application/json'},
+        json.dumps(data).encode()
+    )
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class AsyncAPIClientTest(unittest.TestCase):
+    def setUp(self):
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        self.socket_path = os.path.join(socket_dir, 'docker.sock')
+        self.routes = {
+            ('GET', '/version'): json_response({'ApiVersion': '1.41'}),
+            ('GET', '/v1.41/_ping'): ('200 OK', {}, b'OK'),
+        }
+
+    def run_with_daemon(self, coro_fn):
+        async def main():
+            daemon = FakeDaemon(self.socket_path, self.routes)
+            await daemon.start()
+            client = AsyncAPIClient(base_url=f'unix://{self.socket_path}')
+            try:
+                return daemon, await coro_fn(client)
+            finally:
+                await client.close()
+                await daemon.stop()
+        return asyncio.run(main())
+
+    def test_version_negotiation_and_ping(self):
+        async def test(client):
+            assert await client.ping()
+            return client.api_version
+        daemon, version = self.run_with_daemon(test)
+        assert version == '1.41'
+        assert [r[1] for r in daemon.requests] == ['/version', '/v1.41/_ping']
+        # Both requests went over the same keep-alive connection
+        assert daemon.connections == 1
+
+    def test_containers_params(self):
+        self.routes[('GET', '/v1.41/containers/json')] = json_response(
+            [{'Id': 'abcdef1234567890'}]
+        )
+
+        async def test(client):
+            return await client.containers(all=True, trunc=True)
+        daemon, result = self.run_with_daemon(test)
+        assert result == [{'Id': 'abcdef123456'}]
+        query = daemon.requests[-1][2]
+        assert 'all=1' in query
+        assert 'since' not in query
+
+    def test_not_found(self):
+        self.routes[('GET', '/v1.41/containers/nope/json')] = json_response(
+            {'message': 'No such container: nope'}, status='404 Not Found'
+        )
+
+        async def test(client):
+            with pytest.raises(errors.NotFound) as excinfo:
+                await client.inspect_container('nope')
+            return excinfo.value
+        _, err = self.run_with_daemon(test)
+        assert err.explanation == 'No such container: nope'
+
+    def test_events_decode(self):
+        self.routes[('GET', '/v1.41/events')] = (
+            '200 OK', {'Transfer-Encoding': 'chunked'},
+            chunked(b'{"id": "a"}\n{"i', b'd": "b"}\n', b'{"id": "c"}\n')
+        )
+
+        async def test(client):
+            return [e async for e in client.events(decode=True)]
+        _, events = self.run_with_daemon(test)
+        assert events == [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+
+    def test_logs_stream_demultiplexes_frames(self):
+        self.routes[('GET', '/v1.41/containers/c1/json')] = json_response(
+            {'Config': {'Tty': False}}
+        )
+        payload = frame(1, b'hello\n') + frame(2, b'oops\n')
+        self.routes[('GET', '/v1.41/containers/c1/logs')] = (
+            '200 OK', {'Transfer-Encoding': 'chunked'},
+            chunked(payload[:5], payload[5:12], payload[12:])
+        )
+
+        async def test(client):
+            logs = await client.logs('c1', stream=True)
+            return [line async for line in logs]
+        _, lines = self.run_with_daemon(test)
+        assert lines == [b'hello\n', b'oops\n']
+
+    def test_exec_start_demux(self):
+        self.routes[('POST', '/v1.41/exec/e1/start')] = (
+            '101 UPGRADED',
+            {'Content-Type': 'application/vnd.docker.raw-stream',
+             'Connection': 'Upgrade', 'Upgrade': 'tcp'},
+            frame(1, b'out') + frame(2, b'err') + frame(1, b'put')
+        )
+
+        async def test(client):
+            return await client.exec_start('e1', demux=True)
+        _, output = self.run_with_daemon(test)
+        assert output == (b'output', b'err')
+
+    def test_get_archive(self):
+        stat = {'name': 'f', 'size': 3}
+        self.routes[('GET', '/v1.41/containers/c1/archive')] = (
+            '200 OK', {
+                'Content-Type': 'application/x-tar',
+                'X-Docker-Container-Path-Stat': base64.b64encode(
+                    json.dumps(stat).encode()
+                ).decode(),
+            },
+            b'tar'
+        )
+
+        async def test(client):
+            strm, stat = await client.get_archive('c1', '/f')
+            return b''.join([chunk async for chunk in strm]), stat
+        daemon, (data, result) = self.run_with_daemon(test)
+        assert data == b'tar'
+        assert result == stat
+        assert daemon.requests[-1][2] == 'path=%2Ff'
+
+    def test_put_archive(self):
+        self.routes[('PUT', '/v1.41/containers/c1/archive')] = (
+            '200 OK', {}, b''
+        )
+
+        async def test(client):
+            return await client.put_archive('c1', '/tmp', b'tar')
+        daemon, result = self.run_with_daemon(test)
+        assert result is True
+        assert daemon.requests[-1][:2] == (
+            'PUT', '/v1.41/containers/c1/archive'
+        )
+
+    def test_port(self):
+        self.routes[('GET', '/v1.41/containers/c1/json')] = json_response({
+            'NetworkSettings': {'Ports': {
+                '80/tcp': [{'HostIp': '0.0.0.0', 'HostPort': '8080'}]
+            }}
+        })
+
+        async def test(client):
+            return await client.port('c1', 80)
+        _, result = self.run_with_daemon(test)
+        assert result == [{'HostIp': '0.0.0.0', 'HostPort': '8080'}]
+
+    def test_load_image(self):
+        self.routes[('POST', '/v1.41/images/load')] = (
+            '200 OK', {'Transfer-Encoding': 'chunked'},
+            chunked(b'{"stream": "Loaded image: busybox"}\n')
+        )
+
+        async def test(client):
+            res = await client.load_image(b'tar')
+            return [line async for line in res]
+        _, lines = self.run_with_daemon(test)
+        assert lines == [{'stream': 'Loaded image: busybox'}]
+
+    def test_prune_builds(self):
+        self.routes[('POST', '/v1.41/build/prune')] = json_response(
+            {'SpaceReclaimed': 42}
+        )
+
+        async def test(client):
+            return await client.prune_builds(all=True)
+        daemon, result = self.run_with_daemon(test)
+        assert result == {'SpaceReclaimed': 42}
+        assert daemon.requests[-1][2] == 'all=True'
+
+    def test_truncated_body(self):
+        self.routes[('GET', '/v1.41/images/i1/get')] = (
+            '200 OK', {'Content-Length': '10', 'Connection': 'close'},
+            b'tar'
+        )
+        self.routes[('GET', '/v1.41/events')] = (
+            '200 OK', {'Transfer-Encoding': 'chunked', 'Connection': 'close'},
+            b'b\r\n{"id": "a"}\r\n'
+        )
+
+        async def test(client):
+            res = await client._get(
+                await client._url('/images/i1/get'), stream=True
+            )
+            with pytest.raises(ConnectionResetError):
+                async for _ in res.iter_chunks():
+                    pass
+            events = []
+            with pytest.raises(ConnectionResetError):
+                async for event in client.events(decode=True):
+                    events.append(event)
+            return events
+        _, events = self.run_with_daemon(test)
+        assert events == [{'id': 'a'}]
+
+
+class AsyncTransportTest(unittest.TestCase):
+    def test_retry_failure_closes_connection(self):
+        transport = AsyncTransport('http+unix:///var/run/docker.sock')
+        stale, fresh = mock.Mock(), mock.Mock()
+        transport.pool.acquire = mock.AsyncMock(return_value=(stale, True))
+        transport._open = mock.AsyncMock(return_value=fresh)
+        transport._send = mock.AsyncMock(side_effect=ConnectionError)
+        with pytest.raises(ConnectionError):
+            asyncio.run(transport.request('GET', '/_ping'))
+        assert transport._send.await_count == 2
+        stale.close.assert_called_once_with()
+        fresh.close.assert_called_once_with()
+
+    def test_file_body_read_off_the_event_loop(self):
+        threads = []
+
+        class Body:
+            def __init__(self):
+                self.chunks = [b'data', b'']
+
+            def read(self, size):
+                threads.append(threading.current_thread())
+                return self.chunks.pop(0)
+
+        writer = mock.Mock(drain=mock.AsyncMock())
+        asyncio.run(_write_chunked(writer, Body()))
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        writer.write.assert_has_calls([
+            mock.call(b'4\r\ndata\r\n'), mock.call(b'0\r\n\r\n')
+        ])
+
+
+class EncodeParamsTest(unittest.TestCase):
+    def test_drops_none_and_repeats_sequences(self):
+        assert encode_params(
+            {'a': None, 'b': ['x', 'y'], 'c': True}
+        ) == 'b=x&b=y&c=True'
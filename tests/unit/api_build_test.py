@@ -1,5 +1,7 @@
 import gzip
+import inspect
 import io
+import os
 import shutil
 
 import pytest
@@ -118,6 +120,31 @@ class BuildTest(BaseAPIClientTest):
     def test_build_container_with_named_dockerfile(self):
         self.client.build(".", dockerfile="nameddockerfile")
 
+    def test_build_container_stream_context(self):
+        base = make_tree([], ["Dockerfile"])
+        self.addCleanup(shutil.rmtree, base)
+
+        self.client.build(base, stream_context=True)
+
+        context = fake_request.call_args[1]["data"]
+        assert inspect.isgenerator(context)
+
+    def test_build_context_digest(self):
+        base = make_tree([], ["Dockerfile", "ignored"])
+        self.addCleanup(shutil.rmtree, base)
+        digest = self.client.build_context_digest(base)
+        assert digest.startswith("sha256:")
+
+        with open(os.path.join(base, ".dockerignore"), "w") as f:
+            f.write("ignored\n")
+        with open(os.path.join(base, "ignored"), "w") as f:
+            f.write("changed")
+        assert self.client.build_context_digest(base) != digest
+        digest = self.client.build_context_digest(base)
+        with open(os.path.join(base, "ignored"), "w") as f:
+            f.write("changed again")
+        assert self.client.build_context_digest(base) == digest
+
     def test_build_with_invalid_tag(self):
         with pytest.raises(errors.DockerException):
             self.client.build(".", tag="https://example.com")
@@ -1,6 +1,11 @@
 import datetime
+import io
 import json
+import os
+import shutil
 import signal
+import tarfile
+import tempfile
 
 import docker
 from docker.api import APIClient
@@ -1392,6 +1397,41 @@ class ContainerTest(BaseAPIClientTest):
             timeout=(DEFAULT_TIMEOUT_SECONDS + timeout)
         )
 
+    def test_stop_many(self):
+        timeout = 2
+        calls = fake_request.call_count
+
+        results = self.client.stop_many(
+            [fake_api.FAKE_CONTAINER_ID, {'Id': fake_api.FAKE_CONTAINER_ID}],
+            timeout=timeout, concurrency=2
+        )
+
+        assert [r.ok for r in results] == [True, True]
+        assert results[1].item == {'Id': fake_api.FAKE_CONTAINER_ID}
+        assert fake_request.call_count == calls + 2
+        fake_request.assert_called_with(
+            'POST',
+            url_prefix + 'containers/' + fake_api.FAKE_CONTAINER_ID + '/stop',
+            params={'t': timeout},
+            timeout=(DEFAULT_TIMEOUT_SECONDS + timeout)
+        )
+
+    def test_remove_many_reports_errors(self):
+        calls = fake_request.call_count
+        results = self.client.remove_many(
+            [None, fake_api.FAKE_CONTAINER_ID], force=True
+        )
+
+        assert isinstance(results[0].error, docker.errors.NullResource)
+        assert results[1].ok
+        assert fake_request.call_count == calls + 1
+        fake_request.assert_called_with(
+            'DELETE',
+            url_prefix + 'containers/' + fake_api.FAKE_CONTAINER_ID,
+            params={'v': False, 'link': False, 'force': True},
+            timeout=DEFAULT_TIMEOUT_SECONDS
+        )
+
     def test_pause_container(self):
         self.client.pause(fake_api.FAKE_CONTAINER_ID)
 
@@ -1587,3 +1627,74 @@ class ContainerTest(BaseAPIClientTest):
             'Memory': 2 * 1024, 'CpuShares': 124, 'BlkioWeight': 345
         }
         assert args[1]['headers']['Content-Type'] == 'application/json'
+
+
+class CopyTest(BaseAPIClientTest):
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def test_copy_to(self):
+        src = os.path.join(self.tmpdir, 'app')
+        os.makedirs(os.path.join(src, 'lib'))
+        with open(os.path.join(src, 'lib', 'main.py'), 'w') as f:
+            f.write('print(1)')
+
+        with mock.patch.object(
+                self.client, 'put_archive', return_value=True) as put:
+            assert self.client.copy_to(
+                fake_api.FAKE_CONTAINER_ID, src, '/srv'
+            )
+
+        container, path, data = put.call_args[0]
+        assert (container, path) == (fake_api.FAKE_CONTAINER_ID, '/srv')
+        # The archive is generated as it is sent
+        assert not isinstance(data, (bytes, list))
+        archive = tarfile.open(fileobj=io.BytesIO(b''.join(data)))
+        assert archive.getnames() == ['app', 'app/lib', 'app/lib/main.py']
+        assert archive.extractfile('app/lib/main.py').read() == b'print(1)'
+
+    def test_copy_from(self):
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as t:
+            info = tarfile.TarInfo('etc/hostname')
+            info.size = 4
+            t.addfile(info, io.BytesIO(b'web\n'))
+        data = archive.getvalue()
+        stat = {'name': 'etc'}
+        with mock.patch.object(
+                self.client, 'get_archive',
+                return_value=(iter([data[:700], data[700:]]), stat)) as get:
+            assert self.client.copy_from(
+                fake_api.FAKE_CONTAINER_ID, '/etc', self.tmpdir,
+                encode_stream=True
+            ) == stat
+
+        get.assert_called_with(
+            fake_api.FAKE_CONTAINER_ID, '/etc',
+            docker.constants.DEFAULT_DATA_CHUNK_SIZE, True
+        )
+        with open(os.path.join(self.tmpdir, 'etc', 'hostname')) as f:
+            assert f.read() == 'web\n'
+
+    def test_copy_between(self):
+        res = mock.Mock()
+        res.raw.stream.return_value = iter([b'\x1f\x8b', b'gzipped'])
+        stat = {'name': 'dist'}
+        dst = mock.Mock(spec=APIClient)
+        with mock.patch.object(self.client, '_get_archive_response',
+                               return_value=(res, stat)) as get, \
+                mock.patch.object(self.client, '_get_raw_response_socket'):
+            assert self.client.copy_between(
+                fake_api.FAKE_CONTAINER_ID, '/out/dist', 'web', '/srv',
+                dst_client=dst, encode_stream=True, chunk_size=1024
+            ) == stat
+
+        get.assert_called_with(fake_api.FAKE_CONTAINER_ID, '/out/dist', True)
+        # The compressed body is forwarded as is
+        res.raw.stream.assert_called_with(1024, decode_content=False)
+        container, path, data = dst.put_archive.call_args[0]
+        assert (container, path) == ('web', '/srv')
+        assert list(data) == [b'\x1f\x8b', b'gzipped']
+        res.close.assert_not_called()
@@ -1,5 +1,8 @@
 import json
+from unittest import mock
 
+from docker import errors
+from docker.api.exec_api import ExecOutput
 from . import fake_api
 from .api_test import (
     BaseAPIClientTest, url_prefix, fake_request, DEFAULT_TIMEOUT_SECONDS,
@@ -75,3 +78,22 @@ class ExecTest(BaseAPIClientTest):
             params={'h': 20, 'w': 60},
             timeout=DEFAULT_TIMEOUT_SECONDS
         )
+
+    def test_exec_many(self):
+        read = mock.Mock(return_value=(b'out', None))
+        with mock.patch.object(self.client, '_read_from_socket', read):
+            results = self.client.exec_many(
+                [(fake_api.FAKE_CONTAINER_ID, 'true'),
+                 (None, 'false')],
+                concurrency=2
+            )
+
+        output = results[0].result
+        assert isinstance(output, ExecOutput)
+        assert output[:3] == (0, b'out', b'')
+        assert set(output.timings) == {
+            'create', 'start', 'output', 'inspect', 'total'
+        }
+        read.assert_called_once_with(mock.ANY, False, tty=False, demux=True)
+        assert results[1].item == (None, 'false')
+        assert isinstance(results[1].error, errors.NullResource)
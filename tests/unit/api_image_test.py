@@ -1,8 +1,13 @@
+import os
+import shutil
+import tempfile
+
 import docker
 import pytest
 
 from . import fake_api
 from docker import auth
+from docker.utils.transfer import FileReader
 from unittest import mock
 from .api_test import (
     BaseAPIClientTest, fake_request, DEFAULT_TIMEOUT_SECONDS, url_prefix,
@@ -340,6 +345,38 @@ class ImageTest(BaseAPIClientTest):
             timeout=DEFAULT_TIMEOUT_SECONDS
         )
 
+    def test_get_image_to(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'image.tar')
+        with mock.patch.object(
+                self.client, '_stream_raw_result',
+                return_value=iter([b'tar', b'ball'])) as stream:
+            stats = self.client.get_image_to(fake_api.FAKE_IMAGE_ID, path)
+
+        fake_request.assert_called_with(
+            'GET',
+            f"{url_prefix}images/{fake_api.FAKE_IMAGE_ID}/get",
+            stream=True,
+            timeout=DEFAULT_TIMEOUT_SECONDS
+        )
+        chunk_size = docker.constants.DEFAULT_DATA_CHUNK_SIZE
+        assert stream.call_args[0][1:] == (chunk_size, False)
+        with open(path, 'rb') as f:
+            assert f.read() == b'tarball'
+        assert stats.bytes == 7
+
+    def test_load_image_from(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'tarball')
+            f.flush()
+            self.client.load_image_from(f.name)
+
+        data = fake_request.call_args[1]['data']
+        assert isinstance(data, FileReader)
+        assert len(data) == 7
+        assert fake_request.call_args[0] == ('POST', f"{url_prefix}images/load")
+
     def test_load_image(self):
         self.client.load_image('Byte Stream....')
 
@@ -42,6 +42,23 @@ def response(status_code=200, content='', headers=None, reason=None, elapsed=0,
     return res
 
 
+def chunked_raw_response(chunks):
+    """Build a urllib3 response reading ``chunks`` with chunked encoding."""
+    body = b''.join(b'%x\r\n%b\r\n' % (len(c), c) for c in chunks)
+    data = (
+        b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n' +
+        body + b'0\r\n\r\n'
+    )
+
+    class FakeSocket:
+        def makefile(self, *args, **kwargs):
+            return io.BytesIO(data)
+
+    raw = http.client.HTTPResponse(FakeSocket(), method='GET')
+    raw.begin()
+    return urllib3.HTTPResponse.from_httplib(raw, preload_content=False)
+
+
 def fake_resolve_authconfig(authconfig, registry=None, *args, **kwargs):
     return None
 
@@ -81,7 +98,8 @@ def fake_delete(self, url, *args, **kwargs):
     return fake_request('DELETE', url, *args, **kwargs)
 
 
-def fake_read_from_socket(self, response, stream, tty=False, demux=False):
+def fake_read_from_socket(self, response, stream, tty=False, demux=False,
+                          spool_threshold=None):
     return bytes()
 
 
@@ -179,6 +197,42 @@ class DockerApiTest(BaseAPIClientTest):
         assert not (client._version == "auto")
         client.close()
 
+    def test_lazy_version(self):
+        with mock.patch.object(
+            APIClient, '_retrieve_server_version', return_value='1.41'
+        ) as retrieve:
+            client = APIClient(version='auto', lazy_version=True)
+            retrieve.assert_not_called()
+            assert client._url('/info') == (
+                'http+docker://localhost/v1.41/info'
+            )
+            assert client.api_version == '1.41'
+            retrieve.assert_called_once_with()
+        client.close()
+
+    def test_version_cache_hit(self):
+        cache = mock.Mock(spec=docker.utils.VersionCache)
+        cache.get.return_value = '1.40'
+        with mock.patch.object(
+            APIClient, '_retrieve_server_version'
+        ) as retrieve:
+            client = APIClient(version='auto', version_cache=cache)
+            retrieve.assert_not_called()
+        assert client.api_version == '1.40'
+        cache.put.assert_not_called()
+        client.close()
+
+    def test_version_cache_miss(self):
+        cache = mock.Mock(spec=docker.utils.VersionCache)
+        cache.get.return_value = None
+        with mock.patch.object(
+            APIClient, '_retrieve_server_version', return_value='1.41'
+        ):
+            client = APIClient(version='auto', version_cache=cache)
+        assert client.api_version == '1.41'
+        cache.put.assert_called_once_with(client._server_url, '1.41')
+        client.close()
+
     def test_auto_retrieve_server_version(self):
         version = self.client._retrieve_server_version()
         assert isinstance(version, str)
@@ -329,38 +383,42 @@ class DockerApiTest(BaseAPIClientTest):
         status_code, content = fake_api.fake_responses[f"{url_prefix}events"]()
         content_str = json.dumps(content)
         content_str = content_str.encode('utf-8')
-        body = io.BytesIO(content_str)
-
-        # mock a stream interface
-        raw_resp = urllib3.HTTPResponse(body=body)
-        raw_resp._fp.chunked = True
-        raw_resp._fp.chunk_left = len(body.getvalue()) - 1
 
         # pass `decode=False` to the helper
-        raw_resp._fp.seek(0)
+        raw_resp = chunked_raw_response([content_str])
         resp = response(status_code=status_code, content=content, raw=raw_resp)
         result = next(self.client._stream_helper(resp))
         assert result == content_str
 
         # pass `decode=True` to the helper
-        raw_resp._fp.seek(0)
+        raw_resp = chunked_raw_response([content_str])
         resp = response(status_code=status_code, content=content, raw=raw_resp)
         result = next(self.client._stream_helper(resp, decode=True))
         assert result == content
 
         # non-chunked response, pass `decode=False` to the helper
+        body = io.BytesIO(content_str)
+        raw_resp = urllib3.HTTPResponse(body=body)
         raw_resp._fp.chunked = False
-        raw_resp._fp.seek(0)
         resp = response(status_code=status_code, content=content, raw=raw_resp)
         result = next(self.client._stream_helper(resp))
         assert result == content_str.decode('utf-8')
 
         # non-chunked response, pass `decode=True` to the helper
-        raw_resp._fp.seek(0)
         resp = response(status_code=status_code, content=content, raw=raw_resp)
         result = next(self.client._stream_helper(resp, decode=True))
         assert result == content
 
+    def test_stream_helper_yields_whole_chunks(self):
+        chunks = [b'{"status": "a"}\n', b'x' * 70000, b'{"status": "b"}\n']
+        resp = response(raw=chunked_raw_response(chunks))
+        assert list(self.client._stream_helper(resp)) == chunks
+
+        resp = response(raw=chunked_raw_response(chunks))
+        result = list(self.client._stream_helper(resp, chunk_size=32768))
+        assert b''.join(result) == b''.join(chunks)
+        assert max(len(c) for c in result) == 32768
+
 
 class UnixSocketStreamTest(unittest.TestCase):
     def setUp(self):
@@ -531,7 +589,7 @@ class TCPSocketStreamTest(unittest.TestCase):
 
         return Handler
 
-    def request(self, stream=None, tty=None, demux=None):
+    def request(self, stream=None, tty=None, demux=None, **kwargs):
         assert stream is not None and tty is not None and demux is not None
         with APIClient(
                 base_url=self.address,
@@ -543,7 +601,7 @@ class TCPSocketStreamTest(unittest.TestCase):
                 url = client._url('/no-tty')
             resp = client._post(url, stream=True)
             return client._read_from_socket(
-                resp, stream=stream, tty=tty, demux=demux)
+                resp, stream=stream, tty=tty, demux=demux, **kwargs)
 
     def test_read_from_socket_tty(self):
         res = self.request(stream=True, tty=True, demux=False)
@@ -587,6 +645,13 @@ class TCPSocketStreamTest(unittest.TestCase):
         res = self.request(stream=False, tty=False, demux=True)
         assert res == (self.stdout_data, self.stderr_data)
 
+    def test_read_from_socket_no_stream_spooled(self):
+        out, err = self.request(
+            stream=False, tty=False, demux=True, spool_threshold=4
+        )
+        assert out.read() == self.stdout_data
+        assert err.read() == self.stderr_data
+
 
 class UserAgentTest(unittest.TestCase):
     def setUp(self):
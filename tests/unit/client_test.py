@@ -85,7 +85,8 @@ class ClientTest(unittest.TestCase):
         mock_obj.return_value.urlopen.return_value.status = 200
         client.ping()
 
-        base_url = f"{client.api.base_url}/v{client.api._version}/_ping"
+        # The pool is shared by all the requests to the server
+        base_url = client.api.base_url
 
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
@@ -121,7 +122,8 @@ class ClientTest(unittest.TestCase):
         mock_obj.return_value.urlopen.return_value.status = 200
         client.ping()
 
-        base_url = f"{client.api.base_url}/v{client.api._version}/_ping"
+        # The pool is shared by all the requests to the server
+        base_url = client.api.base_url
 
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
@@ -193,7 +195,8 @@ class FromEnvTest(unittest.TestCase):
         mock_obj.return_value.urlopen.return_value.status = 200
         client.ping()
 
-        base_url = f"{client.api.base_url}/v{client.api._version}/_ping"
+        # The pool is shared by all the requests to the server
+        base_url = client.api.base_url
 
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
@@ -227,7 +230,8 @@ class FromEnvTest(unittest.TestCase):
         mock_obj.return_value.urlopen.return_value.status = 200
         client.ping()
 
-        base_url = f"{client.api.base_url}/v{client.api._version}/_ping"
+        # The pool is shared by all the requests to the server
+        base_url = client.api.base_url
 
         mock_obj.assert_called_once_with(base_url,
                                          "/var/run/docker.sock",
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+import docker
+
+
+def imported_modules(statement):
+    output = subprocess.run(
+        [sys.executable, '-c',
+         f'{statement}\nimport sys\nprint(" ".join(sys.modules))'],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return set(output.split())
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_import_is_lazy(self):
+        modules = imported_modules('import docker')
+        assert 'docker.api' not in modules
+        assert 'docker.client' not in modules
+        assert 'requests' not in modules
+
+    def test_unix_client_does_not_import_paramiko(self):
+        modules = imported_modules(
+            'import docker\n'
+            'client = docker.DockerClient('
+            "base_url='unix:///var/run/docker.sock', version='1.41')\n"
+            'client.containers'
+        )
+        assert 'docker.models.containers' in modules
+        assert 'docker.models.services' not in modules
+        assert 'docker.transport.sshconn' not in modules
+        assert 'paramiko' not in modules
+
+    def test_exports(self):
+        assert docker.APIClient is docker.api.APIClient
+        assert docker.from_env.__self__ is docker.DockerClient
+        assert docker.__version__ == docker.version.__version__
+        assert {'APIClient', 'ContextAPI', 'TLSConfig'} <= set(dir(docker))
+        with self.assertRaises(AttributeError):
+            docker.NotAnExport  # noqa: B018
+
+    def test_submodules(self):
+        modules = imported_modules(
+            'import docker\n'
+            "docker.types.ContainerSpec('busybox')\n"
+            'assert issubclass(docker.errors.NotFound, '
+            'docker.errors.APIError)\n'
+            'docker.utils.parse_host(None)'
+        )
+        assert 'docker.types' in modules
+        assert 'docker.client' not in modules
+        with self.assertRaises(AttributeError):
+            docker.not_a_module  # noqa: B018
+
+    def test_missing_optional_dependency(self):
+        namespace = vars(docker.transport)
+        with mock.patch.dict(namespace), mock.patch(
+            'importlib.import_module',
+            side_effect=ImportError('No module named paramiko')
+        ):
+            namespace.pop('SSHHTTPAdapter', None)
+            assert not hasattr(docker.transport, 'SSHHTTPAdapter')
+            with self.assertRaises(ImportError):
+                from docker.transport import SSHHTTPAdapter  # noqa: F401
@@ -0,0 +1,216 @@
+import json
+import os
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker import APIClient
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.logs import LogMux, LogRecord, _ChunkedDecoder
+
+
+def frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+def chunk(data):
+    return b'%x\r\n%b\r\n' % (len(data), data)
+
+
+class FakeLogsDaemon:
+    """
+    Serves container inspection, and logs written by the test through
+    ``send``, over a unix socket.
+    """
+
+    def __init__(self, socket_path, containers):
+        self.containers = containers
+        # Logs sent along with the response headers
+        self.initial = {}
+        self.connections = {}
+        self.connected = threading.Condition()
+        self.server = socket.socket(socket.AF_UNIX)
+        self.server.bind(socket_path)
+        self.server.listen(16)
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self.handle, args=(conn,), daemon=True
+            ).start()
+
+    def handle(self, conn):
+        f = conn.makefile('rb')
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            path = line.split(b' ')[1].split(b'?')[0].decode()
+            while f.readline() not in (b'\r\n', b''):
+                pass
+            id = path.split('/')[3]
+            if path.endswith('/json'):
+                body = json.dumps({
+                    'Id': id, 'Config': {'Tty': self.containers[id]}
+                }).encode()
+                conn.sendall(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: %d\r\n\r\n%b' % (len(body), body)
+                )
+                continue
+            conn.sendall(
+                b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n' +
+                self.initial.get(id, b'')
+            )
+            with self.connected:
+                self.connections[id] = conn
+                self.connected.notify_all()
+            return
+
+    def send(self, id, data):
+        with self.connected:
+            self.connected.wait_for(lambda: id in self.connections, 5)
+        self.connections[id].sendall(data)
+
+    def end(self, id):
+        self.send(id, b'0\r\n\r\n')
+        self.connections[id].close()
+
+    def close(self):
+        self.server.close()
+        for conn in self.connections.values():
+            conn.close()
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class LogMuxTest(unittest.TestCase):
+    def setUp(self):
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        socket_path = os.path.join(socket_dir, 'docker.sock')
+        self.daemon = FakeLogsDaemon(socket_path, {'a': False, 'b': True})
+        self.addCleanup(self.daemon.close)
+        self.client = self.make_client(socket_path)
+
+    def make_client(self, socket_path, **kwargs):
+        client = APIClient(f'unix://{socket_path}', version='1.41', **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_lines_from_many_containers(self):
+        mux = LogMux(self.client, ['a', 'b'])
+        assert sorted(mux.containers) == ['a', 'b']
+
+        # A line split across frames and chunks, and a line split inside
+        # a chunk header
+        data = frame(1, b'2024-01-01T00:00:00Z hel') + frame(1, b'lo\n')
+        self.daemon.send('a', chunk(data[:5]))
+        oops = frame(2, b'2024-01-01T00:00:01Z oops\n')
+        assert len(oops) == 0x22
+        self.daemon.send('a', chunk(data[5:]) + b'2')
+        self.daemon.send('a', b'2\r\n' + oops[:-1])
+        assert next(mux) == LogRecord(
+            'a', 1, b'hello', '2024-01-01T00:00:00Z'
+        )
+
+        self.daemon.send('b', chunk(b'2024-01-01T00:00:02Z tty\r\n'))
+        assert next(mux) == LogRecord(
+            'b', 1, b'tty\r', '2024-01-01T00:00:02Z'
+        )
+
+        self.daemon.send('a', oops[-1:] + b'\r\n')
+        assert next(mux) == LogRecord(
+            'a', 2, b'oops', '2024-01-01T00:00:01Z'
+        )
+
+        # Partial lines are returned when the logs end
+        self.daemon.send('b', chunk(b'2024-01-01T00:00:03Z bye'))
+        self.daemon.end('b')
+        assert next(mux) == LogRecord(
+            'b', 1, b'bye', '2024-01-01T00:00:03Z'
+        )
+        self.daemon.end('a')
+        assert list(mux) == []
+        assert mux.containers == []
+
+    def test_close_from_another_thread(self):
+        mux = LogMux(self.client, ['a'], timestamps=False)
+        self.daemon.send('a', chunk(frame(1, b'first\n')))
+        assert next(mux) == LogRecord('a', 1, b'first', None)
+        threading.Timer(0.05, mux.close).start()
+        assert list(mux) == []
+
+    def test_small_read_size(self):
+        # Read along with the headers, so buffered by the response
+        self.daemon.initial['a'] = chunk(b''.join(
+            frame(1, b'line %d\n' % i) for i in range(3)
+        ))
+        mux = LogMux(self.client, ['a'], timestamps=False, read_size=8)
+        # Without further data, the records buffered beyond read_size
+        # must still come out
+        timer = threading.Timer(5, mux.close)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        records = [next(mux) for _ in range(3)]
+        assert [r.line for r in records] == [b'line 0', b'line 1', b'line 2']
+
+    def test_closed_while_waiting_for_lock(self):
+        mux = LogMux(self.client, ['a'], timestamps=False)
+        lock = mux._lock
+
+        class Lock:
+            # close() runs in another thread right before the lock is
+            # taken, after the iterator checked that mux wasn't closed
+            def __enter__(self):
+                mux._lock = lock
+                mux.close()
+                return lock.__enter__()
+
+            def __exit__(self, *exc_info):
+                return lock.__exit__(*exc_info)
+
+        mux._lock = Lock()
+        with pytest.raises(StopIteration):
+            next(mux)
+
+    def test_more_containers_than_pool_size(self):
+        socket_path = self.client.get_adapter(self.client.base_url).socket_path
+        client = self.make_client(socket_path, max_pool_size=1)
+        pool = client.get_adapter(client.base_url).get_connection(
+            client.base_url
+        )
+        with mock.patch('urllib3.connectionpool.log') as log:
+            mux = LogMux(client, ['a', 'b'], timestamps=False)
+            assert pool.pool.maxsize == 3
+            self.daemon.end('a')
+            self.daemon.end('b')
+            assert list(mux) == []
+        # The pool has room for the connections of all the streams
+        log.warning.assert_not_called()
+        assert pool.pool.maxsize == 1
+
+
+class ChunkedDecoderTest(unittest.TestCase):
+    def test_byte_by_byte(self):
+        body = (
+            chunk(b'hello ') + b'5;ext=1\r\nworld\r\n0\r\n'
+            b'X-Trailer: 1\r\n\r\n'
+        )
+        decoder = _ChunkedDecoder()
+        out = []
+        for i in range(len(body)):
+            out += decoder.feed(body[i:i + 1])
+        assert b''.join(out) == b'hello world'
+        assert decoder.done
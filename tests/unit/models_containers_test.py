@@ -8,6 +8,7 @@ from docker.constants import DEFAULT_DATA_CHUNK_SIZE, \
 from docker.models.containers import Container, _create_container_args
 from docker.models.images import Image
 from docker.types import EndpointConfig
+from docker.utils.concurrency import BulkResult
 from .fake_api import FAKE_CONTAINER_ID, FAKE_IMAGE_ID, FAKE_EXEC_ID
 from .fake_api_client import make_fake_client
 
@@ -603,6 +604,17 @@ class ContainerCollectionTest(unittest.TestCase):
             host_config={'NetworkMode': 'foo'}
         )
 
+    def test_copy_between(self):
+        client = make_fake_client()
+        remote = make_fake_client()
+        src = client.containers.get(FAKE_CONTAINER_ID)
+        dst = remote.containers.get('web')
+        client.containers.copy_between(src, '/out', dst, '/srv')
+        client.api.copy_between.assert_called_with(
+            FAKE_CONTAINER_ID, '/out', FAKE_CONTAINER_ID, '/srv',
+            dst_client=remote.api
+        )
+
     def test_get(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -638,6 +650,51 @@ class ContainerCollectionTest(unittest.TestCase):
 
         assert client.containers.list(all=True, ignore_removed=True) == []
 
+    def test_list_concurrent_inspect_preserves_order(self):
+        ids = [f'{i:064x}' for i in range(50)]
+
+        def inspect_container(container_id):
+            if container_id == ids[10]:
+                raise docker.errors.NotFound('Container not found')
+            return {'Id': container_id}
+
+        client = make_fake_client({
+            'containers.return_value': [{'Id': i} for i in ids],
+            'inspect_container.side_effect': inspect_container,
+        })
+        containers = client.containers.list(all=True, ignore_removed=True)
+        assert [c.id for c in containers] == ids[:10] + ids[11:]
+        assert client.api.inspect_container.call_count == 50
+
+    def test_stop_many(self):
+        def stop_many(ids, **kwargs):
+            return [BulkResult(i, None, None) for i in ids]
+
+        client = make_fake_client({'stop_many.side_effect': stop_many})
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        results = client.containers.stop_many(
+            [container, 'other'], timeout=1, concurrency=4
+        )
+        client.api.stop_many.assert_called_with(
+            [FAKE_CONTAINER_ID, 'other'], timeout=1, concurrency=4,
+            rate_limit=None
+        )
+        assert [r.item for r in results] == [container, 'other']
+
+    def test_exec_run_many(self):
+        def exec_many(jobs, **kwargs):
+            return [BulkResult(job, None, None) for job in jobs]
+
+        client = make_fake_client({'exec_many.side_effect': exec_many})
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        results = client.containers.exec_run_many(
+            [(container, 'true')], user='nobody'
+        )
+        client.api.exec_many.assert_called_with(
+            [(FAKE_CONTAINER_ID, 'true')], user='nobody'
+        )
+        assert results[0].item == (container, 'true')
+
 
 class ContainerTest(unittest.TestCase):
     def test_short_id(self):
@@ -688,7 +745,7 @@ class ContainerTest(unittest.TestCase):
         )
         client.api.exec_start.assert_called_with(
             FAKE_EXEC_ID, detach=False, tty=False, stream=True, socket=False,
-            demux=False,
+            demux=False, spool_threshold=None,
         )
 
     def test_exec_run_failure(self):
@@ -702,7 +759,7 @@ class ContainerTest(unittest.TestCase):
         )
         client.api.exec_start.assert_called_with(
             FAKE_EXEC_ID, detach=False, tty=False, stream=False, socket=False,
-            demux=False,
+            demux=False, spool_threshold=None,
         )
 
     def test_export(self):
@@ -713,6 +770,18 @@ class ContainerTest(unittest.TestCase):
             FAKE_CONTAINER_ID, DEFAULT_DATA_CHUNK_SIZE
         )
 
+    def test_copy_from_and_to(self):
+        client = make_fake_client()
+        container = client.containers.get(FAKE_CONTAINER_ID)
+        container.copy_from('/etc', '/tmp/etc', encode_stream=True)
+        client.api.copy_from.assert_called_with(
+            FAKE_CONTAINER_ID, '/etc', '/tmp/etc', encode_stream=True
+        )
+        container.copy_to('/tmp/etc', '/srv')
+        client.api.copy_to.assert_called_with(
+            FAKE_CONTAINER_ID, '/tmp/etc', '/srv'
+        )
+
     def test_get_archive(self):
         client = make_fake_client()
         container = client.containers.get(FAKE_CONTAINER_ID)
@@ -2,7 +2,9 @@ import unittest
 import warnings
 
 from docker.constants import DEFAULT_DATA_CHUNK_SIZE
+from docker.errors import APIError
 from docker.models.images import Image
+from docker.progress import PullProgress
 
 from .fake_api import FAKE_IMAGE_ID
 from .fake_api_client import make_fake_client
@@ -42,6 +44,18 @@ class ImageCollectionTest(unittest.TestCase):
         client.images.load('byte stream')
         client.api.load_image.assert_called_with('byte stream')
 
+    def test_load_from(self):
+        client = make_fake_client({
+            'load_image_from.return_value': [
+                {'stream': f'Loaded image ID: {FAKE_IMAGE_ID}'}
+            ],
+        })
+        images = client.images.load_from('/tmp/image.tar')
+        client.api.load_image_from.assert_called_with(
+            '/tmp/image.tar', progress=None
+        )
+        assert [i.id for i in images] == [FAKE_IMAGE_ID]
+
     def test_pull(self):
         client = make_fake_client()
         image = client.images.pull('test_image:test')
@@ -93,6 +107,34 @@ class ImageCollectionTest(unittest.TestCase):
             '`stream` is not a valid parameter'
         )
 
+    def test_pull_many(self):
+        client = make_fake_client()
+        logs = {
+            'a': [{'status': 'Downloading', 'id': 'l1',
+                   'progressDetail': {'current': 1, 'total': 2}}],
+            'b': [{'status': 'Pull complete', 'id': 'l1'},
+                  {'status': 'Digest: sha256:b'}],
+            'c': [{'error': 'manifest unknown'}],
+        }
+        client.api.pull.side_effect = lambda repo, **kwargs: iter(logs[repo])
+        progress = PullProgress()
+        results = client.images.pull_many(
+            ['a', 'b:1', 'c@sha256:c'], concurrency=3, progress=progress
+        )
+
+        assert [r.item for r in results] == ['a', 'b:1', 'c@sha256:c']
+        client.api.pull.assert_any_call(
+            'b', tag='1', stream=True, decode=True
+        )
+        client.api.inspect_image.assert_any_call('a:latest')
+        client.api.inspect_image.assert_any_call('b:1')
+        assert isinstance(results[0].result, Image)
+        assert results[1].ok
+        assert isinstance(results[2].error, APIError)
+        assert len(progress.layers) == 1
+        assert progress.layers[0].complete
+        assert progress.digest('b:1') == 'sha256:b'
+
     def test_push(self):
         client = make_fake_client()
         client.images.push('foobar', insecure_registry=True)
@@ -168,6 +210,15 @@ class ImageTest(unittest.TestCase):
             FAKE_IMAGE_ID, DEFAULT_DATA_CHUNK_SIZE
         )
 
+    def test_save_to(self):
+        client = make_fake_client()
+        image = client.images.get(FAKE_IMAGE_ID)
+        image.save_to('/tmp/image.tar', fsync=False)
+        client.api.get_image_to.assert_called_with(
+            FAKE_IMAGE_ID, '/tmp/image.tar',
+            chunk_size=DEFAULT_DATA_CHUNK_SIZE, fsync=False, progress=None
+        )
+
     def test_tag(self):
         client = make_fake_client()
         image = client.images.get(FAKE_IMAGE_ID)
@@ -0,0 +1,187 @@
+import http.server
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+import docker
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.transport import PoolStats, TCPHTTPAdapter, UnixHTTPAdapter
+from docker.utils.concurrency import grow_pool
+
+
+class PoolStatsTest(unittest.TestCase):
+    def test_counters(self):
+        stats = PoolStats()
+        stats._exhausted_pool()
+        stats._checked_out(reused=False, wait_time=0.5)
+        stats._checked_out(reused=True, wait_time=0.25)
+        stats._checked_in(discarded=False)
+        stats._checked_in(discarded=True)
+        stats._connected()
+        snapshot = stats.snapshot()
+        assert snapshot.created == 2
+        assert snapshot.reused == 1
+        assert snapshot.discarded == 1
+        assert snapshot.exhausted == 1
+        assert snapshot.wait_time == 0.75
+        assert snapshot.in_flight == 0
+        assert snapshot.max_in_flight == 2
+
+    def test_hooks(self):
+        stats = PoolStats()
+        events = []
+        for event in ('reused', 'released', 'waited', 'discarded'):
+            stats.register_hook(
+                event, lambda *args: events.append(args)
+            )
+        stats._checked_out(reused=True, wait_time=0.5)
+        stats._checked_in(discarded=True)
+        assert events == [
+            ('reused', 1), ('waited', 0.5), ('released', 0),
+            ('discarded', 0),
+        ]
+
+    def test_unknown_hook(self):
+        with pytest.raises(ValueError):
+            PoolStats().register_hook('opened', print)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'OK')
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn,
+                          socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects the address of a TCP client
+        return request, ('localhost', 0)
+
+
+class PoolTestMixin:
+    def start(self, server, base_url, **kwargs):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = docker.APIClient(base_url=base_url, version='1.41', **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def test_warm_pool(self):
+        client = self.make_client()
+        assert client.warm_pool(3) == 3
+        assert client.pool_stats.snapshot().created == 3
+        # The connections are kept open
+        assert client.warm_pool(3) == 0
+
+        assert client.ping()
+        assert client.ping()
+        snapshot = client.pool_stats.snapshot()
+        assert snapshot.created == 3
+        assert snapshot.reused == 2
+        assert snapshot.discarded == 0
+        assert snapshot.in_flight == 0
+        assert snapshot.max_in_flight == 1
+
+    def test_warm_pool_max_pool_size(self):
+        client = self.make_client(max_pool_size=2)
+        assert client.warm_pool(5) == 2
+
+    def test_exhausted(self):
+        client = self.make_client(max_pool_size=1)
+        hook = mock.Mock()
+        client.pool_stats.register_hook('exhausted', hook)
+        res = client._get(client._url('/_ping'), stream=True)
+        assert client.pool_stats.snapshot().in_flight == 1
+        assert client.ping()
+        hook.assert_called_once_with('exhausted', 1)
+        res.close()
+        snapshot = client.pool_stats.snapshot()
+        assert snapshot.created == 2
+        assert snapshot.exhausted == 1
+        # The pool only has room for one of them
+        assert snapshot.discarded == 1
+        assert snapshot.in_flight == 0
+        assert snapshot.max_in_flight == 2
+
+    def test_grow_pool(self):
+        client = self.make_client(max_pool_size=1)
+        grow_pool(client, 1)
+        responses = [
+            client._get(client._url('/_ping'), stream=True)
+            for _ in range(2)
+        ]
+        with mock.patch('urllib3.connectionpool.log') as log:
+            for res in responses:
+                assert res.content == b'OK'
+        log.warning.assert_not_called()
+        snapshot = client.pool_stats.snapshot()
+        assert snapshot.exhausted == 0
+        assert snapshot.discarded == 0
+        assert snapshot.in_flight == 0
+
+        # The connection that no longer fits is closed
+        grow_pool(client, -1)
+        pool = client.get_adapter(client.base_url)._pool_for(
+            client.base_url, client.verify, client.cert
+        )
+        assert pool.pool.maxsize == 1
+        assert pool.pool.qsize() == 1
+        assert client.ping()
+        assert client.pool_stats.snapshot().reused == 1
+
+    def test_detach(self):
+        client = self.make_client()
+        res = client._get(client._url('/_ping'), stream=True)
+        client._detach_connection(res)
+        snapshot = client.pool_stats.snapshot()
+        assert snapshot.in_flight == 0
+        assert snapshot.discarded == 1
+        # It isn't counted again once returned to the pool
+        res.close()
+        assert client.pool_stats.snapshot() == snapshot
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class UnixPoolTest(PoolTestMixin, unittest.TestCase):
+    def make_client(self, **kwargs):
+        socket_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, socket_dir)
+        socket_path = os.path.join(socket_dir, 'docker.sock')
+        client = self.start(
+            ThreadingUnixServer(socket_path, Handler),
+            f'unix://{socket_path}', **kwargs
+        )
+        assert isinstance(client.get_adapter(client.base_url),
+                          UnixHTTPAdapter)
+        return client
+
+
+class TCPPoolTest(PoolTestMixin, unittest.TestCase):
+    def make_client(self, **kwargs):
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        port = server.server_address[1]
+        client = self.start(server, f'tcp://127.0.0.1:{port}', **kwargs)
+        assert isinstance(client.get_adapter(client.base_url),
+                          TCPHTTPAdapter)
+        return client
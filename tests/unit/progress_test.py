@@ -0,0 +1,111 @@
+import json
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker.errors import APIError
+from docker.progress import PullProgress, iter_progress
+
+
+def layer_event(id, status, current=None, total=None):
+    event = {'status': status, 'id': id, 'progressDetail': {}}
+    if current is not None:
+        event['progressDetail'] = {'current': current, 'total': total}
+    return event
+
+
+class PullProgressTest(unittest.TestCase):
+    def test_shared_layers_are_reported_once(self):
+        progress = PullProgress()
+        progress.update('a', {'status': 'Pulling from library/a',
+                              'id': 'latest'})
+        progress.update('a', layer_event('l1', 'Pulling fs layer'))
+        progress.update('a', layer_event('l1', 'Downloading', 10, 100))
+        progress.update('b', layer_event('l1', 'Waiting'))
+        progress.update('b', layer_event('l2', 'Downloading', 5, 50))
+        progress.update('b', layer_event('l1', 'Downloading', 40, 100))
+
+        l1, l2 = progress.layers
+        assert (l1.id, l1.status, l1.current, l1.total) == (
+            'l1', 'Downloading', 40, 100
+        )
+        assert l1.refs == {'a', 'b'}
+        assert l2.refs == {'b'}
+        assert (progress.current, progress.total) == (45, 150)
+
+        progress.update('a', layer_event('l1', 'Extracting', 1, 200))
+        progress.update('a', layer_event('l1', 'Pull complete'))
+        progress.update('b', layer_event('l1', 'Downloading', 90, 100))
+        l1 = progress.layers[0]
+        assert l1.complete
+        assert (l1.status, l1.current) == ('Pull complete', 100)
+
+    def test_image_status_and_errors(self):
+        progress = PullProgress()
+        progress.update('a', {'status': 'Digest: sha256:abcd'})
+        progress.update('a', {'status': 'Status: Image is up to date'})
+        assert progress.digest('a') == 'sha256:abcd'
+        assert progress.status('a') == 'Status: Image is up to date'
+        with pytest.raises(APIError):
+            progress.update('b', {'error': 'manifest unknown'})
+        assert progress.status('b') == 'manifest unknown'
+        assert progress.digest('b') is None
+
+
+class IterProgressTest(unittest.TestCase):
+    def test_throttled_snapshots(self):
+        events = [
+            layer_event('l1', 'Downloading', 1, 10),
+            layer_event('l1', 'Downloading', 5, 10),
+            layer_event('l2', 'Already exists'),
+            layer_event('l1', 'Pull complete'),
+            {'status': 'Digest: sha256:abcd'},
+            {'status': 'Status: Downloaded newer image for a:latest'},
+        ]
+        # One tick per message, a snapshot every two ticks
+        clock = iter(range(len(events) + 1))
+        with mock.patch('docker.progress.time.monotonic',
+                        lambda: next(clock)):
+            snapshots = list(iter_progress(iter(events), interval=2))
+
+        assert [s.done for s in snapshots] == [False] * 3 + [True]
+        first, final = snapshots[0], snapshots[-1]
+        assert (first.current, first.total) == (5, 10)
+        assert final.layers[0].complete
+        assert [layer.id for layer in final.layers] == ['l1', 'l2']
+        assert (final.current, final.total) == (10, 10)
+        assert final.digest == 'sha256:abcd'
+        assert final.status.startswith('Status: Downloaded')
+        assert final.error is None
+
+    def test_raw_push_stream(self):
+        events = [
+            layer_event('l1', 'Preparing'),
+            layer_event('l1', 'Pushing', 512, 1024),
+            layer_event('l2', 'Mounted from library/a'),
+            layer_event('l1', 'Pushed'),
+            {'status': 'latest: digest: sha256:ef size: 528'},
+            {'progressDetail': {}, 'aux': {
+                'Tag': 'latest', 'Digest': 'sha256:ef', 'Size': 528
+            }},
+        ]
+        raw = ''.join(json.dumps(e) + '\r\n' for e in events).encode()
+        chunks = [raw[i:i + 7] for i in range(0, len(raw), 7)]
+        snapshot, = iter_progress(iter(chunks), interval=60)
+        assert snapshot.done
+        assert all(layer.complete for layer in snapshot.layers)
+        assert (snapshot.current, snapshot.total) == (1024, 1024)
+        assert snapshot.digest == 'sha256:ef'
+
+    def test_error_ends_the_stream(self):
+        events = [
+            layer_event('l1', 'Downloading', 1, 10),
+            {'errorDetail': {'message': 'no space left on device'},
+             'error': 'no space left on device'},
+            layer_event('l1', 'Downloading', 2, 10),
+        ]
+        snapshots = list(iter_progress(events, interval=0))
+        assert snapshots[-1].done
+        assert snapshots[-1].error == 'no space left on device'
+        assert snapshots[-1].current == 1
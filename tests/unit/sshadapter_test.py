@@ -1,6 +1,23 @@
+import os
+import select
+import shutil
+import socket
+import sys
+import tempfile
+import threading
 import unittest
+from unittest import mock
+
+import pytest
+
 import docker
-from docker.transport.sshconn import SSHSocket
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.transport.sshconn import (
+    SSHChannelPool,
+    SSHConnection,
+    SSHConnectionPool,
+    SSHSocket,
+)
 
 
 class SSHAdapterTest(unittest.TestCase):
@@ -37,3 +54,265 @@ class SSHAdapterTest(unittest.TestCase):
         assert c.host == "hostname"
         assert c.port == "22"
         assert c.user is None
+
+
+class SSHShellOutTest(unittest.TestCase):
+    @staticmethod
+    def test_ssh_connect_args():
+        c = SSHSocket(host="user@hostname:1234")
+        with mock.patch('subprocess.Popen') as popen:
+            c.connect()
+        args = popen.call_args[0][0]
+        assert args[:5] == ['ssh', '-l', 'user', '-p', '1234']
+        assert args[-3:] == ['--', 'hostname', 'docker system dial-stdio']
+        assert not any(arg.startswith('ControlPath') for arg in args)
+
+    @staticmethod
+    def test_ssh_connect_control_path():
+        c = SSHSocket(host="hostname", control_path='/tmp/ctl/master')
+        with mock.patch('subprocess.Popen') as popen:
+            c.connect()
+        args = popen.call_args[0][0]
+        assert 'ControlMaster=auto' in args
+        assert 'ControlPath=/tmp/ctl/master' in args
+        assert args[-3:] == ['--', 'hostname', 'docker system dial-stdio']
+
+    @pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+    def test_control_path_lifetime(self):
+        adapter = docker.transport.SSHHTTPAdapter(
+            base_url="ssh://user@hostname", shell_out=True)
+        control_dir = os.path.dirname(adapter.control_path)
+        assert os.path.isdir(control_dir)
+        pool = adapter.get_connection('http+docker://ssh')
+        assert pool.control_path == adapter.control_path
+        with mock.patch('subprocess.run') as run:
+            adapter.close()
+        # No master connection was started
+        run.assert_not_called()
+        assert not os.path.exists(control_dir)
+        assert adapter.control_path is None
+
+    @staticmethod
+    def test_no_multiplex():
+        adapter = docker.transport.SSHHTTPAdapter(
+            base_url="ssh://hostname", shell_out=True, multiplex=False)
+        assert adapter.control_path is None
+        adapter.close()
+
+    @staticmethod
+    def test_pool_reused():
+        adapter = docker.transport.SSHHTTPAdapter(
+            base_url="ssh://hostname", shell_out=True)
+        pool = adapter.get_connection('http+docker://ssh')
+        assert adapter.get_connection('http+docker://ssh') is pool
+        adapter.close()
+
+    @staticmethod
+    def test_dropped_connection_replaced():
+        pool = SSHConnectionPool(host='hostname', maxsize=1)
+        conn = SSHConnection(host='hostname')
+        conn.sock = SSHSocket('hostname')
+        conn.sock.proc = mock.Mock()
+        conn.sock.proc.poll.return_value = 255
+        pool._put_conn(conn)
+        new_conn = pool._get_conn(timeout=0)
+        assert new_conn is not conn
+        assert new_conn.sock is None
+
+
+def make_channel(transport):
+    channel = mock.Mock(closed=False)
+    channel.exit_status_ready.return_value = False
+    channel.get_transport.return_value = transport
+    return channel
+
+
+class SSHChannelPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.transport = mock.Mock()
+        self.transport.is_active.return_value = True
+        self.transport.open_session.side_effect = (
+            lambda: make_channel(self.transport)
+        )
+        self.client = mock.Mock()
+        self.client.get_transport.return_value = self.transport
+        self.pool = SSHChannelPool(self.client, size=2)
+
+    def test_fill(self):
+        self.pool._filling = True
+        self.pool._fill()
+        assert len(self.pool._channels) == 2
+        assert not self.pool._filling
+        for channel in self.pool._channels:
+            channel.exec_command.assert_called_once_with(
+                'docker system dial-stdio'
+            )
+
+    def test_get_warm_channel(self):
+        self.pool._fill()
+        warm = self.pool._channels[0]
+        with mock.patch.object(self.pool, 'fill') as fill:
+            assert self.pool.get() is warm
+        fill.assert_called_once_with()
+        assert self.transport.open_session.call_count == 2
+
+    def test_get_skips_ended_channels(self):
+        self.pool._fill()
+        ended, closed = self.pool._channels
+        ended.exit_status_ready.return_value = True
+        closed.closed = True
+        with mock.patch.object(self.pool, 'fill'):
+            channel = self.pool.get()
+        assert channel not in (ended, closed)
+        ended.close.assert_called_once_with()
+        closed.close.assert_called_once_with()
+        assert not self.pool._channels
+
+    def test_get_skips_channels_of_old_transport(self):
+        self.pool._fill()
+        old = self.pool._channels[0]
+        self.client.get_transport.return_value = mock.Mock()
+        with mock.patch.object(self.pool, 'fill'):
+            self.pool.get()
+        old.close.assert_called_once_with()
+
+    def test_close(self):
+        self.pool._fill()
+        channels = list(self.pool._channels)
+        self.pool.close()
+        for channel in channels:
+            channel.close.assert_called_once_with()
+        self.pool._fill()
+        assert not self.pool._channels
+
+
+FAKE_SSH = '''#!{python}
+import json
+import sys
+import time
+
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+while True:
+    line = stdin.readline()
+    if not line:
+        break
+    if not line.strip():
+        continue
+    method, path, _ = line.split()
+    headers = {{}}
+    while True:
+        line = stdin.readline()
+        if not line.strip():
+            break
+        name, value = line.split(b':', 1)
+        headers[name.strip().lower()] = value.strip()
+    body = stdin.read(int(headers.get(b'content-length', 0)))
+    if path.endswith(b'/sleep'):
+        time.sleep(60)
+    if path.endswith(b'/events'):
+        chunk = b'{{"status": "start"}}\\n'
+        stdout.write(
+            b'HTTP/1.1 200 OK\\r\\nContent-Type: application/json\\r\\n'
+            b'Transfer-Encoding: chunked\\r\\n\\r\\n'
+            b'%x\\r\\n%s\\r\\n' % (len(chunk), chunk)
+        )
+        stdout.flush()
+        time.sleep(60)
+    data = json.dumps({{
+        'ApiVersion': '1.41', 'Path': path.decode(), 'Body': len(body)
+    }}).encode()
+    stdout.write(
+        b'HTTP/1.1 200 OK\\r\\nContent-Type: application/json\\r\\n'
+        b'Content-Length: %d\\r\\n\\r\\n%s' % (len(data), data)
+    )
+    stdout.flush()
+'''
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class SSHSocketTest(unittest.TestCase):
+    def setUp(self):
+        bin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bin_dir)
+        ssh = os.path.join(bin_dir, 'ssh')
+        with open(ssh, 'w') as f:
+            f.write(FAKE_SSH.format(python=sys.executable))
+        os.chmod(ssh, 0o755)
+        path = f'{bin_dir}{os.pathsep}{os.environ.get("PATH", "")}'
+        patcher = mock.patch.dict(os.environ, {'PATH': path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def connect(self):
+        sock = SSHSocket('user@hostname')
+        sock.connect()
+        self.addCleanup(sock.close)
+        return sock
+
+    def test_request(self):
+        sock = self.connect()
+        with mock.patch.object(
+            sock, '_write', wraps=sock._write
+        ) as write, sock.corked():
+            sock.sendall(b'POST /v1.41/build HTTP/1.1\r\n')
+            sock.sendall(b'Content-Length: 4\r\n\r\n')
+            sock.sendall(b'body')
+        write.assert_called_once()
+        # The response can be polled for
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        assert poller.poll(5000)
+        response = sock.makefile('rb').read(17)
+        assert response == b'HTTP/1.1 200 OK\r\n'
+
+    def test_recv_into(self):
+        sock = self.connect()
+        sock.sendall(b'GET /version HTTP/1.1\r\n\r\n')
+        buf = bytearray(8)
+        assert sock.recv_into(buf) == 8
+        assert buf == b'HTTP/1.1'
+        assert sock.recv(4) == b' 200'
+
+    def test_timeout(self):
+        sock = self.connect()
+        sock.settimeout(0.1)
+        sock.sendall(b'GET /sleep HTTP/1.1\r\n\r\n')
+        with pytest.raises(socket.timeout):
+            sock.recv(1)
+        sock.setblocking(False)
+        with pytest.raises(BlockingIOError):
+            sock.recv(1)
+
+    def test_close(self):
+        sock = self.connect()
+        fileno = sock.fileno()
+        assert fileno >= 0
+        sock.close()
+        assert sock.fileno() == -1
+        assert sock.recv(1) == b''
+
+    def test_api_client(self):
+        client = docker.APIClient(
+            base_url='ssh://user@hostname', use_ssh_client=True
+        )
+        self.addCleanup(client.close)
+        assert client.api_version == '1.41'
+        assert client.version()['Path'] == '/v1.41/version'
+
+        events = client.events(decode=True)
+        assert next(events) == {'status': 'start'}
+        threading.Timer(0.1, events.close).start()
+        # Cancelling the stream ends it
+        assert list(events) == []
+
+    def test_warm_pool(self):
+        client = docker.APIClient(
+            base_url='ssh://user@hostname', use_ssh_client=True,
+            version='1.41'
+        )
+        self.addCleanup(client.close)
+        assert client.warm_pool(2) == 2
+        assert client.version()['Path'] == '/v1.41/version'
+        snapshot = client.pool_stats.snapshot()
+        assert snapshot.created == 2
+        assert snapshot.reused == 1
@@ -0,0 +1,199 @@
+import math
+import queue
+import unittest
+from unittest import mock
+
+from docker import errors, stats
+from docker.stats import StatsCollector, parse_stats
+
+
+def fake_stats(cpu, system, rx, usage=200, inactive=50):
+    return {
+        'cpu_stats': {
+            'cpu_usage': {'total_usage': cpu},
+            'system_cpu_usage': system,
+            'online_cpus': 2,
+        },
+        'memory_stats': {
+            'usage': usage, 'limit': 1000,
+            'stats': {'inactive_file': inactive},
+        },
+        'networks': {
+            'eth0': {'rx_bytes': rx, 'tx_bytes': 0},
+            'eth1': {'rx_bytes': rx, 'tx_bytes': 0},
+        },
+        'blkio_stats': {'io_service_bytes_recursive': [
+            {'op': 'Read', 'value': 10}, {'op': 'Write', 'value': 20},
+        ]},
+        'pids_stats': {'current': 3},
+    }
+
+
+class FakeAPIClient:
+    api_version = '1.41'
+
+    def __init__(self):
+        self.samples = {}
+        self.clock = 0
+
+    def stats(self, container, stream=True, one_shot=None):
+        assert (stream, one_shot) == (False, True)
+        if container not in self.samples:
+            raise errors.NotFound(f'No such container: {container}')
+        return self.samples[container].pop(0)
+
+
+class StatsCollectorTest(unittest.TestCase):
+    """Uses NumPy if it is installed."""
+
+    def setUp(self):
+        self.api = FakeAPIClient()
+        self.api.samples = {
+            'a': [fake_stats(100, 1000, 0), fake_stats(200, 1100, 100),
+                  fake_stats(400, 1200, 300)],
+            'b': [fake_stats(0, 1000, 0), fake_stats(50, 1100, 0),
+                  fake_stats(60, 1200, 0)],
+        }
+        self.times = iter(range(100))
+        patcher = mock.patch(
+            'docker.stats.time.time', lambda: float(next(self.times) // 2)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sample(self, rounds=3):
+        collector = StatsCollector(
+            self.api, ['a', 'b'], window=2, max_workers=1
+        )
+        for _ in range(rounds):
+            collector.sample()
+        return collector
+
+    def test_derived_metrics(self):
+        collector = self.sample()
+        assert collector.latest('cpu_percent') == {'a': 400.0, 'b': 20.0}
+        assert collector.latest('memory') == {'a': 150.0, 'b': 150.0}
+        assert collector.latest('memory_percent')['a'] == 15.0
+        assert collector.latest('rx_rate') == {'a': 400.0, 'b': 0.0}
+        assert collector.latest('pids') == {'a': 3.0, 'b': 3.0}
+
+    def test_window_and_percentile(self):
+        collector = self.sample()
+        # Only the last two samples are kept
+        assert collector.series('a', 'cpu_percent') == [200.0, 400.0]
+        assert collector.percentile('cpu_percent', 50) == {
+            'a': 300.0, 'b': 60.0
+        }
+
+    def test_first_sample_has_no_rates(self):
+        collector = self.sample(rounds=1)
+        assert math.isnan(collector.latest('cpu_percent')['a'])
+        assert collector.series('a', 'cpu_usage') == [100.0]
+
+    def test_window_too_small(self):
+        with self.assertRaises(ValueError):
+            StatsCollector(self.api, ['a'], window=1)
+
+    def test_removed_containers_are_dropped(self):
+        collector = self.sample(rounds=1)
+        del self.api.samples['b']
+        collector.sample()
+        assert collector.containers == ['a']
+        collector.add('c')
+        # The slot of b is reused and doesn't hold its samples anymore
+        assert all(
+            math.isnan(v) for v in collector.series('c', 'cpu_usage')
+        )
+
+    def test_persistent_streams(self):
+        self.api.api_version = '1.40'
+        responses = []
+        queues = {'a': queue.Queue(), 'b': queue.Queue()}
+
+        def get(url, params, stream):
+            assert params == {'stream': True}
+            responses.append(mock.Mock(url=url))
+            return responses[-1]
+
+        def stream_helper(response, decode):
+            q = queues[response.url.split('/')[2]]
+            while True:
+                stats = q.get()
+                if stats is None:
+                    q.task_done()
+                    return
+                yield stats
+                # The collector kept the sample and waits for the next one
+                q.task_done()
+
+        def send(index, wait=True):
+            for container, q in queues.items():
+                samples = self.api.samples[container]
+                q.put(samples[index] if index is not None else None)
+                if wait:
+                    q.join()
+
+        self.api._url = lambda path, container: path.format(container)
+        self.api._get = get
+        self.api._raise_for_status = lambda response: None
+        self.api._stream_helper = stream_helper
+        collector = StatsCollector(
+            self.api, ['a', 'b'], window=2, max_workers=1
+        )
+        # The streams are opened by the first round
+        send(0, wait=False)
+        collector.sample()
+        assert len(responses) == 2
+        # Two samples arrived since the previous round, only the latest one
+        # is used
+        send(1)
+        send(2)
+        collector.sample()
+        assert collector.latest('cpu_percent') == {'a': 300.0, 'b': 60.0}
+        # The containers whose stream ended are removed
+        send(None)
+        collector.sample()
+        assert collector.containers == []
+        collector.close()
+        assert all(r.close.called for r in responses)
+
+class PureStatsCollectorTest(StatsCollectorTest):
+    """Runs the same tests without NumPy."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('docker.stats.numpy', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ParseStatsTest(unittest.TestCase):
+    def test_missing_values(self):
+        values = dict(zip(stats.RAW_METRICS, parse_stats({}, now=1.0)))
+        assert values['time'] == 1.0
+        assert math.isnan(values['cpu_usage'])
+        assert values['rx_bytes'] == 0
+
+    def test_read_time(self):
+        values = dict(zip(stats.RAW_METRICS, parse_stats({
+            'read': '2015-01-08T22:57:31.547920715Z',
+        }, now=1.0)))
+        assert values['time'] == 1420757851.547920715
+        values = dict(zip(stats.RAW_METRICS, parse_stats({
+            'read': '2015-01-09T00:57:31+02:00',
+        }, now=1.0)))
+        assert values['time'] == 1420757851.0
+
+    def test_zero_read_time(self):
+        # The date of a stopped container
+        values = dict(zip(stats.RAW_METRICS, parse_stats({
+            'read': '0001-01-01T00:00:00Z',
+        }, now=1.0)))
+        assert values['time'] == 1.0
+
+    def test_cgroup_v1_cache(self):
+        values = dict(zip(stats.RAW_METRICS, parse_stats({'memory_stats': {
+            'usage': 100, 'stats': {'total_inactive_file': 30,
+                                    'inactive_file': 10},
+        }})))
+        assert values['memory_cache'] == 30
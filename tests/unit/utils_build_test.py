@@ -1,3 +1,6 @@
+import gzip
+import io
+import json
 import os
 import os.path
 import shutil
@@ -5,10 +8,14 @@ import socket
 import tarfile
 import tempfile
 import unittest
+from unittest import mock
 
 
 from docker.constants import IS_WINDOWS_PLATFORM
-from docker.utils import exclude_paths, tar
+from docker.utils import (
+    BuildContextCache, context_digest, exclude_paths, stream_tar, tar
+)
+from docker.utils.build import PatternMatcher, _file_digest
 
 import pytest
 
@@ -489,3 +496,136 @@ class TarTest(unittest.TestCase):
                 assert member in names
             assert 'a/c/b' in names
             assert 'a/c/b/utils.py' not in names
+
+
+class PatternMatcherTest(unittest.TestCase):
+    def test_last_matching_pattern_wins(self):
+        pm = PatternMatcher(['*.py', '!a*.py', 'ab.py'])
+        assert pm.matches('ab.py')
+        assert not pm.matches('ac.py')
+        assert pm.matches('b.py')
+        assert not pm.matches('b.go')
+
+    def test_parent_directory_match(self):
+        pm = PatternMatcher(['foo/bar', '!foo/bar/keep'])
+        assert pm.matches(convert_path('foo/bar/baz/file'))
+        assert not pm.matches(convert_path('foo/bar/keep'))
+        assert not pm.matches(convert_path('foo/baz'))
+
+    def test_many_patterns(self):
+        pm = PatternMatcher([f'dir{i}/*.txt' for i in range(200)])
+        assert pm.matches(convert_path('dir150/a.txt'))
+        assert not pm.matches(convert_path('dir250/a.txt'))
+
+    def test_walk_prunes_unreachable_directories(self):
+        base = make_tree(
+            ['skip', 'skip/sub', 'keep', 'keep/sub'],
+            ['skip/sub/a', 'keep/sub/a', 'keep/sub/b']
+        )
+        self.addCleanup(shutil.rmtree, base)
+        pm = PatternMatcher(['skip', 'keep', '!keep/sub/a'])
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            assert set(pm.walk(base)) == convert_paths({'keep/sub/a'})
+        scanned = {call[0][0] for call in scandir.call_args_list}
+        assert os.path.join(base, 'skip') not in scanned
+        assert os.path.join(base, 'keep', 'sub') in scanned
+
+
+class StreamTarTest(unittest.TestCase):
+    def setUp(self):
+        dirs = ['foo', 'foo/bar']
+        files = ['Dockerfile', 'a.py', 'foo/b.py', 'foo/bar/c.py']
+        self.base = make_tree(dirs, files)
+        self.addCleanup(shutil.rmtree, self.base)
+        with open(os.path.join(self.base, 'big'), 'wb') as f:
+            f.write(os.urandom(100000))
+
+    def test_stream_tar_matches_tar(self):
+        exclude = ['*.py', '!foo/b.py']
+        with tar(self.base, exclude=exclude) as archive:
+            expected = archive.read()
+        chunks = list(stream_tar(self.base, exclude=exclude, buffer_size=4096))
+        assert b''.join(chunks) == expected
+        assert len(chunks) > 1
+
+    def test_stream_tar_gzip(self):
+        with tar(self.base) as archive:
+            expected = archive.read()
+        chunks = stream_tar(self.base, gzip=True, buffer_size=4096)
+        assert gzip.decompress(b''.join(chunks)) == expected
+
+    def test_stream_tar_with_dockerfile_contents(self):
+        dockerfile = ('.dockerfile.1234', 'FROM busybox\n')
+        chunks = stream_tar(self.base, dockerfile=dockerfile)
+        with tarfile.open(fileobj=io.BytesIO(b''.join(chunks))) as tar_data:
+            assert '.dockerfile.1234' in tar_data.getnames()
+            member = tar_data.extractfile('.dockerfile.1234')
+            assert member.read() == b'FROM busybox\n'
+
+
+class BuildContextCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.base = make_tree(['foo'], ['Dockerfile', 'a.py', 'foo/b.py'])
+        self.addCleanup(shutil.rmtree, self.base)
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.cache_path = os.path.join(cache_dir, 'cache.json')
+
+    def write(self, path, contents):
+        with open(os.path.join(self.base, path), 'w') as f:
+            f.write(contents)
+
+    def test_context_digest(self):
+        digest = context_digest(self.base)
+        assert digest.startswith('sha256:')
+        assert context_digest(self.base) == digest
+        # Timestamps are not part of the digest
+        os.utime(os.path.join(self.base, 'a.py'), (0, 0))
+        assert context_digest(self.base) == digest
+        self.write('a.py', 'changed')
+        assert context_digest(self.base) != digest
+        assert context_digest(self.base, exclude=['a.py']) != digest
+
+    def test_cached_digests_skip_unchanged_files(self):
+        cache = BuildContextCache(self.cache_path)
+        digest = context_digest(self.base, cache=cache)
+        assert digest == context_digest(self.base)
+        cache.save()
+
+        cache = BuildContextCache(self.cache_path)
+        with mock.patch(
+            'docker.utils.build._file_digest', wraps=_file_digest
+        ) as file_digest:
+            assert context_digest(self.base, cache=cache) == digest
+            assert not file_digest.called
+
+            self.write('a.py', 'changed content')
+            assert context_digest(self.base, cache=cache) != digest
+            file_digest.assert_called_once_with(
+                os.path.join(self.base, 'a.py')
+            )
+
+    def test_tar_with_cache(self):
+        with tar(self.base) as archive:
+            expected = archive.read()
+        cache = BuildContextCache(self.cache_path)
+        with tar(self.base, cache=cache) as archive:
+            assert archive.read() == expected
+        cache.save()
+
+        cache = BuildContextCache(self.cache_path)
+        with mock.patch('tarfile.TarFile.gettarinfo') as gettarinfo:
+            chunks = stream_tar(self.base, cache=cache)
+            assert b''.join(chunks) == expected
+            assert not gettarinfo.called
+
+    def test_invalid_cache_file(self):
+        with open(self.cache_path, 'w') as f:
+            f.write('{not json')
+        cache = BuildContextCache(self.cache_path)
+        assert context_digest(self.base, cache=cache) == (
+            context_digest(self.base)
+        )
+        cache.save()
+        with open(self.cache_path) as f:
+            assert len(json.load(f)['entries']) == 4
@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+import docker
+from docker.constants import DEFAULT_MAX_POOL_SIZE
+from docker.utils.concurrency import (
+    RateLimiter, map_concurrently, map_results, pool_size
+)
+
+
+class MapConcurrentlyTest(unittest.TestCase):
+    def test_preserves_order(self):
+        def slow_square(x):
+            time.sleep(0.001 * (10 - x))
+            return x * x
+        assert map_concurrently(slow_square, range(10), 4) == [
+            x * x for x in range(10)
+        ]
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def task(_):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.005)
+            with lock:
+                running.pop()
+
+        map_concurrently(task, range(20), 3)
+        assert max(peak) <= 3
+
+    def test_raises_first_failure(self):
+        def task(x):
+            if x in (3, 7):
+                raise ValueError(x)
+            return x
+        with pytest.raises(ValueError) as excinfo:
+            map_concurrently(task, range(10), 4)
+        assert excinfo.value.args == (3,)
+
+
+class MapResultsTest(unittest.TestCase):
+    def test_collects_errors(self):
+        def task(x):
+            if x % 3 == 0:
+                raise ValueError(x)
+            return x * 2
+
+        results = map_results(task, range(7), 4)
+        assert [r.item for r in results] == list(range(7))
+        assert [r.result for r in results if r.ok] == [2, 4, 8, 10]
+        assert [r.error.args[0] for r in results if not r.ok] == [0, 3, 6]
+
+    def test_rate_limit(self):
+        start = time.monotonic()
+        results = map_results(lambda x: x, range(6), 6, rate_limit=50)
+        assert time.monotonic() - start >= 0.09
+        assert all(r.ok for r in results)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+
+class PoolSizeTest(unittest.TestCase):
+    def test_unix_adapter(self):
+        client = docker.APIClient(
+            base_url='unix:///var/run/docker.sock', version='1.41',
+            max_pool_size=42
+        )
+        assert pool_size(client) == 42
+
+    def test_tcp(self):
+        client = docker.APIClient(
+            base_url='tcp://127.0.0.1:2375', version='1.41'
+        )
+        assert pool_size(client) == DEFAULT_MAX_POOL_SIZE
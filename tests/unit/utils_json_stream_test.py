@@ -1,4 +1,12 @@
-from docker.utils.json_stream import json_splitter, stream_as_text, json_stream
+from unittest import mock
+
+import pytest
+
+from docker.errors import StreamParseError
+from docker.utils import json_stream as json_stream_module
+from docker.utils.json_stream import (
+    JSONStreamDecoder, json_splitter, json_stream, stream_as_text
+)
 
 
 class TestJsonSplitter:
@@ -56,3 +64,79 @@ class TestJsonStream:
             {'three': 'four'},
             {'x': 2}
         ]
+
+    def test_with_bytes_split_across_chunks(self):
+        stream = [
+            b'{"status": "Downloading"}\n{"id": "\xc3',
+            b'\xa9"}\n{"x"',
+            b': [1, 2]}\r\n',
+        ]
+        output = list(json_stream(stream))
+        assert output == [
+            {'status': 'Downloading'},
+            {'id': '\xe9'},
+            {'x': [1, 2]},
+        ]
+
+    def test_with_object_spanning_lines(self):
+        stream = ['{\n  "one": "two",\n', '  "three": 4\n}\n{"x": 1}']
+        output = list(json_stream(stream))
+        assert output == [{'one': 'two', 'three': 4}, {'x': 1}]
+
+    def test_with_invalid_trailing_data(self):
+        with pytest.raises(StreamParseError):
+            list(json_stream(['{"one": "two"}\n{"x": ']))
+
+
+class TestJSONStreamDecoder:
+
+    def test_unframed_values(self):
+        decoder = JSONStreamDecoder()
+        assert decoder.decode('{"a": 1}{"b": 2}') == [{'a': 1}, {'b': 2}]
+        assert decoder.decode('{"c": [3]') == []
+        assert decoder.decode('}') == [{'c': [3]}]
+
+    def test_returns_only_complete_values(self):
+        decoder = JSONStreamDecoder()
+        assert decoder.decode(b'{"a": 1}\n{"b"') == [{'a': 1}]
+        assert decoder.decode(b': 2}') == [{'b': 2}]
+        assert decoder.flush() == []
+
+    def test_keeps_only_partial_line(self):
+        decoder = JSONStreamDecoder()
+        line = b'{"progress": "' + b'=' * 32 + b'"}\n'
+        for _ in range(10):
+            assert len(decoder.decode(line + b'{"partial":')) == 1
+            assert bytes(decoder._buffer) == b'{"partial":'
+            assert decoder.decode(b' 1}\n') == [{'partial': 1}]
+
+    def test_value_spanning_chunks_parsed_once(self):
+        decoder = JSONStreamDecoder()
+        chunks = [b'{\n'] + [
+            b'  "key%d": "\\"%d\\"",\n' % (i, i) for i in range(1000)
+        ] + [b'  "end": true\n', b'}']
+        with mock.patch.object(
+            json_stream_module, '_decode_values',
+            wraps=json_stream_module._decode_values
+        ) as decode_values:
+            for data in chunks[:-1]:
+                assert decoder.decode(data) == []
+            value, = decoder.decode(chunks[-1])
+        # Only the first chunk is parsed before the value is complete
+        assert decode_values.call_count == 1
+        assert value['key999'] == '"999"'
+        assert value['end'] is True
+
+    def test_escape_split_across_chunks(self):
+        decoder = JSONStreamDecoder()
+        assert decoder.decode(b'{"a": "x\\') == []
+        assert decoder.decode(b'"}') == []
+        assert decoder.decode(b'"}\n') == [{'a': 'x"}'}]
+
+    @pytest.mark.parametrize('data', [
+        b'{"a": x}\n{"b": 1}', b'nope\n', b'{"a": "\n', b'{"a": 1]',
+    ])
+    def test_invalid_value_raises_once_complete(self, data):
+        decoder = JSONStreamDecoder()
+        with pytest.raises(StreamParseError):
+            decoder.decode(data)
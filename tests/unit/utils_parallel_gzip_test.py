@@ -0,0 +1,107 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import threading
+import unittest
+from unittest import mock
+
+from docker.utils import create_archive, stream_tar
+from docker.utils.parallel_gzip import (
+    ParallelGzipCompressor, ParallelGzipWriter
+)
+
+from ..helpers import make_tree
+
+
+def gzip_threads():
+    return [
+        thread for thread in threading.enumerate()
+        if thread.name.startswith('docker-gzip')
+    ]
+
+
+class ParallelGzipWriterTest(unittest.TestCase):
+    def compress(self, data, **kwargs):
+        out = io.BytesIO()
+        with ParallelGzipWriter(out, **kwargs) as writer:
+            for i in range(0, len(data), 1000):
+                writer.write(data[i:i + 1000])
+            assert writer.tell() == len(data)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        data = os.urandom(50000) + b'abc' * 50000
+        compressed = self.compress(data, workers=4, block_size=8192)
+        assert gzip.decompress(compressed) == data
+        assert len(compressed) < len(data)
+
+    def test_empty(self):
+        assert gzip.decompress(self.compress(b'', workers=2)) == b''
+
+    def test_block_boundaries(self):
+        for size in (4095, 4096, 4097, 8192):
+            data = bytes(range(256)) * (size // 256) + b'x' * (size % 256)
+            compressed = self.compress(data, workers=2, block_size=4096)
+            assert gzip.decompress(compressed) == data
+
+    def test_compress_level(self):
+        data = b'hello world ' * 10000
+        fast = self.compress(data, compresslevel=1)
+        best = self.compress(data, compresslevel=9)
+        assert gzip.decompress(fast) == gzip.decompress(best) == data
+
+    def test_compressor_interface(self):
+        compressor = ParallelGzipCompressor(workers=2, block_size=1024)
+        data = b'0123456789' * 1000
+        chunks = [compressor.compress(data[i:i + 777])
+                  for i in range(0, len(data), 777)]
+        chunks.append(compressor.flush())
+        assert gzip.decompress(b''.join(chunks)) == data
+
+
+class ParallelGzipArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.base = make_tree(['foo'], ['Dockerfile', 'foo/bar'])
+        self.addCleanup(shutil.rmtree, self.base)
+
+    def test_create_archive(self):
+        with create_archive(self.base, gzip=True, gzip_workers=2) as archive:
+            with tarfile.open(fileobj=archive, mode='r:gz') as tar_data:
+                assert sorted(tar_data.getnames()) == [
+                    'Dockerfile', 'foo', 'foo/bar'
+                ]
+
+    def test_stream_tar(self):
+        with create_archive(self.base) as archive:
+            expected = archive.read()
+        chunks = stream_tar(self.base, gzip=True, gzip_workers=2)
+        assert gzip.decompress(b''.join(chunks)) == expected
+
+    def test_create_archive_error_stops_threads(self):
+        abort = mock.patch.object(
+            ParallelGzipWriter, 'abort', autospec=True,
+            side_effect=ParallelGzipWriter.abort
+        )
+        with abort as abort, mock.patch(
+            'docker.utils.build.open', side_effect=OSError('denied'),
+            create=True
+        ), self.assertRaises(OSError):
+            create_archive(self.base, gzip=True, gzip_workers=2)
+        abort.assert_called_once()
+        assert abort.call_args[0][0].closed
+        assert not gzip_threads()
+
+    def test_abandoned_stream_stops_threads(self):
+        with open(os.path.join(self.base, 'big'), 'wb') as f:
+            f.write(os.urandom(512 * 1024))
+        chunks = stream_tar(
+            self.base, gzip=True, gzip_workers=2, buffer_size=1
+        )
+        for _ in chunks:
+            if gzip_threads():
+                break
+        assert gzip_threads()
+        chunks.close()
+        assert not gzip_threads()
@@ -0,0 +1,107 @@
+import select
+import socket
+import struct
+import threading
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.utils.socket import (
+    STDERR, STDOUT, FrameReader, consume_socket_output, frames_iter,
+    next_frame_header, read_exactly
+)
+
+
+def frame(stream, data):
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+@pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+class FrameReaderTest(unittest.TestCase):
+    def send_in_pieces(self, data, piece_size):
+        rsock, wsock = socket.socketpair()
+        self.addCleanup(rsock.close)
+
+        def write():
+            with wsock:
+                for i in range(0, len(data), piece_size):
+                    wsock.sendall(data[i:i + piece_size])
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        self.addCleanup(thread.join)
+        return rsock
+
+    def test_frames_yield_memoryviews(self):
+        sock = self.send_in_pieces(
+            frame(STDOUT, b'hello') + frame(STDERR, b'world'), 3
+        )
+        frames = []
+        for stream, data in FrameReader(sock).frames():
+            assert isinstance(data, memoryview)
+            frames.append((stream, bytes(data)))
+        assert b''.join(d for s, d in frames if s == STDOUT) == b'hello'
+        assert b''.join(d for s, d in frames if s == STDERR) == b'world'
+
+    def test_frames_larger_than_buffer(self):
+        payload = bytes(range(256)) * 40
+        sock = self.send_in_pieces(frame(STDOUT, payload), 1000)
+        chunks = list(FrameReader(sock, buffer_size=512).frames(as_bytes=True))
+        assert all(len(data) <= 512 for _, data in chunks)
+        assert b''.join(data for _, data in chunks) == payload
+
+    def test_frames_iter_yields_bytes(self):
+        sock = self.send_in_pieces(
+            frame(STDOUT, b'abc') + frame(STDERR, b'def'), 1024
+        )
+        assert list(frames_iter(sock, tty=False)) == [
+            (STDOUT, b'abc'), (STDERR, b'def')
+        ]
+
+    def test_frames_iter_tty(self):
+        sock = self.send_in_pieces(b'raw tty output', 1024)
+        data = b''.join(d for _, d in frames_iter(sock, tty=True))
+        assert data == b'raw tty output'
+
+    def test_truncated_header(self):
+        sock = self.send_in_pieces(frame(STDOUT, b'abc')[:5], 1)
+        assert next_frame_header(sock) == (-1, -1)
+
+    def test_read_exactly(self):
+        sock = self.send_in_pieces(b'0123456789', 2)
+        assert read_exactly(sock, 7) == b'0123456'
+
+    @pytest.mark.skipif(not hasattr(select, 'poll'), reason='No poll()')
+    def test_socket_registered_once(self):
+        sock = self.send_in_pieces(frame(STDOUT, b'abc') + b'0123', 1)
+        with mock.patch('select.poll', wraps=select.poll) as poll:
+            assert next_frame_header(sock) == (STDOUT, 3)
+            assert read_exactly(sock, 3) == b'abc'
+            assert read_exactly(sock, 4) == b'0123'
+        poll.assert_called_once_with()
+
+
+class ConsumeSocketOutputTest(unittest.TestCase):
+    def test_multiplexed(self):
+        frames = [b'abc', memoryview(b'def'), b'ghi']
+        assert consume_socket_output(iter(frames)) == b'abcdefghi'
+
+    def test_demux(self):
+        frames = [(b'a', None), (None, b'x'), (b'b', None)]
+        assert consume_socket_output(frames, demux=True) == (b'ab', b'x')
+
+    def test_demux_single_stream(self):
+        frames = [(b'a', None), (b'b', None)]
+        assert consume_socket_output(frames, demux=True) == (b'ab', None)
+
+    def test_demux_spooled(self):
+        frames = [(b'a' * 10, None), (None, b'x'), (b'b' * 10, None)]
+        out, err = consume_socket_output(
+            frames, demux=True, spool_threshold=16
+        )
+        assert out._rolled
+        assert not err._rolled
+        assert out.read() == b'a' * 10 + b'b' * 10
+        assert err.read() == b'x'
@@ -0,0 +1,108 @@
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+import pytest
+import requests
+
+from docker.utils.transfer import (
+    ChunkReader,
+    FileReader,
+    TransferStats,
+    extract_archive,
+    write_atomic,
+)
+
+
+class WriteAtomicTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'image.tar')
+
+    def test_write(self):
+        seen = []
+        stats = write_atomic([b'ab', b'cde'], self.path, progress=seen.append)
+        with open(self.path, 'rb') as f:
+            assert f.read() == b'abcde'
+        assert stats.bytes == 5
+        assert [s.bytes for s in seen] == [2, 5]
+        assert os.listdir(self.tmpdir) == ['image.tar']
+
+    def test_failure_keeps_previous_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'old')
+
+        def chunks():
+            yield b'new'
+            raise OSError('connection reset')
+
+        with pytest.raises(OSError):
+            write_atomic(chunks(), self.path, fsync=False)
+        with open(self.path, 'rb') as f:
+            assert f.read() == b'old'
+        assert os.listdir(self.tmpdir) == ['image.tar']
+
+
+class FileReaderTest(unittest.TestCase):
+    def test_request_body(self):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'x' * 100)
+            f.flush()
+            seen = []
+            with FileReader(f.name, seen.append) as reader:
+                request = requests.Request(
+                    'POST', 'http://docker/images/load', data=reader
+                ).prepare()
+                assert request.headers['Content-Length'] == '100'
+                assert request.body is reader
+                assert reader.read(60) == b'x' * 60
+                assert reader.read(60) == b'x' * 40
+                assert reader.read(60) == b''
+        assert [s.bytes for s in seen] == [60, 100]
+        assert reader.stats.bytes == 100
+
+
+class ExtractArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def archive(self, *members):
+        f = io.BytesIO()
+        with tarfile.open(fileobj=f, mode='w') as t:
+            for name, data in members:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                t.addfile(info, io.BytesIO(data))
+        return f.getvalue()
+
+    def test_extract_compressed_chunks(self):
+        data = gzip.compress(self.archive(('a/b', b'x' * 3000)))
+        chunks = [data[i:i + 100] for i in range(0, len(data), 100)]
+        dest = os.path.join(self.tmpdir, 'dest')
+        extract_archive(chunks, dest)
+        with open(os.path.join(dest, 'a', 'b'), 'rb') as f:
+            assert f.read() == b'x' * 3000
+
+    def test_refuses_members_outside_destination(self):
+        data = self.archive(('../evil', b'x'))
+        with pytest.raises(tarfile.TarError):
+            extract_archive([data], os.path.join(self.tmpdir, 'dest'))
+        assert not os.path.exists(os.path.join(self.tmpdir, 'evil'))
+
+    def test_chunk_reader(self):
+        reader = ChunkReader([b'abc', b'', b'defg'])
+        assert reader.read(2) == b'ab'
+        assert reader.read(5) == b'c'
+        assert reader.read() == b'defg'
+        assert reader.read(1) == b''
+
+
+def test_rate():
+    assert TransferStats(100, 2.0).rate == 50.0
+    assert TransferStats(0, 0).rate == 0.0
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+from unittest import mock
+
+import pytest
+
+from docker.constants import IS_WINDOWS_PLATFORM
+from docker.utils import VersionCache
+
+
+class VersionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'cache', 'versions.json')
+        self.url = 'http://localhost:2375'
+
+    def test_put_get(self):
+        cache = VersionCache(self.path)
+        assert cache.get(self.url) is None
+        cache.put(self.url, '1.41')
+        assert cache.get(self.url) == '1.41'
+        # Shared with other instances using the same file
+        assert VersionCache(self.path).get(self.url) == '1.41'
+        assert cache.get('http://otherhost:2375') is None
+
+    def test_expired(self):
+        cache = VersionCache(self.path, ttl=60)
+        with mock.patch('time.time', return_value=1000):
+            cache.put(self.url, '1.41')
+        with mock.patch('time.time', return_value=1059):
+            assert cache.get(self.url) == '1.41'
+        with mock.patch('time.time', return_value=1060):
+            assert cache.get(self.url) is None
+
+    def test_put_prunes_expired(self):
+        cache = VersionCache(self.path, ttl=60)
+        with mock.patch('time.time', return_value=1000):
+            cache.put('http://old:2375', '1.40')
+        with mock.patch('time.time', return_value=2000):
+            cache.put(self.url, '1.41')
+        with open(self.path) as f:
+            assert list(json.load(f)['entries']) == [self.url]
+
+    def test_invalid_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('not json')
+        cache = VersionCache(self.path)
+        assert cache.get(self.url) is None
+        cache.put(self.url, '1.41')
+        assert cache.get(self.url) == '1.41'
+
+    def test_unwritable(self):
+        path = os.path.join(self.tmpdir, 'file')
+        open(path, 'w').close()
+        cache = VersionCache(os.path.join(path, 'versions.json'))
+        cache.put(self.url, '1.41')
+        assert cache.get(self.url) is None
+
+    def test_failed_write_removes_temp_file(self):
+        cache = VersionCache(self.path)
+        with mock.patch('os.replace', side_effect=OSError('replace')):
+            cache.put(self.url, '1.41')
+        with mock.patch('json.dump', side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                cache.put(self.url, '1.41')
+        assert os.listdir(os.path.dirname(self.path)) == []
+
+    @pytest.mark.skipif(IS_WINDOWS_PLATFORM, reason='Unix only')
+    def test_unix_socket_replaced(self):
+        socket_path = os.path.join(self.tmpdir, 'docker.sock')
+        url = f'http+unix://{socket_path}'
+        cache = VersionCache(self.path)
+
+        sock = socket.socket(socket.AF_UNIX)
+        sock.bind(socket_path)
+        cache.put(url, '1.41')
+        assert cache.get(url) == '1.41'
+        sock.close()
+        os.remove(socket_path)
+
+        # A restarted daemon creates a new socket
+        sock = socket.socket(socket.AF_UNIX)
+        sock.bind(socket_path)
+        os.utime(socket_path, ns=(0, 0))
+        try:
+            assert cache.get(url) is None
+        finally:
+            sock.close()
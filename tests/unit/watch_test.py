@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+import unittest
+
+from docker import errors
+from docker.watch import ADDED, REMOVED, UPDATED, Informer
+
+
+def container(id, name, labels=None, status='created'):
+    return {
+        'Id': id, 'Name': f'/{name}', 'State': {'Status': status},
+        'Config': {'Labels': labels or {}},
+    }
+
+
+class FakeEventStream:
+    def __init__(self, events=()):
+        self.queue = queue.Queue()
+        for event in events:
+            self.queue.put(event)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        event = self.queue.get()
+        if event is None:
+            raise StopIteration
+        return event
+
+    def close(self):
+        self.queue.put(None)
+
+
+class FakeAPIClient:
+    def __init__(self):
+        self.objects = {'container': {}, 'image': {}, 'network': {},
+                        'volume': {}}
+        self.inspected = []
+        self.streams = queue.Queue()
+        self.subscriptions = []
+        self.lock = threading.Lock()
+
+    def events(self, since=None, decode=None, filters=None):
+        self.subscriptions.append(since)
+        stream = FakeEventStream()
+        self.streams.put(stream)
+        return stream
+
+    def containers(self, all=False, quiet=False):
+        return [{'Id': id} for id in self.objects['container']]
+
+    def images(self):
+        return [{'Id': id} for id in self.objects['image']]
+
+    def networks(self):
+        return [{'Id': id} for id in self.objects['network']]
+
+    def volumes(self):
+        return {'Volumes': list(self.objects['volume'].values())}
+
+    def _inspect(self, kind, key):
+        with self.lock:
+            self.inspected.append(key)
+        objects = self.objects[kind]
+        if key in objects:
+            return objects[key]
+        for obj in objects.values():
+            if obj.get('Name', '').lstrip('/') == key:
+                return obj
+        raise errors.NotFound(f'No such {kind}: {key}')
+
+    def inspect_container(self, key):
+        return self._inspect('container', key)
+
+    def inspect_image(self, key):
+        return self._inspect('image', key)
+
+    def inspect_network(self, key):
+        return self._inspect('network', key)
+
+    def inspect_volume(self, key):
+        return self._inspect('volume', key)
+
+
+def event(kind, action, id, time_nano, **attributes):
+    return {
+        'Type': kind, 'Action': action, 'timeNano': time_nano,
+        'Actor': {'ID': id, 'Attributes': attributes},
+    }
+
+
+class InformerTest(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeAPIClient()
+        self.api.objects['container'] = {
+            'c1': container('c1', 'web', {'app': 'web', 'tier': 'front'}),
+            'c2': container('c2', 'db', {'app': 'db'}),
+        }
+        self.api.objects['volume'] = {
+            'v1': {'Name': 'v1', 'Labels': {'app': 'db'}},
+        }
+        self.changes = []
+        self.informer = Informer(self.api, max_workers=4, reconnect_delay=0)
+        self.informer.add_handler(self.changes.append)
+
+    def tearDown(self):
+        self.informer.stop(timeout=5)
+
+    def send(self, *events):
+        stream = self.api.streams.queue[-1]
+        for e in events:
+            stream.queue.put(e)
+        # Wait until the informer has processed the last event
+        seconds, nanos = divmod(events[-1]['timeNano'], 10 ** 9)
+        deadline = time.monotonic() + 5
+        while self.informer._since != f'{seconds}.{nanos:09d}':
+            assert time.monotonic() < deadline
+            time.sleep(0.001)
+
+    def test_seed_and_indexes(self):
+        self.informer.start()
+        containers = self.informer.containers
+        assert len(containers) == 2
+        assert containers.get('web')['Id'] == 'c1'
+        assert containers.get('c2')['Name'] == '/db'
+        assert [c['Id'] for c in containers.list(label='app=db')] == ['c2']
+        assert [c['Id'] for c in containers.list(label='tier')] == ['c1']
+        assert containers.list(label=['app', 'tier=back']) == []
+        assert containers.list(name='db')[0]['Id'] == 'c2'
+        # Listed volumes aren't inspected again
+        assert self.informer.volumes.get('v1')['Labels'] == {'app': 'db'}
+        assert 'v1' not in self.api.inspected
+        assert sorted(c.id for c in self.changes) == ['c1', 'c2', 'v1']
+        assert {c.action for c in self.changes} == {ADDED}
+
+    def test_events_update_store(self):
+        self.informer.start()
+        self.changes.clear()
+        self.api.inspected.clear()
+
+        self.api.objects['container']['c1'] = container(
+            'c1', 'frontend', {'app': 'web'}, status='running'
+        )
+        self.api.objects['container']['c3'] = container('c3', 'cache')
+        del self.api.objects['container']['c2']
+        self.send(
+            event('container', 'start', 'c1', 10),
+            event('container', 'exec_start: sh -c true', 'c1', 11),
+            event('container', 'create', 'c3', 12),
+            event('container', 'destroy', 'c2', 13),
+        )
+
+        containers = self.informer.containers
+        assert self.api.inspected == ['c1', 'c3']
+        assert containers.get('web') is None
+        assert containers.get('frontend')['State']['Status'] == 'running'
+        assert containers.list(label='tier') == []
+        assert containers.get('c2') is None
+        assert [(c.action, c.id) for c in self.changes] == [
+            (UPDATED, 'c1'), (ADDED, 'c3'), (REMOVED, 'c2')
+        ]
+
+    def test_network_connect_refreshes_container(self):
+        self.api.objects['network'] = {'n1': {'Id': 'n1', 'Name': 'net'}}
+        self.informer.start()
+        self.api.inspected.clear()
+        self.send(event('network', 'connect', 'n1', 10, container='c1'))
+        assert self.api.inspected == ['n1', 'c1']
+
+    def test_resumes_from_last_event_on_disconnect(self):
+        self.informer.start()
+        self.send(event('container', 'start', 'c1', 1_500_000_000_000000001))
+        self.api.streams.queue[-1].close()
+        self.api.streams.get(timeout=5)
+        self.api.streams.get(timeout=5)
+        assert self.api.subscriptions == [None, '1500000000.000000001']
+
+    def test_handler_kinds_and_errors(self):
+        seen = []
+
+        def failing(change):
+            raise ValueError('oops')
+
+        self.informer.add_handler(failing)
+        self.informer.add_handler(seen.append, kinds=['volume'])
+        self.informer.start()
+        assert [c.id for c in seen] == ['v1']
+        assert len(self.changes) == 3